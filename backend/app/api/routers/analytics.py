@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Query
+from app.core.dependencies import AnalyticsServiceDep
+from app.utils.exception_utils import handle_exceptions
+
+router = APIRouter(prefix="/api/v1", tags=["Analytics"])
+
+@router.get("/analytics")
+@handle_exceptions
+def get_analytics(
+    analytics_service: AnalyticsServiceDep,
+    window_hours: int = Query(24, ge=1, le=24 * 31),
+    top: int = Query(3, ge=1, le=24)
+):
+    return analytics_service.get_summary(window_hours=window_hours, top=top)
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException
+from app.core.dependencies import KitchenServiceDep, ValidOrderIdDep
+from app.utils.exception_utils import handle_exceptions
+
+router = APIRouter(prefix="/api/v1/kitchen", tags=["Kitchen"])
+
+@router.get("")
+@handle_exceptions
+def get_kitchen_board(kitchen_service: KitchenServiceDep):
+    return kitchen_service.get_board()
+
+@router.get("/orders/{order_id}")
+@handle_exceptions
+def get_kitchen_order(order_id: ValidOrderIdDep, kitchen_service: KitchenServiceDep):
+    return kitchen_service.get_order_status(order_id)
+
+@router.post("/stations/{station}/start")
+@handle_exceptions
+def start_batch(station: str, kitchen_service: KitchenServiceDep):
+    batch = kitchen_service.start_batch(station)
+    if batch is None:
+        raise HTTPException(status_code=409, detail=f"Nothing to start on {station}")
+    return kitchen_service.describe_batch(batch)
+
+@router.post("/batches/{batch_id}/complete")
+@handle_exceptions
+def complete_batch(batch_id: int, kitchen_service: KitchenServiceDep):
+    return {"batch_id": batch_id, "ready_orders": kitchen_service.complete_batch(batch_id)}
+
+@router.post("/orders/{order_id}/hand-off")
+@handle_exceptions
+def hand_off_order(order_id: ValidOrderIdDep, kitchen_service: KitchenServiceDep):
+    kitchen_service.hand_off(order_id)
+    return {"order_id": order_id, "handed_off": True}
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from app.core.dependencies import LocationRegistryDep
+from app.utils.exception_utils import handle_exceptions
+
+router = APIRouter(prefix="/api/v1/locations", tags=["Locations"])
+
+@router.get("")
+@handle_exceptions
+def get_locations_summary(locations: LocationRegistryDep):
+    """Totals and status counts across all locations, and per location"""
+    return locations.aggregate.get_view()
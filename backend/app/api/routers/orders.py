@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends
-from app.schemas.schemas import OrderRequest, OrderResponse
-from app.core.dependencies import OrderServiceDep, OrderStoreDep
+import time
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, Query, Request
+from starlette.concurrency import run_in_threadpool
+from app.schemas.schemas import (
+    OrderRequest, OrderResponse, OrderItems, ModifyOrderRequest, CommitRequest,
+    BulkOrderRequest, BulkCancelRequest, BulkResponse, OrderDetails, OrderStatusUpdate, OrderEventsResponse
+)
+from app.core.dependencies import OrderServiceDep, OrderStoreDep, ValidOrderIdDep, AdmissionDep, LocationDep
+from app.core.config import Config
 from app.services.order_service import OrderService
 from app.models.db_models import OrderStore
+from app.models.order_status import OrderStatus
 from app.utils.response_utils import success_response, error_response
 from app.utils.exception_utils import handle_exceptions
+from app.utils.json_utils import OrderJSONResponse, encode_order_response, snapshot_response
 
 import logging
 
@@ -12,35 +21,114 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["Orders"])
 
+def _render(response, order_service: OrderService) -> OrderJSONResponse:
+    # Reuses the store's cached totals/orders bytes when nothing changed since the response was built
+    return OrderJSONResponse(response, order_service.order_store.get_snapshot())
+
 @router.post("/process", response_model=OrderResponse)
 @handle_exceptions
-def process_order(request: OrderRequest, order_service: OrderServiceDep) -> OrderResponse:
-    return order_service.process_order_request(request) 
+async def process_order(
+    request: OrderRequest,
+    location: LocationDep,
+    admission: AdmissionDep,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=128),
+    deadline_ms: Optional[int] = Header(None, alias="X-Deadline-Ms", gt=0, description="Time the client will wait, in milliseconds")
+) -> OrderJSONResponse:
+    budget = Config.PROCESS_DEFAULT_DEADLINE_SECONDS if deadline_ms is None else min(deadline_ms / 1000, Config.DEFAULT_REQUEST_TIMEOUT)
+    deadline = time.monotonic() + budget
+    # Sheds with 503 + Retry-After rather than queueing work that would finish too late.
+    # Lanes are per location: session IDs are only unique within one
+    await admission.acquire(f"{location.id}/{request.session_id or ''}", deadline)
+    order_service = location.order_service
+    start = time.monotonic()
+    try:
+        response = await run_in_threadpool(order_service.process_order_request, request, idempotency_key, deadline)
+    finally:
+        finished = time.monotonic()
+        admission.release(finished - start, late=finished > deadline)
+    return _render(response, order_service)
+
+@router.post("/process/commit", response_model=OrderResponse)
+@handle_exceptions
+def commit_preview(request: CommitRequest, order_service: OrderServiceDep) -> OrderJSONResponse:
+    return _render(order_service.commit_preview(request), order_service)
+
+@router.post("/orders", response_model=OrderResponse)
+@handle_exceptions
+def place_order(items: OrderItems, order_service: OrderServiceDep) -> OrderJSONResponse:
+    return _render(order_service.place_structured_order(items), order_service)
 
-@router.get("/orders")
+@router.patch("/orders/{order_id}", response_model=OrderResponse)
 @handle_exceptions
-def get_orders(order_service: OrderServiceDep):
-    return order_service.get_current_orders()
+def modify_order(order_id: ValidOrderIdDep, request: ModifyOrderRequest, order_service: OrderServiceDep) -> OrderJSONResponse:
+    return _render(order_service.modify_structured_order(order_id, request), order_service)
 
-@router.get("/orders/{order_id}")
+@router.post("/orders/bulk", response_model=BulkResponse)
 @handle_exceptions
-async def get_order(order_id: int, order_service: OrderServiceDep):
-    return await order_service.get_order_details(order_id)
+def place_orders_bulk(request: BulkOrderRequest, order_service: OrderServiceDep) -> OrderJSONResponse:
+    return _render(order_service.place_orders_bulk(request), order_service)
 
-@router.delete("/orders/{order_id}")
+@router.post("/orders/bulk-cancel", response_model=BulkResponse)
 @handle_exceptions
-async def cancel_order(order_id: int, order_service: OrderServiceDep):
-    return await order_service.cancel_order_by_id(order_id)
+def cancel_orders_bulk(request: BulkCancelRequest, order_service: OrderServiceDep) -> OrderJSONResponse:
+    return _render(order_service.cancel_orders_bulk(request), order_service)
+
+@router.get("/orders", response_model=OrderResponse)
+@handle_exceptions
+async def get_orders(request: Request, location: LocationDep):
+    # Conditional GET: pollers that already have this version get 304 before any response is built.
+    # Headers are read off the request: declared Header params cost more than the whole 304 path.
+    # With several workers the snapshot may be the one the location's writing worker shared
+    snapshot = location.get_snapshot()
+    return snapshot_response(
+        snapshot,
+        lambda: encode_order_response(location.order_service.get_current_orders(snapshot), snapshot),
+        request.headers.get("if-none-match"),
+        request.headers.get("accept-encoding")
+    )
 
 @router.get("/orders/stats")
 @handle_exceptions
-async def get_stats(order_service: OrderServiceDep):
-    return await order_service.get_comprehensive_stats()
+def get_stats(location: LocationDep, admission: AdmissionDep):
+    return {**location.get_stats(), "admission": admission.get_stats()}
 
-@router.get("/orders/history")
+@router.get("/orders/events", response_model=OrderEventsResponse)
 @handle_exceptions
-async def get_history(
+async def get_order_events(
     order_service: OrderServiceDep,
-    limit: int = 50
+    after: int = Query(0, ge=0, description="Last sequence number already seen"),
+    limit: int = Query(500, ge=1, le=5000),
+    wait: float = Query(0, ge=0, le=Config.ORDER_FEED_MAX_WAIT_SECONDS, description="Long-poll up to this many seconds for new events")
 ):
-    return await order_service.get_order_history(limit)
\ No newline at end of file
+    feed = order_service.order_store.feed
+    if wait and feed is not None:
+        await feed.wait_async(after, wait)
+    return order_service.get_events(after, limit)
+
+@router.get("/orders/history", response_model=List[OrderDetails])
+@handle_exceptions
+def get_history(
+    order_service: OrderServiceDep,
+    limit: int = Query(50, ge=1, le=1000)
+):
+    return order_service.get_order_history(limit)
+
+@router.get("/orders/status/{status}", response_model=List[OrderDetails])
+@handle_exceptions
+def get_orders_by_status(status: OrderStatus, order_service: OrderServiceDep):
+    return order_service.get_orders_by_status(status)
+
+@router.get("/orders/{order_id}", response_model=OrderDetails)
+@handle_exceptions
+def get_order(order_id: ValidOrderIdDep, order_service: OrderServiceDep):
+    return order_service.get_order_details(order_id)
+
+@router.post("/orders/{order_id}/status", response_model=OrderDetails)
+@handle_exceptions
+def update_order_status(order_id: ValidOrderIdDep, request: OrderStatusUpdate, order_service: OrderServiceDep):
+    return order_service.update_order_status(order_id, request.status)
+
+@router.delete("/orders/{order_id}", response_model=OrderResponse)
+@handle_exceptions
+def cancel_order(order_id: ValidOrderIdDep, order_service: OrderServiceDep) -> OrderJSONResponse:
+    return _render(order_service.cancel_order(order_id), order_service)
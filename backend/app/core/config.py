@@ -1,9 +1,24 @@
 import os
-from typing import Literal, Optional
+import re
+from typing import Dict, List, Literal, Optional, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def _parse_sample_rates(value: str) -> Tuple[Dict[str, float], List[str]]:
+    """``"name=rate,..."`` -> (rates, entries that are not ``name=number``), so a typo cannot fail the import"""
+    rates: Dict[str, float] = {}
+    invalid: List[str] = []
+    for entry in value.split(","):
+        name, _, rate = entry.partition("=")
+        if not name.strip():
+            continue
+        try:
+            rates[name.strip()] = float(rate)
+        except ValueError:
+            invalid.append(entry.strip())
+    return rates, invalid
+
 class Config:
     
     # Server settings
@@ -11,6 +26,14 @@ class Config:
     PORT: int = int(os.getenv("PORT", "8000"))
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     RELOAD: bool = os.getenv("RELOAD", "true").lower() == "true"
+    # Production launch (python main.py without DEBUG): uvicorn worker processes, each with its own
+    # in-memory orders; threads for sync endpoints and provider calls; and how long shutdown waits
+    # for requests already received before cutting them off
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "1"))
+    SERVER_THREADPOOL_SIZE: int = int(os.getenv("SERVER_THREADPOOL_SIZE", "64"))
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "5"))
+    SERVER_DRAIN_SECONDS: float = float(os.getenv("SERVER_DRAIN_SECONDS", "30"))
     
     # Environment
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
@@ -25,6 +48,34 @@ class Config:
     # AI Model settings
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+    # Optional smaller models for simple messages; the models above take complex ones and fast-model failures
+    OPENAI_FAST_MODEL: str = os.getenv("OPENAI_FAST_MODEL", "")
+    GEMINI_FAST_MODEL: str = os.getenv("GEMINI_FAST_MODEL", "")
+    AI_ROUTER_MAX_COMPLEXITY: float = float(os.getenv("AI_ROUTER_MAX_COMPLEXITY", "1.0"))
+    # Caps generation per request; a function call for a typical order is well under 100 tokens
+    AI_MAX_OUTPUT_TOKENS: int = int(os.getenv("AI_MAX_OUTPUT_TOKENS", "256"))
+    
+    # Record/replay of provider traffic (AI_PROVIDER=replay serves AI_REPLAY_FILE offline)
+    AI_RECORD_FILE: Optional[str] = os.getenv("AI_RECORD_FILE")
+    AI_REPLAY_FILE: Optional[str] = os.getenv("AI_REPLAY_FILE")
+    AI_REPLAY_LATENCY_SCALE: float = float(os.getenv("AI_REPLAY_LATENCY_SCALE", "1.0"))
+    
+    # Tiered intent parsing: cheaper tiers answer first, escalating to the cloud provider
+    # on low confidence. "local" is skipped unless LOCAL_MODEL_FILE is set.
+    AI_TIERS: list = [t.strip() for t in os.getenv("AI_TIERS", "rules,local,cloud").lower().split(",") if t.strip()]
+    LOCAL_MODEL_FILE: Optional[str] = os.getenv("LOCAL_MODEL_FILE")
+    LOCAL_MODEL_MIN_CONFIDENCE: float = float(os.getenv("LOCAL_MODEL_MIN_CONFIDENCE", "0.9"))
+    
+    # Shadow evaluation: AI_SHADOW_SAMPLE_RATE of the messages the primary answers are also sent to this
+    # candidate provider ("openai" or "gemini", with AI_SHADOW_MODEL or that provider's model; empty = off)
+    # in the background, and the comparisons are appended to AI_SHADOW_FILE. Beyond AI_SHADOW_QUEUE_SIZE
+    # waiting messages, samples are dropped
+    AI_SHADOW_PROVIDER: str = os.getenv("AI_SHADOW_PROVIDER", "").lower()
+    AI_SHADOW_MODEL: Optional[str] = os.getenv("AI_SHADOW_MODEL") or None
+    AI_SHADOW_SAMPLE_RATE: float = float(os.getenv("AI_SHADOW_SAMPLE_RATE", "0.1"))
+    AI_SHADOW_QUEUE_SIZE: int = int(os.getenv("AI_SHADOW_QUEUE_SIZE", "100"))
+    AI_SHADOW_WORKERS: int = int(os.getenv("AI_SHADOW_WORKERS", "2"))
+    AI_SHADOW_FILE: Optional[str] = os.getenv("AI_SHADOW_FILE")
     
     # CORS settings
     ALLOWED_ORIGINS: list = ["*"]
@@ -34,13 +85,82 @@ class Config:
     MAX_MESSAGE_LENGTH: int = int(os.getenv("MAX_MESSAGE_LENGTH", "500"))
     MIN_MESSAGE_LENGTH: int = int(os.getenv("MIN_MESSAGE_LENGTH", "1"))
     
+    # Bulk ingestion (kiosk replay)
+    MAX_BULK_ITEMS: int = int(os.getenv("MAX_BULK_ITEMS", "500"))
+    IDEMPOTENCY_KEY_LIMIT: int = int(os.getenv("IDEMPOTENCY_KEY_LIMIT", "100000"))
+    
+    # Idempotency-Key replay table for /process
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+    IDEMPOTENCY_MAX_ENTRIES: int = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+    
+    # Two-phase /process: previewed intents wait this long for a commit
+    PREVIEW_TTL_SECONDS: int = int(os.getenv("PREVIEW_TTL_SECONDS", "60"))
+    PREVIEW_MAX_ENTRIES: int = int(os.getenv("PREVIEW_MAX_ENTRIES", "10000"))
+    
+    # Per-lane conversation sessions (follow-ups resolved against the lane's last order)
+    SESSION_TTL_SECONDS: int = int(os.getenv("SESSION_TTL_SECONDS", "300"))
+    SESSION_MAX_ENTRIES: int = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+    SESSION_LOCAL_RESOLUTION: bool = os.getenv("SESSION_LOCAL_RESOLUTION", "true").lower() == "true"
+    
+    # Menu catalog (JSON list of {"key", "singular", "plural", "station", "prep_seconds"}); built-in menu when unset
+    MENU_FILE: Optional[str] = os.getenv("MENU_FILE")
+    
+    # Retention: completed/canceled orders leave memory after ORDER_RETENTION_SECONDS or
+    # beyond the newest ORDER_RETENTION_MAX_ORDERS, appended to ORDER_ARCHIVE_FILE when set
+    ORDER_ARCHIVE_FILE: Optional[str] = os.getenv("ORDER_ARCHIVE_FILE")
+    ORDER_RETENTION_SECONDS: int = int(os.getenv("ORDER_RETENTION_SECONDS", "900"))
+    ORDER_RETENTION_MAX_ORDERS: int = int(os.getenv("ORDER_RETENTION_MAX_ORDERS", "5000"))
+    ORDER_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("ORDER_SWEEP_INTERVAL_SECONDS", "30"))
+    ANALYTICS_RETENTION_HOURS: int = int(os.getenv("ANALYTICS_RETENTION_HOURS", str(24 * 31)))
+    
+    # Change feed: the last ORDER_FEED_CAPACITY order events stay readable (0 disables)
+    ORDER_FEED_CAPACITY: int = int(os.getenv("ORDER_FEED_CAPACITY", "65536"))
+    ORDER_FEED_MAX_WAIT_SECONDS: float = float(os.getenv("ORDER_FEED_MAX_WAIT_SECONDS", "30"))
+    # GET /orders bodies at least this large are sent compressed (brotli if installed, else gzip)
+    ORDER_LIST_COMPRESSION_MIN_BYTES: int = int(os.getenv("ORDER_LIST_COMPRESSION_MIN_BYTES", "1024"))
+    
+    # Kitchen queue: "batch" groups like items across orders, "fifo" cooks one ticket per cycle
+    KITCHEN_SCHEDULER: str = os.getenv("KITCHEN_SCHEDULER", "batch").lower()
+    KITCHEN_BATCH_WINDOW_SECONDS: float = float(os.getenv("KITCHEN_BATCH_WINDOW_SECONDS", "120"))
+    # Wait-time estimates: weight of each newly ready order, and the initial seconds per unit of load
+    ETA_SMOOTHING: float = float(os.getenv("ETA_SMOOTHING", "0.05"))
+    ETA_SECONDS_PER_UNIT: float = float(os.getenv("ETA_SECONDS_PER_UNIT", "10"))
+    
+    # Locations: requests choose one with the X-Location header, DEFAULT_LOCATION when absent. Each has
+    # its own store, order IDs, kitchen and estimates. LOCATIONS lists the accepted IDs; when empty any
+    # well-formed ID is accepted until MAX_LOCATIONS exist
+    DEFAULT_LOCATION: str = os.getenv("DEFAULT_LOCATION", "default")
+    LOCATIONS: list = [location.strip() for location in os.getenv("LOCATIONS", "").split(",") if location.strip()]
+    MAX_LOCATIONS: int = int(os.getenv("MAX_LOCATIONS", "256"))
+    # With several workers: the worker that writes a location publishes its active orders, totals and
+    # counts into SHARED_SNAPSHOT_DIR/<location>.snap (use tmpfs, e.g. /dev/shm/orders; empty = off), and the
+    # others serve GET /orders and stats from it. SHARED_SNAPSHOT_BYTES is the room for one snapshot
+    SHARED_SNAPSHOT_DIR: str = os.getenv("SHARED_SNAPSHOT_DIR", "")
+    SHARED_SNAPSHOT_BYTES: int = int(os.getenv("SHARED_SNAPSHOT_BYTES", str(8 * 1024 * 1024)))
+    
     # Request timeouts (in seconds)
     AI_REQUEST_TIMEOUT: int = int(os.getenv("AI_REQUEST_TIMEOUT", "30"))
     DEFAULT_REQUEST_TIMEOUT: int = int(os.getenv("DEFAULT_REQUEST_TIMEOUT", "60"))
     
+    # /process admission: deadline when the client sends no X-Deadline-Ms, concurrent provider-bound
+    # requests, and how many may wait (in total and per lane) before new ones are turned away
+    PROCESS_DEFAULT_DEADLINE_SECONDS: float = float(os.getenv("PROCESS_DEFAULT_DEADLINE_SECONDS", "8"))
+    PROCESS_MAX_CONCURRENCY: int = int(os.getenv("PROCESS_MAX_CONCURRENCY", "32"))
+    PROCESS_MAX_QUEUE: int = int(os.getenv("PROCESS_MAX_QUEUE", "256"))
+    PROCESS_MAX_QUEUE_PER_LANE: int = int(os.getenv("PROCESS_MAX_QUEUE_PER_LANE", "16"))
+    
     # Logging settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
     LOG_FORMAT: str = os.getenv("LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    # One JSON object per line instead of LOG_FORMAT
+    LOG_JSON: bool = os.getenv("LOG_JSON", "true").lower() == "true"
+    # Records waiting for the writer thread; beyond this they are dropped rather than blocking requests
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Share of DEBUG/INFO records kept per logger, e.g. "uvicorn.access=0.05,app.services.order_service=0.2"
+    # Malformed entries are left out and reported by validate()
+    LOG_SAMPLE_RATES, LOG_SAMPLE_RATES_INVALID = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+    # Share of provider calls whose raw response is kept and logged (always at LOG_LEVEL=DEBUG)
+    AI_RAW_RESPONSE_SAMPLE_RATE: float = float(os.getenv("AI_RAW_RESPONSE_SAMPLE_RATE", "0"))
     
     # Rate limiting (requests per minute)
     RATE_LIMIT_REQUESTS: int = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
@@ -63,8 +183,32 @@ class Config:
     def validate(cls) -> list[str]:
         errors = []
         
-        if cls.AI_PROVIDER not in ["openai", "gemini"]:
-            errors.append(f"Invalid AI_PROVIDER: {cls.AI_PROVIDER}. Must be 'openai' or 'gemini'")
+        if cls.AI_PROVIDER not in ["openai", "gemini", "replay"]:
+            errors.append(f"Invalid AI_PROVIDER: {cls.AI_PROVIDER}. Must be 'openai', 'gemini' or 'replay'")
+        
+        if cls.AI_PROVIDER == "replay" and not cls.AI_REPLAY_FILE:
+            errors.append("AI_REPLAY_FILE is required when using the replay provider")
+        
+        if not cls.AI_TIERS or cls.AI_TIERS[-1] != "cloud" or not set(cls.AI_TIERS) <= {"rules", "local", "cloud"}:
+            errors.append(f"Invalid AI_TIERS: {','.join(cls.AI_TIERS)}. Use rules/local tiers followed by 'cloud'")
+        
+        if not 0 <= cls.LOCAL_MODEL_MIN_CONFIDENCE <= 1:
+            errors.append(f"Invalid LOCAL_MODEL_MIN_CONFIDENCE: {cls.LOCAL_MODEL_MIN_CONFIDENCE}. Must be between 0 and 1")
+        
+        if cls.AI_SHADOW_PROVIDER not in ["", "openai", "gemini"]:
+            errors.append(f"Invalid AI_SHADOW_PROVIDER: {cls.AI_SHADOW_PROVIDER}. Must be 'openai', 'gemini' or empty")
+        
+        if not 0 <= cls.AI_SHADOW_SAMPLE_RATE <= 1:
+            errors.append(f"Invalid AI_SHADOW_SAMPLE_RATE: {cls.AI_SHADOW_SAMPLE_RATE}. Must be between 0 and 1")
+        
+        if cls.AI_SHADOW_QUEUE_SIZE <= 0:
+            errors.append(f"Invalid AI_SHADOW_QUEUE_SIZE: {cls.AI_SHADOW_QUEUE_SIZE}. Must be positive")
+        
+        if cls.AI_SHADOW_WORKERS <= 0:
+            errors.append(f"Invalid AI_SHADOW_WORKERS: {cls.AI_SHADOW_WORKERS}. Must be positive")
+        
+        if cls.AI_REPLAY_LATENCY_SCALE < 0:
+            errors.append(f"Invalid AI_REPLAY_LATENCY_SCALE: {cls.AI_REPLAY_LATENCY_SCALE}. Must not be negative")
         
         if cls.AI_PROVIDER == "openai" and not cls.OPENAI_API_KEY:
             errors.append("OPENAI_API_KEY is required when using OpenAI provider")
@@ -74,6 +218,27 @@ class Config:
         
         if cls.PORT < 1 or cls.PORT > 65535:
             errors.append(f"Invalid PORT: {cls.PORT}. Must be between 1 and 65535")
+        
+        if cls.SERVER_WORKERS <= 0:
+            errors.append(f"Invalid SERVER_WORKERS: {cls.SERVER_WORKERS}. Must be positive")
+        
+        if cls.SERVER_THREADPOOL_SIZE < cls.PROCESS_MAX_CONCURRENCY:
+            errors.append(
+                f"Invalid SERVER_THREADPOOL_SIZE: {cls.SERVER_THREADPOOL_SIZE}. "
+                f"Must be at least PROCESS_MAX_CONCURRENCY ({cls.PROCESS_MAX_CONCURRENCY})"
+            )
+        
+        if cls.SERVER_BACKLOG <= 0:
+            errors.append(f"Invalid SERVER_BACKLOG: {cls.SERVER_BACKLOG}. Must be positive")
+        
+        if cls.SERVER_KEEPALIVE_SECONDS <= 0:
+            errors.append(f"Invalid SERVER_KEEPALIVE_SECONDS: {cls.SERVER_KEEPALIVE_SECONDS}. Must be positive")
+        
+        if cls.SERVER_DRAIN_SECONDS < cls.PROCESS_DEFAULT_DEADLINE_SECONDS:
+            errors.append(
+                f"Invalid SERVER_DRAIN_SECONDS: {cls.SERVER_DRAIN_SECONDS}. "
+                f"Must be at least PROCESS_DEFAULT_DEADLINE_SECONDS ({cls.PROCESS_DEFAULT_DEADLINE_SECONDS})"
+            )
 
         if cls.MAX_ITEM_QUANTITY <= 0:
             errors.append(f"Invalid MAX_ITEM_QUANTITY: {cls.MAX_ITEM_QUANTITY}. Must be positive")
@@ -81,13 +246,98 @@ class Config:
         if cls.MAX_MESSAGE_LENGTH <= cls.MIN_MESSAGE_LENGTH:
             errors.append(f"MAX_MESSAGE_LENGTH ({cls.MAX_MESSAGE_LENGTH}) must be greater than MIN_MESSAGE_LENGTH ({cls.MIN_MESSAGE_LENGTH})")
  
+        if cls.MAX_BULK_ITEMS <= 0:
+            errors.append(f"Invalid MAX_BULK_ITEMS: {cls.MAX_BULK_ITEMS}. Must be positive")
+ 
+        if cls.IDEMPOTENCY_TTL_SECONDS <= 0 or cls.IDEMPOTENCY_MAX_ENTRIES <= 0:
+            errors.append("IDEMPOTENCY_TTL_SECONDS and IDEMPOTENCY_MAX_ENTRIES must be positive")
+ 
+        if cls.PREVIEW_TTL_SECONDS <= 0 or cls.PREVIEW_MAX_ENTRIES <= 0:
+            errors.append("PREVIEW_TTL_SECONDS and PREVIEW_MAX_ENTRIES must be positive")
+ 
+        if cls.SESSION_TTL_SECONDS <= 0 or cls.SESSION_MAX_ENTRIES <= 0:
+            errors.append("SESSION_TTL_SECONDS and SESSION_MAX_ENTRIES must be positive")
+ 
+        if cls.ORDER_RETENTION_SECONDS < 0 or cls.ORDER_RETENTION_MAX_ORDERS < 0:
+            errors.append("ORDER_RETENTION_SECONDS and ORDER_RETENTION_MAX_ORDERS must not be negative")
+ 
+        if cls.ORDER_SWEEP_INTERVAL_SECONDS <= 0:
+            errors.append(f"Invalid ORDER_SWEEP_INTERVAL_SECONDS: {cls.ORDER_SWEEP_INTERVAL_SECONDS}. Must be positive")
+ 
+        if cls.ORDER_FEED_CAPACITY < 0:
+            errors.append(f"Invalid ORDER_FEED_CAPACITY: {cls.ORDER_FEED_CAPACITY}. Must not be negative")
+        
+        if cls.ORDER_FEED_MAX_WAIT_SECONDS < 0:
+            errors.append(f"Invalid ORDER_FEED_MAX_WAIT_SECONDS: {cls.ORDER_FEED_MAX_WAIT_SECONDS}. Must not be negative")
+        
+        if cls.ORDER_LIST_COMPRESSION_MIN_BYTES < 0:
+            errors.append(f"Invalid ORDER_LIST_COMPRESSION_MIN_BYTES: {cls.ORDER_LIST_COMPRESSION_MIN_BYTES}. Must not be negative")
+        
+        if cls.ANALYTICS_RETENTION_HOURS < 24 * 31:
+            errors.append(f"ANALYTICS_RETENTION_HOURS ({cls.ANALYTICS_RETENTION_HOURS}) must cover the 744-hour analytics window")
+ 
+        if cls.KITCHEN_SCHEDULER not in ["batch", "fifo"]:
+            errors.append(f"Invalid KITCHEN_SCHEDULER: {cls.KITCHEN_SCHEDULER}. Must be 'batch' or 'fifo'")
+ 
+        if cls.KITCHEN_BATCH_WINDOW_SECONDS < 0:
+            errors.append(f"Invalid KITCHEN_BATCH_WINDOW_SECONDS: {cls.KITCHEN_BATCH_WINDOW_SECONDS}. Must not be negative")
+        
+        if not 0 < cls.ETA_SMOOTHING < 1:
+            errors.append(f"Invalid ETA_SMOOTHING: {cls.ETA_SMOOTHING}. Must be between 0 and 1")
+        
+        if cls.ETA_SECONDS_PER_UNIT < 0:
+            errors.append(f"Invalid ETA_SECONDS_PER_UNIT: {cls.ETA_SECONDS_PER_UNIT}. Must not be negative")
+        
+        for location in [cls.DEFAULT_LOCATION, *cls.LOCATIONS]:
+            if not re.fullmatch(r"[A-Za-z0-9_-]{1,32}", location):
+                errors.append(f"Invalid location ID: {location!r}. Use up to 32 letters, digits, '-' or '_'")
+        
+        if cls.MAX_LOCATIONS <= 0:
+            errors.append(f"Invalid MAX_LOCATIONS: {cls.MAX_LOCATIONS}. Must be positive")
+        
+        if cls.SHARED_SNAPSHOT_BYTES <= 0:
+            errors.append(f"Invalid SHARED_SNAPSHOT_BYTES: {cls.SHARED_SNAPSHOT_BYTES}. Must be positive")
+ 
         if cls.AI_REQUEST_TIMEOUT <= 0:
             errors.append(f"Invalid AI_REQUEST_TIMEOUT: {cls.AI_REQUEST_TIMEOUT}. Must be positive")
         
+        if not 0 < cls.PROCESS_DEFAULT_DEADLINE_SECONDS < cls.DEFAULT_REQUEST_TIMEOUT:
+            errors.append(
+                f"Invalid PROCESS_DEFAULT_DEADLINE_SECONDS: {cls.PROCESS_DEFAULT_DEADLINE_SECONDS}. "
+                f"Must be positive and below DEFAULT_REQUEST_TIMEOUT ({cls.DEFAULT_REQUEST_TIMEOUT})"
+            )
+        
+        if cls.PROCESS_MAX_CONCURRENCY <= 0:
+            errors.append(f"Invalid PROCESS_MAX_CONCURRENCY: {cls.PROCESS_MAX_CONCURRENCY}. Must be positive")
+        
+        if cls.PROCESS_MAX_QUEUE <= 0:
+            errors.append(f"Invalid PROCESS_MAX_QUEUE: {cls.PROCESS_MAX_QUEUE}. Must be positive")
+        
+        if cls.PROCESS_MAX_QUEUE_PER_LANE <= 0:
+            errors.append(f"Invalid PROCESS_MAX_QUEUE_PER_LANE: {cls.PROCESS_MAX_QUEUE_PER_LANE}. Must be positive")
+        
+        if cls.AI_ROUTER_MAX_COMPLEXITY < 0:
+            errors.append(f"Invalid AI_ROUTER_MAX_COMPLEXITY: {cls.AI_ROUTER_MAX_COMPLEXITY}. Must not be negative")
+        
+        if cls.AI_MAX_OUTPUT_TOKENS <= 0:
+            errors.append(f"Invalid AI_MAX_OUTPUT_TOKENS: {cls.AI_MAX_OUTPUT_TOKENS}. Must be positive")
+        
         valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         if cls.LOG_LEVEL not in valid_log_levels:
             errors.append(f"Invalid LOG_LEVEL: {cls.LOG_LEVEL}. Must be one of {valid_log_levels}")
         
+        if cls.LOG_QUEUE_SIZE <= 0:
+            errors.append(f"Invalid LOG_QUEUE_SIZE: {cls.LOG_QUEUE_SIZE}. Must be positive")
+        
+        for entry in cls.LOG_SAMPLE_RATES_INVALID:
+            errors.append(f"Invalid LOG_SAMPLE_RATES entry {entry!r}. Must be name=rate")
+        for name, rate in cls.LOG_SAMPLE_RATES.items():
+            if not 0 <= rate <= 1:
+                errors.append(f"Invalid LOG_SAMPLE_RATES entry {name}={rate}. Must be between 0 and 1")
+        
+        if not 0 <= cls.AI_RAW_RESPONSE_SAMPLE_RATE <= 1:
+            errors.append(f"Invalid AI_RAW_RESPONSE_SAMPLE_RATE: {cls.AI_RAW_RESPONSE_SAMPLE_RATE}. Must be between 0 and 1")
+        
         if cls.RATE_LIMIT_REQUESTS <= 0:
             errors.append(f"Invalid RATE_LIMIT_REQUESTS: {cls.RATE_LIMIT_REQUESTS}. Must be positive")
         
@@ -0,0 +1,30 @@
+"""Per-request deadline, visible to everything the request calls on its thread"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+@contextmanager
+def deadline_scope(deadline: Optional[float]) -> Iterator[None]:
+    """Run the block with ``deadline`` (a ``time.monotonic()`` value) as the current deadline"""
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def budget(cap: float) -> float:
+    """Timeout for a blocking call: ``cap``, or less if the deadline is closer"""
+    left = remaining()
+    return cap if left is None else max(0.0, min(cap, left))
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
@@ -1,43 +1,75 @@
 from fastapi import Request, Depends, HTTPException
 from app.services.order_service import OrderService
 from app.services.ai_service import AIService
+from app.services.analytics_service import AnalyticsService
+from app.services.kitchen_service import KitchenService
+from app.services.admission import AdmissionController
+from app.services.locations import Location, LocationRegistry
 from app.models.db_models import OrderStore
+from app.utils.exception_utils import LocationNotFoundError
 from typing import Annotated
 
 # ---------- Core Dependencies ----------
+# Async so FastAPI calls them inline; a sync dependency costs a thread pool round trip per request
 
-def get_order_store(request: Request) -> OrderStore:
-    return request.app.state.order_store
+async def get_location(request: Request) -> Location:
+    """The location named by the X-Location header, or the default one"""
+    locations: LocationRegistry = request.app.state.locations
+    try:
+        return locations.get(request.headers.get("x-location") or locations.default_id)
+    except LocationNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-def get_ai_service(request: Request) -> AIService:
+async def get_locations(request: Request) -> LocationRegistry:
+    return request.app.state.locations
+
+async def get_order_store(request: Request) -> OrderStore:
+    return (await get_location(request)).order_store
+
+async def get_ai_service(request: Request) -> AIService:
     return request.app.state.ai_service
 
-def get_order_service(request: Request) -> OrderService:
-    return request.app.state.order_service
+async def get_order_service(request: Request) -> OrderService:
+    return (await get_location(request)).order_service
+
+async def get_analytics_service(request: Request) -> AnalyticsService:
+    return (await get_location(request)).analytics_service
+
+async def get_kitchen_service(request: Request) -> KitchenService:
+    return (await get_location(request)).kitchen_service
+
+async def get_admission(request: Request) -> AdmissionController:
+    return request.app.state.admission
 
+LocationDep = Annotated[Location, Depends(get_location)]
+LocationRegistryDep = Annotated[LocationRegistry, Depends(get_locations)]
 OrderStoreDep = Annotated[OrderStore, Depends(get_order_store)]
 AIServiceDep = Annotated[AIService, Depends(get_ai_service)]
 OrderServiceDep = Annotated[OrderService, Depends(get_order_service)]
+AnalyticsServiceDep = Annotated[AnalyticsService, Depends(get_analytics_service)]
+KitchenServiceDep = Annotated[KitchenService, Depends(get_kitchen_service)]
+AdmissionDep = Annotated[AdmissionController, Depends(get_admission)]
 
 # ---------- Composite Dependencies ----------
 
-def get_all_services(request: Request) -> tuple[OrderStore, AIService, OrderService]:
+async def get_all_services(request: Request) -> tuple[OrderStore, AIService, OrderService]:
+    location = await get_location(request)
     return (
-        request.app.state.order_store,
+        location.order_store,
         request.app.state.ai_service,
-        request.app.state.order_service
+        location.order_service
     )
 
 AllServicesDep = Annotated[
-    tuple[OrderStore, AIService, OrderService], 
+    tuple[OrderStore, AIService, OrderService],
     Depends(get_all_services)
 ]
 
 # ---------- Validation Dependencies ----------
 
-def validate_order_id(order_id: int) -> int:
+async def validate_order_id(order_id: int) -> int:
     if order_id <= 0:
         raise HTTPException(status_code=400, detail="Order ID must be positive")
     return order_id
 
-ValidOrderIdDep = Annotated[int, Depends(validate_order_id)]
\ No newline at end of file
+ValidOrderIdDep = Annotated[int, Depends(validate_order_id)]
@@ -0,0 +1,151 @@
+"""Logging that stays off the request path.
+
+Request threads only create the record, sample it and put it on a bounded
+queue; a listener thread formats and writes it. Formatting is lazy, so
+call sites pass ``%s`` arguments instead of f-strings, and arguments must
+not be mutated after the call.
+"""
+import atexit
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import orjson
+from app.core.config import Config
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRS = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, ``extra`` fields, exception"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+class SamplingFilter(logging.Filter):
+    """Keeps ``rates[name]`` of the DEBUG/INFO records from logger ``name`` and its children.
+
+    Warnings and errors always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        # Logger name -> rate of its nearest configured ancestor (None: keep everything)
+        self._resolved: Dict[str, Optional[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        name = record.name
+        try:
+            rate = self._resolved[name]
+        except KeyError:
+            rate = self._resolved[name] = self._rate(name)
+        return rate is None or random.random() < rate
+
+    def _rate(self, name: str) -> Optional[float]:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueues records unformatted, and drops them instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener formats in this process, so only the traceback (tied to live frames) is rendered now
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(stream=None) -> Optional[NonBlockingQueueHandler]:
+    """Route the root logger and uvicorn's loggers through one queue and writer thread.
+
+    Configured from LOG_LEVEL, ENABLE_LOGGING, LOG_JSON/LOG_FORMAT,
+    LOG_QUEUE_SIZE and LOG_SAMPLE_RATES. Calling it again replaces the
+    previous pipeline. Returns the queue handler (its ``dropped`` counts
+    records lost to a full queue), or None with logging disabled.
+    """
+    global _listener
+    root = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    if not Config.ENABLE_LOGGING:
+        logging.disable(logging.CRITICAL)
+        return None
+    logging.disable(logging.NOTSET)
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(JSONFormatter() if Config.LOG_JSON else logging.Formatter(Config.LOG_FORMAT))
+    handler = NonBlockingQueueHandler(queue.Queue(Config.LOG_QUEUE_SIZE))
+    if Config.LOG_SAMPLE_RATES:
+        handler.addFilter(SamplingFilter(Config.LOG_SAMPLE_RATES))
+    root.addHandler(handler)
+    root.setLevel(Config.LOG_LEVEL)
+
+    # uvicorn installs its own synchronous stream handlers; send its records through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(handler.queue, writer, respect_handler_level=True)
+    _listener.start()
+    for entry in Config.LOG_SAMPLE_RATES_INVALID:
+        logging.getLogger(__name__).warning("Ignoring LOG_SAMPLE_RATES entry %r: expected name=rate", entry)
+    return handler
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread; later records are written directly.
+
+    Called at shutdown: uvicorn re-raises SIGTERM once it is done, so atexit
+    handlers do not run on a signal-driven exit.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, NonBlockingQueueHandler):
+                root.removeHandler(handler)
+                for writer in _listener.handlers:
+                    for sampling in handler.filters:
+                        writer.addFilter(sampling)
+                    root.addHandler(writer)
+        _listener = None
+
+atexit.register(stop_logging)
@@ -0,0 +1,46 @@
+"""Production launch: uvicorn on uvloop and httptools, sized from Config.
+
+On SIGTERM or SIGINT uvicorn closes its listening sockets, closes idle
+keep-alive connections, and waits up to SERVER_DRAIN_SECONDS for requests
+it already received (including /process calls queued for admission or
+waiting on the provider). Only then does the app's lifespan shutdown run.
+With several workers the supervisor forwards the signal, and each worker
+drains on its own.
+"""
+import importlib.util
+import logging
+from typing import Union
+import anyio.to_thread
+import uvicorn
+from app.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+def tune_threadpool() -> None:
+    """Size the pool behind sync endpoints and ``run_in_threadpool`` (anyio's default is 40).
+
+    Call from inside the event loop, e.g. in the lifespan handler.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = Config.SERVER_THREADPOOL_SIZE
+
+def run_server(app: Union[str, object]) -> None:
+    """Serve ``app``, an ASGI app or, with SERVER_WORKERS > 1, its import string"""
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    if (loop, http) != ("uvloop", "httptools"):
+        logger.warning("uvloop/httptools not installed (pip install 'uvicorn[standard]'); using %s and %s", loop, http)
+    uvicorn.run(
+        app,
+        host=Config.HOST,
+        port=Config.PORT,
+        workers=Config.SERVER_WORKERS,
+        loop=loop,
+        http=http,
+        backlog=Config.SERVER_BACKLOG,
+        timeout_keep_alive=Config.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=Config.SERVER_DRAIN_SECONDS,
+        lifespan="on",
+        # setup_logging() already routes uvicorn's loggers through the queue
+        log_config=None,
+        server_header=False,
+    )
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+from array import array
+from typing import Dict, List, NamedTuple, Optional
+
+class OrderEvent(NamedTuple):
+    seq: int
+    type: str  # "modified" or the order's new status
+    order_id: int
+    quantities: array  # shared with the store; treat as read-only
+    timestamp: float
+
+class ChangeFeedGap(Exception):
+    """The reader fell further behind than the ring holds; rebuild from a snapshot"""
+
+    def __init__(self, after_seq: int, oldest_seq: int):
+        self.after_seq = after_seq
+        self.oldest_seq = oldest_seq
+        super().__init__(f"Events after #{after_seq} are gone; oldest retained is #{oldest_seq}")
+
+class ChangeFeed:
+    """Ordered order events in a fixed-size ring, numbered from 1.
+
+    There is one writer (the store, under its lock) and any number of
+    readers, which never block it: a reader copies events out of the ring
+    and then checks whether the writer reused any of those slots meanwhile.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("ChangeFeed capacity must be positive")
+        self.capacity = capacity
+        self._ring: List[Optional[OrderEvent]] = [None] * capacity
+        self._last_seq = 0
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._subscriptions: Dict[str, "Subscription"] = {}
+        self._dropped = 0
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def oldest_seq(self) -> int:
+        return max(1, self._last_seq - self.capacity + 1)
+
+    def publish(self, event_type: str, order_id: int, quantities: array, timestamp: float) -> OrderEvent:
+        """Append an event; callers must serialize publishes (the store lock does)"""
+        seq = self._last_seq + 1
+        event = OrderEvent(seq, event_type, order_id, quantities, timestamp)
+        self._ring[seq % self.capacity] = event
+        self._last_seq = seq
+        # Wake parked readers once; they drain everything published since before parking again
+        if self._waiting:
+            with self._cond:
+                self._waiting = 0
+                self._cond.notify_all()
+        return event
+
+    def read(self, after_seq: int, limit: int = 1000) -> List[OrderEvent]:
+        """Up to ``limit`` events with ``seq > after_seq``; raises ChangeFeedGap if some are gone"""
+        last = self._last_seq
+        if after_seq == last:
+            return []
+        # Too old, or from before a restart
+        if after_seq > last or after_seq + 1 < last - self.capacity + 1:
+            raise ChangeFeedGap(after_seq, self.oldest_seq)
+        ring, capacity = self._ring, self.capacity
+        events = [ring[seq % capacity] for seq in range(after_seq + 1, min(last, after_seq + limit) + 1)]
+        # The writer may have lapped us while copying: slot ``seq`` is reused by ``seq + capacity``
+        if self._last_seq >= after_seq + 1 + capacity:
+            raise ChangeFeedGap(after_seq, self.oldest_seq)
+        return events
+
+    def wait(self, after_seq: int, timeout: float) -> bool:
+        """Block until an event newer than ``after_seq`` exists or ``timeout`` passes"""
+        if self._last_seq > after_seq:
+            return True
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                # Registered before re-checking, so a publish in between still notifies
+                self._waiting += 1
+                if self._last_seq > after_seq:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+
+    async def wait_async(self, after_seq: int, timeout: float, interval: float = 0.02) -> bool:
+        """``wait`` for the event loop: polls instead of parking a thread per waiter"""
+        deadline = time.monotonic() + timeout
+        while self._last_seq <= after_seq:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+        return True
+
+    def subscribe(self, name: str, after_seq: Optional[int] = None, max_lag: Optional[int] = None) -> "Subscription":
+        """Named cursor starting after ``after_seq`` (default: now).
+
+        A subscription more than ``max_lag`` events behind (at most the ring
+        capacity) is dropped on its next poll.
+        """
+        subscription = Subscription(
+            self, name, self._last_seq if after_seq is None else after_seq, min(max_lag or self.capacity, self.capacity)
+        )
+        with self._cond:
+            self._subscriptions[name] = subscription
+        return subscription
+
+    def unsubscribe(self, name: str) -> None:
+        with self._cond:
+            self._subscriptions.pop(name, None)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            subscriptions = list(self._subscriptions.values())
+        last = self._last_seq
+        return {
+            "last_seq": last,
+            "oldest_seq": self.oldest_seq,
+            "capacity": self.capacity,
+            "dropped_subscriptions": self._dropped,
+            "subscriptions": {s.name: {"cursor": s.cursor, "lag": last - s.cursor, "resyncs": s.resyncs} for s in subscriptions},
+        }
+
+class Subscription:
+    """A consumer's position in a ChangeFeed"""
+
+    def __init__(self, feed: ChangeFeed, name: str, cursor: int, max_lag: int):
+        self.feed = feed
+        self.name = name
+        self.cursor = cursor
+        self.max_lag = max_lag
+        self.resyncs = 0
+        self.closed = False
+
+    @property
+    def lag(self) -> int:
+        return self.feed.last_seq - self.cursor
+
+    def poll(self, limit: int = 1000, timeout: float = 0.0) -> List[OrderEvent]:
+        """Next events in order, waiting up to ``timeout`` for one.
+
+        Raises ChangeFeedGap when the subscription fell too far behind: it is
+        then closed, or, after ``resync(seq)``, continues from ``seq``.
+        """
+        if self.closed:
+            raise ChangeFeedGap(self.cursor, self.feed.oldest_seq)
+        if timeout > 0 and not self.feed.wait(self.cursor, timeout):
+            return []
+        try:
+            if self.lag > self.max_lag:
+                raise ChangeFeedGap(self.cursor, self.feed.oldest_seq)
+            events = self.feed.read(self.cursor, limit)
+        except ChangeFeedGap:
+            self.closed = True
+            self.feed._dropped += 1
+            raise
+        if events:
+            self.cursor = events[-1].seq
+        return events
+
+    def resync(self, seq: int) -> None:
+        """Continue after ``seq``, typically the ``seq`` of a fresh store snapshot"""
+        self.cursor = seq
+        self.closed = False
+        self.resyncs += 1
+
+    def close(self) -> None:
+        self.closed = True
+        self.feed.unsubscribe(self.name)
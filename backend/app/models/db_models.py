@@ -1,104 +1,454 @@
-from typing import Dict, Optional, List, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, List, Tuple
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
+import secrets
 import threading
+import time
+import orjson
+from app.models.menu import MenuCatalog, MENU
+from app.models.order_columns import OrderColumns
+from app.models.order_archive import OrderArchive
+from app.models.change_feed import ChangeFeed, OrderEvent
+from app.models.order_status import (
+    OrderStatus, TRANSITIONS, ACTIVE_STATUSES, MODIFIABLE_STATUSES, TERMINAL_STATUSES
+)
+from app.core.config import Config
+from app.utils.exception_utils import OrderNotFoundError, InvalidStatusTransitionError
 
 @dataclass
 class OrderInfo:
     id: int
-    items: Dict[str, int]
+    quantities: array
     timestamp: datetime
-    status: str = "active"
+    status: OrderStatus = OrderStatus.PLACED
+    # Set when the order reaches a terminal status
+    closed_at: Optional[datetime] = None
+
+@dataclass
+class OrderSnapshot:
+    """Active orders and totals at one store version.
+
+    The store hands out the same snapshot until its next mutation, so the
+    encoded JSON fragment is built once per version and shared by readers.
+    """
+    version: int
+    totals: Dict[str, int]
+    orders: Dict[int, Dict[str, int]]
+    # Last change feed event reflected here; feed readers resync from it
+    seq: int = 0
+    # Weak HTTP validator, unique to this store instance and version
+    etag: str = ""
+    _fragment: Optional[bytes] = field(default=None, repr=False)
+    _memo: Dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    def fragment(self) -> bytes:
+        """``"totals":{...},"orders":{...}`` ready to splice into a JSON object"""
+        if self._fragment is None:
+            encoded = orjson.dumps(
+                {"totals": self.totals, "orders": self.orders},
+                option=orjson.OPT_NON_STR_KEYS
+            )
+            self._fragment = encoded[1:-1]
+        return self._fragment
+
+    def memo(self, key: str, build: Callable[[], bytes]) -> bytes:
+        """Bytes derived from this version alone (an encoded or compressed body), built once"""
+        value = self._memo.get(key)
+        if value is None:
+            value = self._memo[key] = build()
+        return value
+
+def _history_key(order_info: OrderInfo) -> Tuple[int, float]:
+    # Millisecond placed time, the precision OrderArchive stores
+    return order_info.id, round(order_info.timestamp.timestamp(), 3)
 
 class OrderStore:
-    
-    def __init__(self):
+    """In-memory orders with a validated lifecycle.
+
+    Orders in an active status live in the hot tier (``_orders``); once they
+    reach a terminal status they move to the archive tier. Per-status index
+    sets make listing or counting a status O(result).
+
+    ``sweep`` enforces retention: archived orders older than
+    ``retention_seconds``, or beyond the newest ``max_archived``, are
+    appended to ``archive`` (when given) and dropped from memory.
+
+    Every mutation is published to ``feed``, a bounded ring of sequenced
+    events that consumers read at their own pace.
+    """
+
+    def __init__(
+        self,
+        menu: MenuCatalog = MENU,
+        columns: Optional[OrderColumns] = None,
+        archive: Optional[OrderArchive] = None,
+        retention_seconds: float = Config.ORDER_RETENTION_SECONDS,
+        max_archived: int = Config.ORDER_RETENTION_MAX_ORDERS,
+        history_seconds: float = Config.ANALYTICS_RETENTION_HOURS * 3600,
+        feed_capacity: int = Config.ORDER_FEED_CAPACITY
+    ):
+        self.menu = menu
+        # Optional columnar mirror of the history for analytics
+        self.columns = columns
+        # Optional append-only file receiving orders evicted by sweep()
+        self.archive = archive
+        self.retention_seconds = retention_seconds
+        self.max_archived = max_archived
+        self.history_seconds = history_seconds
+        # Hot tier: orders in an active status
         self._orders: Dict[int, OrderInfo] = {}
+        # Archive tier: completed and canceled orders
+        self._archive: Dict[int, OrderInfo] = {}
+        # Status -> order IDs in that status (dicts as insertion-ordered sets)
+        self._by_status: Dict[OrderStatus, Dict[int, None]] = {status: {} for status in OrderStatus}
+        # Orders swept out of memory, per status
+        self._evicted: Dict[OrderStatus, int] = {status: 0 for status in OrderStatus}
         self._next_id: int = 1
         self._lock = threading.Lock()
-    
-    def add_order(self, items: Dict[str, int]) -> int:
-        with self._lock:
-            order_id = self._next_id
-            self._orders[order_id] = OrderInfo(
-                id=order_id,
-                items=items.copy(),
-                timestamp=datetime.now(),
-                status="active"
-            )
-            self._next_id += 1
-            return order_id
-    
-    def update_order(self, order_id: int, new_items: Dict[str, int]) -> bool:
-        with self._lock:
-            order_info = self._orders.get(order_id)
-            if order_info and order_info.status == "active":
-                order_info.items = new_items.copy()
-                return True
-            return False
-        
-    def cancel_order(self, order_id: int) -> Optional[Dict[str, int]]:
+        # Running totals of active orders, kept in step with every mutation
+        self._totals: array = menu.zeros()
+        # (operation, idempotency key) -> (order_id, success) of already-applied bulk entries.
+        # Keyed by operation too, so a key reused for a cancel after an add is not taken as a replay
+        self._applied: "OrderedDict[Tuple[str, str], Tuple[int, bool]]" = OrderedDict()
+        # Active order items keyed by ID; inner dicts are replaced, never mutated
+        self._active: Dict[int, Dict[str, int]] = {}
+        # Bumped on every mutation; snapshots and caches are keyed by it
+        self._version: int = 0
+        self._snapshot: Optional[OrderSnapshot] = None
+        # Keeps ETags from one process lifetime matching another's
+        self._epoch = secrets.token_hex(4)
+        self._listeners: List[Callable[[OrderEvent], None]] = []
+        self.feed: Optional[ChangeFeed] = ChangeFeed(feed_capacity) if feed_capacity else None
+
+    def add_listener(self, listener: Callable[[OrderEvent], None]) -> None:
+        """Call ``listener`` with every mutation, in order, while the store lock is held.
+
+        Listeners must be fast and must not call back into the store.
+        """
         with self._lock:
-            order_info = self._orders.get(order_id)
-            if order_info and order_info.status == "active":
-                order_info.status = "canceled"
-                return order_info.items.copy()
-            return None
-    
+            self._listeners.append(listener)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def add_order(self, quantities: array) -> int:
+        with self._lock:
+            return self._insert(quantities)
+
+    def add_orders(self, batch: List[Tuple[str, array]]) -> List[Tuple[int, bool]]:
+        """Insert many orders under one lock acquisition.
+
+        Returns ``(order_id, replayed)`` per entry; an entry whose idempotency
+        key was already applied returns the original order ID unchanged.
+        """
+        results = []
+        with self._lock:
+            for key, quantities in batch:
+                key = ("add", key)
+                applied = self._applied.get(key)
+                if applied is not None:
+                    results.append((applied[0], True))
+                    continue
+                order_id = self._insert(quantities)
+                self._remember(key, order_id, True)
+                results.append((order_id, False))
+        return results
+
+    def update_order(self, order_id: int, new_quantities: array) -> bool:
+        with self._lock:
+            return self._update(order_id, new_quantities)
+
+    def cancel_order(self, order_id: int) -> Optional[array]:
+        with self._lock:
+            return self._cancel(order_id)
+
+    def cancel_orders(self, batch: List[Tuple[str, int]]) -> List[Tuple[bool, bool]]:
+        """Cancel many orders under one lock acquisition.
+
+        Returns ``(success, replayed)`` per entry; replayed entries report the
+        outcome of the first attempt.
+        """
+        results = []
+        with self._lock:
+            for key, order_id in batch:
+                key = ("cancel", key)
+                applied = self._applied.get(key)
+                if applied is not None:
+                    results.append((applied[1], True))
+                    continue
+                success = self._cancel(order_id) is not None
+                self._remember(key, order_id, success)
+                results.append((success, False))
+        return results
+
+    @contextmanager
+    def transaction(self) -> Iterator["OrderTransaction"]:
+        """Run several operations under one lock acquisition.
+
+        Each operation applies (and emits its event) as it is called; nothing
+        is rolled back if a later one fails. Do not call the store's own
+        methods inside the block: the lock is not reentrant.
+        """
+        with self._lock:
+            yield OrderTransaction(self)
+
+    def transition(self, order_id: int, status: OrderStatus) -> OrderInfo:
+        """Move an order to ``status``; raises if the lifecycle does not allow it"""
+        status = OrderStatus(status)
+        with self._lock:
+            order_info = self._lookup(order_id)
+            if order_info is None:
+                raise OrderNotFoundError(order_id)
+            if status not in TRANSITIONS[order_info.status]:
+                raise InvalidStatusTransitionError(order_id, order_info.status.value, status.value)
+            self._set_status(order_info, status)
+            self._emit(status.value, order_id, order_info.quantities)
+            return order_info
+
     def get_order(self, order_id: int) -> Optional[OrderInfo]:
         with self._lock:
-            return self._orders.get(order_id)
-    
+            return self._lookup(order_id)
+
+    def get_items(self, order_id: int) -> Optional[Dict[str, int]]:
+        with self._lock:
+            order_info = self._lookup(order_id)
+            return self.menu.to_dict(order_info.quantities) if order_info else None
+
+    def get_orders_by_status(self, status: OrderStatus) -> List[OrderInfo]:
+        """Orders currently in ``status``, oldest transition first"""
+        with self._lock:
+            tier = self._archive if status in TERMINAL_STATUSES else self._orders
+            return [tier[order_id] for order_id in self._by_status[OrderStatus(status)]]
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self._lock:
+            return {status.value: len(ids) for status, ids in self._by_status.items()}
+
     def get_totals(self) -> Dict[str, int]:
-        totals = {"burgers": 0, "fries": 0, "drinks": 0}
-        
-        with self._lock:
-            for order_info in self._orders.values():
-                if order_info.status == "active":
-                    for item_type, quantity in order_info.items.items():
-                        if item_type in totals:
-                            totals[item_type] += quantity
-        
-        return totals
-    
+        with self._lock:
+            return self.menu.to_dict(self._totals)
+
     def get_orders(self) -> Dict[int, Dict[str, int]]:
         with self._lock:
-            return {
-                order_id: order_info.items.copy()
-                for order_id, order_info in self._orders.items()
-                if order_info.status == "active"
-            }
-    
+            return dict(self._active)
+
+    def get_snapshot(self) -> OrderSnapshot:
+        """Consistent totals and active orders, shared until the next mutation"""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = OrderSnapshot(
+                    version=self._version,
+                    totals=self.menu.to_dict(self._totals),
+                    orders=dict(self._active),
+                    seq=self.feed.last_seq if self.feed is not None else 0,
+                    etag=f'W/"{self._epoch}-{self._version}"',
+                )
+            return self._snapshot
+
     def get_all_orders(self) -> Dict[int, OrderInfo]:
+        """Orders still in memory (swept orders are only in the archive file)"""
         with self._lock:
-            return self._orders.copy()
-    
-    def get_order_history(self) -> List[OrderInfo]:
+            return {**self._archive, **self._orders}
+
+    def get_order_history(self, limit: Optional[int] = None) -> List[OrderInfo]:
+        """Newest first; in-memory orders, then the archive file newest-archived first"""
         with self._lock:
-            return sorted(
-                self._orders.values(),
+            history = sorted(
+                [*self._orders.values(), *self._archive.values()],
                 key=lambda x: x.timestamp,
                 reverse=True
             )
-    
+        if limit is not None and len(history) >= limit:
+            return history[:limit]
+        if self.archive is not None:
+            # An order being swept can briefly be both in memory and in the file.
+            # IDs alone do not identify it: they restart after clear_all() and
+            # in every process, so match on the placed time the file keeps too.
+            seen = {_history_key(order_info) for order_info in history}
+            for order_info in self.archive.iter_newest():
+                if limit is not None and len(history) >= limit:
+                    break
+                if _history_key(order_info) not in seen:
+                    history.append(order_info)
+        return history
+
     def get_stats(self) -> Dict:
         with self._lock:
-            active_orders = [o for o in self._orders.values() if o.status == "active"]
-            canceled_orders = [o for o in self._orders.values() if o.status == "canceled"]
-            
+            by_status = {
+                status.value: len(ids) + self._evicted[status]
+                for status, ids in self._by_status.items()
+            }
             return {
-                "total_orders": len(self._orders),
-                "active_orders": len(active_orders),
-                "canceled_orders": len(canceled_orders),
+                "total_orders": self._next_id - 1,
+                "active_orders": len(self._orders),
+                "canceled_orders": by_status[OrderStatus.CANCELED.value],
+                "in_memory_orders": len(self._orders) + len(self._archive),
+                "by_status": by_status,
                 "next_order_id": self._next_id
             }
-    
+
+    def sweep(self, now: Optional[float] = None, batch_size: int = 5000) -> int:
+        """Evict archived orders past retention; returns how many were evicted.
+
+        Works in batches so the store lock is never held for a long file write.
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.retention_seconds
+        evicted = 0
+        while True:
+            with self._lock:
+                # The archive tier is ordered by close time, so candidates are at the front
+                excess = len(self._archive) - self.max_archived
+                batch = []
+                for order_info in self._archive.values():
+                    if len(batch) >= batch_size:
+                        break
+                    if len(batch) < excess or order_info.closed_at.timestamp() <= cutoff:
+                        batch.append(order_info)
+                    else:
+                        break
+            if not batch:
+                break
+            if self.archive is not None:
+                self.archive.append(batch)
+            with self._lock:
+                for order_info in batch:
+                    if self._archive.pop(order_info.id, None) is not None:
+                        self._by_status[order_info.status].pop(order_info.id, None)
+                        self._evicted[order_info.status] += 1
+            evicted += len(batch)
+            if len(batch) < batch_size:
+                break
+        if self.columns is not None and self.history_seconds:
+            self.columns.trim(now - self.history_seconds)
+        return evicted
+
     def clear_all(self) -> None:
         with self._lock:
             self._orders.clear()
+            self._archive.clear()
+            for ids in self._by_status.values():
+                ids.clear()
+            self._evicted = {status: 0 for status in OrderStatus}
             self._next_id = 1
-    
+            self._totals = self.menu.zeros()
+            self._applied.clear()
+            self._active.clear()
+            self._touch()
+            if self.columns is not None:
+                self.columns.clear()
+
     def has_order(self, order_id: int) -> bool:
         with self._lock:
-            order_info = self._orders.get(order_id)
-            return order_info is not None and order_info.status == "active"
\ No newline at end of file
+            return order_id in self._orders
+
+    # Helpers below expect the caller to hold self._lock
+
+    def _insert(self, quantities: array) -> int:
+        order_id = self._next_id
+        order_info = OrderInfo(
+            id=order_id,
+            quantities=array("i", quantities),
+            timestamp=datetime.now(),
+            status=OrderStatus.PLACED
+        )
+        self._orders[order_id] = order_info
+        self._by_status[OrderStatus.PLACED][order_id] = None
+        self._active[order_id] = self.menu.to_dict(order_info.quantities)
+        self._add_totals(quantities, 1)
+        self._touch()
+        if self.columns is not None:
+            self.columns.append(order_id, order_info.timestamp.timestamp(), order_info.quantities)
+        self._emit(OrderStatus.PLACED.value, order_id, order_info.quantities)
+        self._next_id += 1
+        return order_id
+
+    def _update(self, order_id: int, new_quantities: array) -> bool:
+        order_info = self._orders.get(order_id)
+        if order_info is None or order_info.status not in MODIFIABLE_STATUSES:
+            return False
+        self._add_totals(order_info.quantities, -1)
+        order_info.quantities = array("i", new_quantities)
+        self._add_totals(order_info.quantities, 1)
+        self._active[order_id] = self.menu.to_dict(order_info.quantities)
+        self._touch()
+        if self.columns is not None:
+            self.columns.update_quantities(order_id, order_info.quantities)
+        self._emit("modified", order_id, order_info.quantities)
+        return True
+
+    def _cancel(self, order_id: int) -> Optional[array]:
+        order_info = self._orders.get(order_id)
+        if order_info is None:
+            return None
+        self._set_status(order_info, OrderStatus.CANCELED)
+        self._emit(OrderStatus.CANCELED.value, order_id, order_info.quantities)
+        return array("i", order_info.quantities)
+
+    def _lookup(self, order_id: int) -> Optional[OrderInfo]:
+        order_info = self._orders.get(order_id)
+        return order_info if order_info is not None else self._archive.get(order_id)
+
+    def _set_status(self, order_info: OrderInfo, status: OrderStatus) -> None:
+        # Moves the order between index sets and, on a terminal status, to the archive tier
+        order_id = order_info.id
+        del self._by_status[order_info.status][order_id]
+        self._by_status[status][order_id] = None
+        order_info.status = status
+        if status in TERMINAL_STATUSES:
+            order_info.closed_at = datetime.now()
+            del self._orders[order_id]
+            self._archive[order_id] = order_info
+            self._add_totals(order_info.quantities, -1)
+            del self._active[order_id]
+            self._touch()
+        if self.columns is not None:
+            self.columns.set_status(order_id, status.value)
+
+    def _touch(self) -> None:
+        self._version += 1
+        self._snapshot = None
+
+    def _emit(self, event_type: str, order_id: int, quantities: array) -> None:
+        # Order quantity arrays are replaced on update, never mutated, so events share them
+        if self.feed is not None:
+            event = self.feed.publish(event_type, order_id, quantities, time.time())
+        elif self._listeners:
+            event = OrderEvent(0, event_type, order_id, quantities, time.time())
+        else:
+            return
+        for listener in self._listeners:
+            listener(event)
+
+    def _remember(self, key: Tuple[str, str], order_id: int, success: bool) -> None:
+        self._applied[key] = (order_id, success)
+        if len(self._applied) > Config.IDEMPOTENCY_KEY_LIMIT:
+            self._applied.popitem(last=False)
+
+    def _add_totals(self, quantities: array, sign: int) -> None:
+        totals = self._totals
+        for item_id, quantity in enumerate(quantities):
+            if quantity:
+                totals[item_id] += sign * quantity
+
+class OrderTransaction:
+    """The store's write methods, for use inside ``OrderStore.transaction()``"""
+
+    def __init__(self, store: OrderStore):
+        self._store = store
+
+    def add_order(self, quantities: array) -> int:
+        return self._store._insert(quantities)
+
+    def update_order(self, order_id: int, new_quantities: array) -> bool:
+        return self._store._update(order_id, new_quantities)
+
+    def cancel_order(self, order_id: int) -> Optional[array]:
+        return self._store._cancel(order_id)
+
+    def get_order(self, order_id: int) -> Optional[OrderInfo]:
+        return self._store._lookup(order_id)
@@ -0,0 +1,226 @@
+import json
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Any
+from app.core.config import Config
+
+# Sentinel the model uses for "remove all of this item"
+REMOVE_ALL = 999
+
+@dataclass(frozen=True)
+class MenuItem:
+    id: int
+    key: str
+    singular: str
+    plural: str
+    # Kitchen station that prepares the item and its typical prep time
+    station: str = "default"
+    prep_seconds: float = 60.0
+
+    def label(self, quantity: int) -> str:
+        return f"{quantity} {self.singular if quantity == 1 else self.plural}"
+
+class MenuCatalog:
+    """Menu items indexed by dense integer IDs.
+
+    Orders are stored as fixed-width quantity vectors where position ``i``
+    holds the quantity of the item with ``id == i``.
+    """
+
+    def __init__(self, items: Iterable[MenuItem]):
+        self._items: List[MenuItem] = sorted(items, key=lambda item: item.id)
+        for index, item in enumerate(self._items):
+            if item.id != index:
+                raise ValueError(f"Menu item IDs must be dense, got {item.id} at position {index}")
+
+        self._by_key: Dict[str, MenuItem] = {item.key: item for item in self._items}
+        if len(self._by_key) != len(self._items):
+            raise ValueError("Menu item keys must be unique")
+
+        self.keys: tuple = tuple(item.key for item in self._items)
+        # Key -> ID and an empty vector to copy, for the per-request paths
+        self._ids: Dict[str, int] = {item.key: item.id for item in self._items}
+        self._zeros = array("i", bytes(4 * len(self._items)))
+        # Flat modify_order argument names, built once rather than per request
+        self._legacy_keys = tuple((item.key, f"set_{item.key}", f"add_{item.key}", f"remove_{item.key}") for item in self._items)
+
+    @classmethod
+    def from_keys(cls, entries: Iterable[tuple]) -> "MenuCatalog":
+        """Build from ``(key, singular, plural[, station, prep_seconds])`` tuples"""
+        return cls(
+            MenuItem(index, *entry)
+            for index, entry in enumerate(entries)
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "MenuCatalog":
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        return cls.from_keys(
+            (
+                entry["key"],
+                entry.get("singular", entry["key"]),
+                entry.get("plural", entry["key"]),
+                entry.get("station", "default"),
+                float(entry.get("prep_seconds", 60.0)),
+            )
+            for entry in entries
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, item_id: int) -> MenuItem:
+        return self._items[item_id]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._by_key
+
+    def get(self, key: str) -> Optional[MenuItem]:
+        return self._by_key.get(key)
+
+    def id_of(self, key: str) -> int:
+        return self._by_key[key].id
+
+    # ---------- Vectors ----------
+
+    def zeros(self) -> array:
+        return self._zeros[:]
+
+    def to_vector(self, quantities: Dict[str, int]) -> array:
+        vector = self.zeros()
+        by_key = self._by_key
+        for key, quantity in quantities.items():
+            item = by_key.get(key)
+            if item is not None:
+                vector[item.id] = quantity
+        return vector
+
+    def to_dict(self, vector: array) -> Dict[str, int]:
+        return dict(zip(self.keys, vector))
+
+    def describe(self, vector: array) -> str:
+        parts = [self._items[i].label(q) for i, q in enumerate(vector) if q > 0]
+
+        if not parts:
+            return "nothing"
+        if len(parts) == 1:
+            return parts[0]
+        if len(parts) == 2:
+            return f"{parts[0]} and {parts[1]}"
+        return f"{', '.join(parts[:-1])}, and {parts[-1]}"
+
+    # ---------- Provider output ----------
+
+    def parse_item_list(self, entries: Any, max_quantity: int) -> array:
+        """Turn ``[{"item": key, "quantity": n}, ...]`` into a vector.
+
+        Unknown items are ignored, repeated items accumulate and quantities
+        are clamped to ``[0, max_quantity]``.
+        """
+        vector = self.zeros()
+        by_key = self._by_key
+        for entry in entries or ():
+            item = by_key.get(entry.get("item"))
+            if item is None:
+                continue
+            vector[item.id] = clamp_quantity(vector[item.id] + to_int(entry.get("quantity", 1)), max_quantity)
+        return vector
+
+    def item_vector(self, entries: Iterable[Dict[str, Any]], max_quantity: int) -> array:
+        """Like ``parse_item_list`` for entries already validated to known keys and int quantities"""
+        vector = self._zeros[:]
+        ids = self._ids
+        for entry in entries:
+            vector[ids[entry["item"]]] += entry["quantity"]
+        if max(vector, default=0) > max_quantity:
+            for item_id, quantity in enumerate(vector):
+                vector[item_id] = min(quantity, max_quantity)
+        return vector
+
+    def apply_changes(self, vector: array, changes: Any, max_quantity: int) -> array:
+        """Apply validated ``[{"item": key, "op": add|remove|set, "quantity": n}, ...]``."""
+        result = array("i", vector)
+        ids = self._ids
+        for change in changes:
+            item_id = ids.get(change["item"])
+            if item_id is None:
+                continue
+            op = change["op"]
+            quantity = change["quantity"]
+
+            if op == "set":
+                result[item_id] = clamp_quantity(quantity, max_quantity)
+            elif op == "remove":
+                result[item_id] = 0 if quantity >= REMOVE_ALL else max(0, result[item_id] - quantity)
+            else:
+                result[item_id] = clamp_quantity(result[item_id] + quantity, max_quantity)
+        return result
+
+    def legacy_changes(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Translate flat ``add_X``/``remove_X``/``set_X`` arguments into a change list."""
+        changes = []
+        for key, set_key, add_key, remove_key in self._legacy_keys:
+            set_qty = to_int(data.get(set_key, -1))
+            if set_qty >= 0:
+                changes.append({"item": key, "op": "set", "quantity": set_qty})
+                continue
+            add_qty = to_int(data.get(add_key, 0))
+            if add_qty > 0:
+                changes.append({"item": key, "op": "add", "quantity": add_qty})
+            remove_qty = to_int(data.get(remove_key, 0))
+            if remove_qty > 0:
+                changes.append({"item": key, "op": "remove", "quantity": remove_qty})
+        return changes
+
+    # ---------- Tool schema ----------
+
+    def item_list_schema(self, description: str, with_op: bool = False) -> Dict[str, Any]:
+        properties = {
+            "item": {"type": "string", "enum": list(self.keys), "description": "Menu item"},
+            "quantity": {"type": "integer", "description": "Quantity"},
+        }
+        required = ["item", "quantity"]
+        if with_op:
+            properties["op"] = {
+                "type": "string",
+                "enum": ["add", "remove", "set"],
+                "description": f"add/remove/set quantity ({REMOVE_ALL}=remove all)",
+            }
+            required.append("op")
+
+        return {
+            "type": "array",
+            "description": description,
+            "items": {"type": "object", "properties": properties, "required": required},
+        }
+
+def to_int(value: Any) -> int:
+    """Lenient provider number: ints, floats and numeric strings; anything else is 0"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return 0
+    return 0
+
+def clamp_quantity(quantity: int, max_quantity: int) -> int:
+    return min(max(0, quantity), max_quantity)
+
+DEFAULT_MENU = MenuCatalog.from_keys([
+    ("burgers", "burger", "burgers", "grill", 240.0),
+    ("fries", "order of fries", "orders of fries", "fryer", 180.0),
+    ("drinks", "drink", "drinks", "drinks", 30.0),
+])
+
+def load_menu(path: Optional[str] = None) -> MenuCatalog:
+    return MenuCatalog.from_file(path) if path else DEFAULT_MENU
+
+MENU = load_menu(Config.MENU_FILE)
@@ -0,0 +1,90 @@
+import os
+import threading
+from datetime import datetime
+from typing import Iterable, Iterator
+import orjson
+from app.models.menu import MenuCatalog
+from app.models.order_status import OrderStatus
+
+class OrderArchive:
+    """Append-only file of orders evicted from memory.
+
+    One JSON array per line: ``[id, placed_at, status, closed_at, {item: qty}]``
+    with epoch-second timestamps and only non-zero quantities, so records
+    stay readable when the menu changes.
+    """
+
+    def __init__(self, path: str, menu: MenuCatalog):
+        self.path = path
+        self.menu = menu
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "ab")
+        with open(path, "rb") as f:
+            self._count = sum(1 for line in f if line.strip())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, orders: Iterable) -> int:
+        lines = [self._encode(order_info) for order_info in orders]
+        if not lines:
+            return 0
+        with self._lock:
+            self._file.write(b"".join(lines))
+            self._file.flush()
+            self._count += len(lines)
+        return len(lines)
+
+    def iter_newest(self) -> Iterator:
+        """Archived orders, most recently archived first"""
+        with self._lock:
+            end = self._file.tell()
+        for line in self._read_lines_reversed(end):
+            yield self._decode(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def _encode(self, order_info) -> bytes:
+        closed_at = order_info.closed_at or order_info.timestamp
+        record = [
+            order_info.id,
+            round(order_info.timestamp.timestamp(), 3),
+            order_info.status.value,
+            round(closed_at.timestamp(), 3),
+            {item.key: order_info.quantities[item.id] for item in self.menu if order_info.quantities[item.id]},
+        ]
+        return orjson.dumps(record) + b"\n"
+
+    def _decode(self, line: bytes):
+        # Imported here: db_models imports this module
+        from app.models.db_models import OrderInfo
+        order_id, placed_at, status, closed_at, items = orjson.loads(line)
+        return OrderInfo(
+            id=order_id,
+            quantities=self.menu.to_vector(items),
+            timestamp=datetime.fromtimestamp(placed_at),
+            status=OrderStatus(status),
+            closed_at=datetime.fromtimestamp(closed_at),
+        )
+
+    def _read_lines_reversed(self, end: int, block_size: int = 1 << 16) -> Iterator[bytes]:
+        # Reads only up to ``end`` so a concurrent append is never seen half-written
+        with open(self.path, "rb") as f:
+            position = end
+            tail = b""
+            while position > 0:
+                read = min(block_size, position)
+                position -= read
+                f.seek(position)
+                lines = (f.read(read) + tail).split(b"\n")
+                tail = lines.pop(0)
+                for line in reversed(lines):
+                    if line:
+                        yield line
+            if tail:
+                yield tail
@@ -0,0 +1,122 @@
+import threading
+from array import array
+from typing import Tuple
+import numpy as np
+from app.models.order_status import OrderStatus
+
+# Status codes stored in the status column
+STATUS_CODES = {status.value: code for code, status in enumerate(OrderStatus)}
+
+class OrderColumns:
+    """Columnar copy of the order history for analytics.
+
+    Row ``order_id - 1 - base`` holds the order's timestamp (epoch seconds),
+    its status code, its basket size and one quantity column per menu item.
+    Columns grow by doubling; ``trim`` drops the oldest rows and advances
+    ``base``.
+    """
+
+    def __init__(self, num_items: int, capacity: int = 1024):
+        self.num_items = num_items
+        self._lock = threading.Lock()
+        self._size = 0
+        # Order ID offset of row 0 after trimming
+        self._base = 0
+        self._allocate(capacity)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, order_id: int, timestamp: float, quantities: array, status: str = OrderStatus.PLACED.value) -> None:
+        with self._lock:
+            row = order_id - 1 - self._base
+            if row >= len(self._timestamps):
+                self._grow(max(row + 1, 2 * len(self._timestamps)))
+            self._timestamps[row] = timestamp
+            self._quantities[:, row] = quantities
+            self._basket[row] = sum(quantities)
+            self._status[row] = STATUS_CODES[status]
+            self._size = max(self._size, row + 1)
+
+    def update_quantities(self, order_id: int, quantities: array) -> None:
+        with self._lock:
+            row = order_id - 1 - self._base
+            if row >= 0:
+                self._quantities[:, row] = quantities
+                self._basket[row] = sum(quantities)
+
+    def set_status(self, order_id: int, status: str) -> None:
+        with self._lock:
+            row = order_id - 1 - self._base
+            if row >= 0:
+                self._status[row] = STATUS_CODES[status]
+
+    def extend(self, timestamps: np.ndarray, quantities: np.ndarray, status: np.ndarray) -> None:
+        """Bulk-append rows; ``quantities`` is shaped ``(num_items, rows)``"""
+        with self._lock:
+            start, count = self._size, len(timestamps)
+            if start + count > len(self._timestamps):
+                self._grow(max(start + count, 2 * len(self._timestamps)))
+            self._timestamps[start:start + count] = timestamps
+            self._quantities[:, start:start + count] = quantities
+            self._basket[start:start + count] = quantities.sum(axis=0)
+            self._status[start:start + count] = status
+            self._size = start + count
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Views of (timestamps, quantities, basket sizes, status) over the filled rows"""
+        with self._lock:
+            size = self._size
+            return (
+                self._timestamps[:size],
+                self._quantities[:, :size],
+                self._basket[:size],
+                self._status[:size],
+            )
+
+    def trim(self, before: float) -> int:
+        """Drop rows timestamped before ``before``; returns the number dropped.
+
+        Only trims once at least half the rows are stale, so the copy is
+        amortized. Fresh arrays are allocated because readers may still hold
+        views from ``snapshot``.
+        """
+        with self._lock:
+            size = self._size
+            cut = int(np.searchsorted(self._timestamps[:size], before, side="left"))
+            if cut == 0 or cut * 2 < size:
+                return 0
+            keep = size - cut
+            old = (self._timestamps, self._quantities, self._basket, self._status)
+            self._allocate(max(1024, 2 * keep))
+            self._timestamps[:keep] = old[0][cut:size]
+            self._quantities[:, :keep] = old[1][:, cut:size]
+            self._basket[:keep] = old[2][cut:size]
+            self._status[:keep] = old[3][cut:size]
+            self._size = keep
+            self._base += cut
+            return cut
+
+    def clear(self) -> None:
+        with self._lock:
+            self._size = 0
+            self._base = 0
+            self._status[:] = 0
+            self._basket[:] = 0
+            self._quantities[:] = 0
+
+    def _grow(self, capacity: int) -> None:
+        # Caller must hold self._lock
+        old = (self._timestamps, self._quantities, self._basket, self._status)
+        size = len(old[0])
+        self._allocate(capacity)
+        self._timestamps[:size] = old[0]
+        self._quantities[:, :size] = old[1]
+        self._basket[:size] = old[2]
+        self._status[:size] = old[3]
+
+    def _allocate(self, capacity: int) -> None:
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._quantities = np.zeros((self.num_items, capacity), dtype=np.int32)
+        self._basket = np.zeros(capacity, dtype=np.int32)
+        self._status = np.zeros(capacity, dtype=np.int8)
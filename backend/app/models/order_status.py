@@ -0,0 +1,24 @@
+from enum import Enum
+from typing import Dict, FrozenSet
+
+class OrderStatus(str, Enum):
+    PLACED = "placed"
+    IN_PROGRESS = "in_progress"
+    READY = "ready"
+    COMPLETED = "completed"
+    CANCELED = "canceled"
+
+# Allowed moves; terminal states have none. Orders reach READY only through IN_PROGRESS
+TRANSITIONS: Dict[OrderStatus, FrozenSet[OrderStatus]] = {
+    OrderStatus.PLACED: frozenset({OrderStatus.IN_PROGRESS, OrderStatus.CANCELED}),
+    OrderStatus.IN_PROGRESS: frozenset({OrderStatus.READY, OrderStatus.CANCELED}),
+    OrderStatus.READY: frozenset({OrderStatus.COMPLETED, OrderStatus.CANCELED}),
+    OrderStatus.COMPLETED: frozenset(),
+    OrderStatus.CANCELED: frozenset(),
+}
+
+# Orders counted in totals and shown on the board
+ACTIVE_STATUSES = frozenset({OrderStatus.PLACED, OrderStatus.IN_PROGRESS, OrderStatus.READY})
+# Orders whose items can still change
+MODIFIABLE_STATUSES = frozenset({OrderStatus.PLACED, OrderStatus.IN_PROGRESS})
+TERMINAL_STATUSES = frozenset({OrderStatus.COMPLETED, OrderStatus.CANCELED})
@@ -0,0 +1,386 @@
+"""Active orders and totals of one location, shared between worker processes.
+
+The worker that writes a location publishes its store's snapshot into a
+memory-mapped file (``SHARED_SNAPSHOT_DIR/<location>.snap``, on tmpfs).
+Every other worker serves that location's order list and store stats from
+the file, so they see the writer's orders instead of their own empty copy.
+
+Layout (little-endian)::
+
+    header   64 B   magic, layout, generation, slot size
+    slot 0   16 B   seq, length  + payload
+    slot 1   16 B   seq, length  + payload
+
+    payload  version, change feed seq, ETag, item count, order count,
+             JSON length, store stats (int64), totals, order IDs,
+             quantities (int32, one row of item counts per order),
+             the snapshot's encoded ``"totals":...,"orders":...`` JSON
+
+Publication ``g`` goes to slot ``g % 2`` and then bumps ``generation``, so
+a reader of the current slot is only disturbed if the writer laps it
+twice. Each slot is a seqlock: ``seq`` is odd while the slot is written,
+and a reader that sees it change (or odd) while decoding retries. Readers
+take no lock and never block the writer. Each one copies a generation
+out once; until ``generation`` moves, a read is a single 8-byte load.
+The JSON is encoded once, by the writer, and readers splice it into
+their responses as is; the orders mapping is only built from the arrays
+if something iterates it.
+
+This relies on the writer's stores to the mapping becoming visible in
+program order, as they do on x86-64 (CPython issues no fences).
+"""
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from itertools import chain
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+from app.models.change_feed import OrderEvent
+from app.models.db_models import OrderSnapshot, OrderStore
+from app.models.menu import MenuCatalog
+from app.models.order_status import OrderStatus
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"OSNP"
+LAYOUT = 1
+_HEADER = struct.Struct("<4sIQQ")  # magic, layout, generation, slot size
+_GENERATION = struct.Struct("<Q")
+_GENERATION_OFFSET = 8
+_SLOTS_OFFSET = 64
+_SLOT = struct.Struct("<QQ")  # seq, payload length (0: snapshot did not fit)
+_PAYLOAD = struct.Struct("<QQ48sIII")  # version, feed seq, ETag, items, orders, JSON bytes
+_STAT_KEYS = ("total_orders", "active_orders", "canceled_orders", "in_memory_orders", "next_order_id")
+_STATUSES = tuple(status.value for status in OrderStatus)
+_NUM_STATS = len(_STAT_KEYS) + len(_STATUSES)
+
+def _slot_offset(slot_size: int, generation: int) -> int:
+    return _SLOTS_OFFSET + (generation % 2) * (_SLOT.size + slot_size)
+
+class SharedSnapshotWriter:
+    """Publishes ``store``'s snapshot after each mutation, from a background thread.
+
+    ``notify`` (called from the store listener, under the store lock) only
+    sets a flag; the thread publishes once per wake-up, so a burst of
+    mutations, e.g. a bulk insert, costs one publication.
+    """
+
+    def __init__(self, fd: int, store: OrderStore, slot_size: int):
+        self.store = store
+        self.slot_size = slot_size
+        self._fd = fd
+        size = _SLOTS_OFFSET + 2 * (_SLOT.size + slot_size)
+        if os.fstat(fd).st_size != size:
+            os.ftruncate(fd, size)
+        self._map = mmap.mmap(fd, size)
+        magic, layout, generation, old_slot_size = _HEADER.unpack_from(self._map, 0)
+        # A restarted writer continues the old numbering, so readers never mistake a new snapshot for one they decoded
+        self._generation = generation if (magic, layout, old_slot_size) == (MAGIC, LAYOUT, slot_size) else 0
+        _HEADER.pack_into(self._map, 0, MAGIC, LAYOUT, self._generation, slot_size)
+        self._dirty = threading.Event()
+        # Publications come from the thread, but publish() may also be called directly
+        self._publish_lock = threading.Lock()
+        self._closed = False
+        self._overflowed = False
+        self.publications = 0
+        self._thread = threading.Thread(target=self._run, name="shared-snapshot", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def claim(cls, path: str, store: OrderStore, slot_size: int) -> Optional["SharedSnapshotWriter"]:
+        """The writer for ``path``, or None when another live process already writes it"""
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Held until close (or process exit): readers use it to tell a live writer from a stale file
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return cls(fd, store, slot_size)
+
+    def notify(self) -> None:
+        self._dirty.set()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._dirty.set()
+        self._thread.join(5)
+        self._map.close()
+        os.close(self._fd)
+
+    def _run(self) -> None:
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            if self._closed:
+                return
+            try:
+                self.publish()
+            except Exception as e:
+                logger.error("Shared snapshot publication failed: %s", e, exc_info=True)
+
+    def publish(self) -> None:
+        with self._publish_lock:
+            self._publish()
+
+    def _publish(self) -> None:
+        snapshot = self.store.get_snapshot()
+        stats = self.store.get_stats()
+        payload = self._encode(snapshot, stats)
+        if len(payload) > self.slot_size:
+            if not self._overflowed:
+                logger.error(
+                    "Snapshot of %s orders (%s bytes) exceeds SHARED_SNAPSHOT_BYTES; other workers read their own store",
+                    len(snapshot.orders), len(payload)
+                )
+            self._overflowed = True
+            payload = b""
+        else:
+            self._overflowed = False
+
+        generation = self._generation + 1
+        offset = _slot_offset(self.slot_size, generation)
+        view = self._map
+        seq, _ = _SLOT.unpack_from(view, offset)
+        _SLOT.pack_into(view, offset, seq + 1, 0)
+        view[offset + _SLOT.size:offset + _SLOT.size + len(payload)] = payload
+        _SLOT.pack_into(view, offset, seq + 2, len(payload))
+        _GENERATION.pack_into(view, _GENERATION_OFFSET, generation)
+        self._generation = generation
+        self.publications += 1
+
+    def _encode(self, snapshot: OrderSnapshot, stats: Dict[str, Any]) -> bytes:
+        menu = self.store.menu
+        counts = array("q", [stats[key] for key in _STAT_KEYS] + [stats["by_status"][status] for status in _STATUSES])
+        # Item dicts come from menu.to_dict, so their values are in menu order
+        quantities = array("i", chain.from_iterable(items.values() for items in snapshot.orders.values()))
+        # Built once per version either way; this worker's own responses share it
+        fragment = snapshot.fragment()
+        return b"".join((
+            _PAYLOAD.pack(
+                snapshot.version, snapshot.seq, snapshot.etag.encode(), len(menu), len(snapshot.orders), len(fragment)
+            ),
+            counts.tobytes(),
+            array("i", (snapshot.totals[key] for key in menu.keys)).tobytes(),
+            array("i", snapshot.orders.keys()).tobytes(),
+            quantities.tobytes(),
+            fragment,
+        ))
+
+class SharedSnapshotReader:
+    """Decodes the latest publication of a region, once per generation"""
+
+    def __init__(self, path: str, menu: MenuCatalog):
+        self.path = path
+        self.menu = menu
+        self._map: Optional[mmap.mmap] = None
+        self._fd: Optional[int] = None
+        self._slot_size = 0
+        self._next_open = 0.0
+        self._open_lock = threading.Lock()
+        # (generation, snapshot, stats), replaced as a whole
+        self._cached: Tuple[int, Optional[OrderSnapshot], Optional[Dict[str, Any]]] = (-1, None, None)
+
+    def read(self) -> Tuple[Optional[OrderSnapshot], Optional[Dict[str, Any]]]:
+        """(snapshot, store stats) as last published; (None, None) when there is no live, usable publication"""
+        view = self._map
+        if view is None:
+            view = self._open()
+            if view is None:
+                return None, None
+        generation = _GENERATION.unpack_from(view, _GENERATION_OFFSET)[0]
+        cached = self._cached
+        if cached[0] == generation:
+            return cached[1], cached[2]
+        decoded = self._decode(view, generation) if self._writer_alive() else (None, None)
+        self._cached = (generation, *decoded)
+        return decoded
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            os.close(self._fd)
+            self._map = None
+
+    def _open(self) -> Optional[mmap.mmap]:
+        # The writer creates the file on its first mutation; until then look for it at most once a second
+        with self._open_lock:
+            now = time.monotonic()
+            if self._map is not None or now < self._next_open:
+                return self._map
+            self._next_open = now + 1.0
+            try:
+                fd = os.open(self.path, os.O_RDWR)
+            except FileNotFoundError:
+                return None
+            try:
+                view = mmap.mmap(fd, 0)
+            except ValueError:
+                # Created but not sized yet
+                os.close(fd)
+                return None
+            magic, layout, _, slot_size = _HEADER.unpack_from(view, 0)
+            if (magic, layout) != (MAGIC, LAYOUT) or len(view) < _SLOTS_OFFSET + 2 * (_SLOT.size + slot_size):
+                view.close()
+                os.close(fd)
+                return None
+            self._fd, self._slot_size = fd, slot_size
+            self._map = view
+            return view
+
+    def _writer_alive(self) -> bool:
+        # A shared lock is only granted when no writer holds the file
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return False
+
+    def _decode(self, view: mmap.mmap, generation: int) -> Tuple[Optional[OrderSnapshot], Optional[Dict[str, Any]]]:
+        offset = _slot_offset(self._slot_size, generation)
+        buffer = memoryview(view)
+        try:
+            for _ in range(100):
+                seq, length = _SLOT.unpack_from(view, offset)
+                if seq % 2:
+                    continue
+                decoded = self._parse(buffer[offset + _SLOT.size:offset + _SLOT.size + length]) if length else (None, None)
+                # Unchanged seq: the slot was not rewritten while it was parsed
+                if _SLOT.unpack_from(view, offset)[0] == seq:
+                    return decoded
+                # Lapped: the newest publication is in the other slot by now
+                generation = _GENERATION.unpack_from(view, _GENERATION_OFFSET)[0]
+                offset = _slot_offset(self._slot_size, generation)
+            return None, None
+        finally:
+            buffer.release()
+
+    def _parse(self, payload: memoryview) -> Tuple[Optional[OrderSnapshot], Optional[Dict[str, Any]]]:
+        try:
+            version, seq, etag, num_items, num_orders, fragment_size = _PAYLOAD.unpack_from(payload, 0)
+        except struct.error:
+            # A payload torn by a concurrent write; the seq check discards it
+            return None, None
+        keys = self.menu.keys
+        if num_items != len(keys):
+            return None, None
+        start = _PAYLOAD.size
+        stats_end = start + 8 * _NUM_STATS
+        totals_end = stats_end + 4 * num_items
+        ids_end = totals_end + 4 * num_orders
+        quantities_end = ids_end + 4 * num_orders * num_items
+        end = quantities_end + fragment_size
+        if end > len(payload):
+            return None, None
+        # Copied out now: the writer reuses this slot two publications later
+        counts = payload[start:stats_end].cast("q")
+        stats: Dict[str, Any] = dict(zip(_STAT_KEYS, counts[:len(_STAT_KEYS)]))
+        stats["by_status"] = dict(zip(_STATUSES, counts[len(_STAT_KEYS):]))
+        snapshot = OrderSnapshot(
+            version=version,
+            totals=dict(zip(keys, payload[stats_end:totals_end].cast("i"))),
+            orders=_PublishedOrders(keys, _int32(payload[totals_end:ids_end]), _int32(payload[ids_end:quantities_end])),
+            seq=seq,
+            etag=etag.rstrip(b"\0").decode("ascii", "replace"),
+            _fragment=bytes(payload[quantities_end:end]),
+        )
+        return snapshot, stats
+
+def _int32(view: memoryview) -> array:
+    values = array("i")
+    values.frombytes(view)
+    return values
+
+class _PublishedOrders(Mapping):
+    """Order ID -> item counts of a publication, built from its arrays on first use.
+
+    Responses splice the published JSON instead, so GET /orders never
+    builds the dicts.
+    """
+    __slots__ = ("_keys", "_ids", "_quantities", "_orders")
+
+    def __init__(self, keys: tuple, ids: array, quantities: array):
+        self._keys = keys
+        self._ids = ids
+        self._quantities = quantities
+        self._orders: Optional[Dict[int, Dict[str, int]]] = None
+
+    def __getitem__(self, order_id: int) -> Dict[str, int]:
+        return self._decoded()[order_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._decoded())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _decoded(self) -> Dict[int, Dict[str, int]]:
+        if self._orders is None:
+            # zip stops at the last key, so each order takes its own row of the shared iterator
+            quantities = iter(self._quantities)
+            self._orders = {order_id: dict(zip(self._keys, quantities)) for order_id in self._ids}
+        return self._orders
+
+class SharedSnapshot:
+    """One location's shared region, as seen by this process.
+
+    The first process to mutate the location claims the file and becomes
+    its writer. Any other process reads the writer's publications, and its
+    own store is only used while there are none. A process that mutates the
+    location while another one writes it goes back to its own store for
+    good: its clients must see the orders they placed there.
+    """
+
+    def __init__(self, path: str, store: OrderStore, slot_size: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.store = store
+        self.slot_size = slot_size
+        self.writer: Optional[SharedSnapshotWriter] = None
+        self.reader = SharedSnapshotReader(path, store.menu)
+        self._claimed = False
+        # Set when this process changed the location while another one writes it
+        self.local_only = False
+
+    def on_event(self, event: OrderEvent) -> None:
+        if self.writer is not None:
+            self.writer.notify()
+            return
+        if self._claimed:
+            return
+        # Runs once, under the store lock: the first mutation of this location in this process
+        self._claimed = True
+        self.writer = SharedSnapshotWriter.claim(self.path, self.store, self.slot_size)
+        if self.writer is None:
+            self.local_only = True
+            logger.error(
+                "%s is written by another worker; this worker now serves the location from its own store. "
+                "Route each location's writes to one worker so all of them see the same orders", self.path
+            )
+            return
+        self.writer.notify()
+
+    @property
+    def role(self) -> str:
+        return "writer" if self.writer is not None else "local" if self.local_only else "reader"
+
+    def get_snapshot(self) -> Optional[OrderSnapshot]:
+        """The writer's snapshot when this process only reads the location, else None (use the store)"""
+        return None if self.writer is not None or self.local_only else self.reader.read()[0]
+
+    def get_stats(self) -> Optional[Dict[str, Any]]:
+        return None if self.writer is not None or self.local_only else self.reader.read()[1]
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader.close()
@@ -1,33 +1,50 @@
-from pydantic import BaseModel, Field, validator
-from typing import Dict, Optional, Literal
+from pydantic import (
+    BaseModel, Field, NonNegativeInt, StringConstraints, TypeAdapter, ValidationError, create_model, model_validator
+)
+from typing import Annotated, Any, Dict, List, Optional, Literal, Union
+from typing_extensions import TypedDict
+from array import array
+from datetime import datetime
 from enum import Enum
+from app.core.config import Config
+from app.models.menu import MENU, clamp_quantity, to_int
+from app.models.order_status import OrderStatus
 
-class ItemType(str, Enum):
-    BURGERS = "burgers"
-    FRIES = "fries"
-    DRINKS = "drinks"
+# Validated natively to the plain key string
+MenuKey = Literal[MENU.keys]
 
 class ActionType(str, Enum):
     PLACED = "placed"
     CANCELED = "canceled"
     MODIFIED = "modified"
+    MULTIPLE = "multiple"
+    PREVIEW = "preview"
+    RETRIEVE = "retrieve"
     ERROR = "error"
     NONE = "none"
 
 class OrderRequest(BaseModel):
-    message: str = Field(
+    message: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=500)] = Field(
         ..., 
-        min_length=1, 
-        max_length=500,
         description="User message for ordering or canceling"
     )
-    
-    @validator('message')
-    def validate_message(cls, v):
-        cleaned = v.strip()
-        if not cleaned:
-            raise ValueError('Message cannot be empty')
-        return cleaned
+    mode: Literal["execute", "preview"] = Field(
+        "execute",
+        description="'preview' parses the message and returns a token to commit instead of applying it"
+    )
+    session_id: Optional[str] = Field(
+        None,
+        max_length=64,
+        description="Lane or kiosk session; lets follow-ups like 'add a drink to that' refer to its last order"
+    )
+
+class ActionResult(BaseModel):
+    success: bool
+    action: ActionType
+    order_id: Optional[int] = None
+    items: Optional[Dict[str, int]] = None
+    message: Optional[str] = None
+    eta_seconds: Optional[int] = None
 
 class OrderResponse(BaseModel):
     success: bool = Field(..., description="Whether the action was successful")
@@ -35,8 +52,17 @@ class OrderResponse(BaseModel):
     order_id: Optional[int] = Field(None, description="Order ID for placed/canceled orders")
     items: Optional[Dict[str, int]] = Field(None, description="Items in the order")
     message: Optional[str] = Field(None, description="Human-readable message")
+    eta_seconds: Optional[int] = Field(None, description="Estimated seconds until a placed or modified order is ready")
     totals: Dict[str, int] = Field(..., description="Current totals across all orders")
     orders: Dict[int, Dict[str, int]] = Field(..., description="All active orders")
+    preview_token: Optional[str] = Field(None, description="Token to commit a previewed action")
+    results: Optional[List[ActionResult]] = Field(
+        None, description="One result per request, in the order spoken, when the message held several"
+    )
+
+class CommitRequest(BaseModel):
+    token: str = Field(..., min_length=1, max_length=64, description="preview_token from a preview response")
+    session_id: Optional[str] = Field(None, max_length=64, description="Session the preview was made in")
 
 class ParsedIntent(BaseModel):
     success: bool
@@ -45,29 +71,182 @@ class ParsedIntent(BaseModel):
     confidence: Optional[float] = None
     raw_response: Optional[str] = None
 
-class OrderItems(BaseModel):
-    burgers: int = Field(0, ge=0, le=50)
-    fries: int = Field(0, ge=0, le=50)  
-    drinks: int = Field(0, ge=0, le=50)
+class _OrderItemsBase(BaseModel):
     
-    @validator('*', pre=True)
-    def validate_quantities(cls, v):
-        if isinstance(v, str):
-            try:
-                v = int(v)
-            except ValueError:
-                v = 0
-        return max(0, v) if isinstance(v, (int, float)) else 0
+    @model_validator(mode="before")
+    @classmethod
+    def clamp_quantities(cls, data: Any) -> Any:
+        """Coerce and clamp every quantity in one pass instead of a validator per field"""
+        if not isinstance(data, dict):
+            return data
+        max_quantity = Config.MAX_ITEM_QUANTITY
+        clamped = {}
+        for key in MENU.keys:
+            if key in data:
+                quantity = data[key]
+                # Plain ints in range, the usual case, skip the coercion calls
+                if type(quantity) is not int or not 0 <= quantity <= max_quantity:
+                    quantity = clamp_quantity(to_int(quantity), max_quantity)
+                clamped[key] = quantity
+        return clamped
     
     def to_dict(self) -> Dict[str, int]:
-        return {
-            "burgers": self.burgers,
-            "fries": self.fries,
-            "drinks": self.drinks
-        }
+        return {key: getattr(self, key) for key in MENU.keys}
+    
+    def to_vector(self) -> array:
+        return MENU.to_vector(self.to_dict())
     
     def is_empty(self) -> bool:
-        return self.burgers == 0 and self.fries == 0 and self.drinks == 0
+        return self.total_items() == 0
     
     def total_items(self) -> int:
-        return self.burgers + self.fries + self.drinks
\ No newline at end of file
+        return sum(getattr(self, key) for key in MENU.keys)
+
+# One optional quantity field per menu item, so the model follows the catalog
+OrderItems = create_model(
+    "OrderItems",
+    __base__=_OrderItemsBase,
+    **{
+        key: (int, Field(0, ge=0, le=Config.MAX_ITEM_QUANTITY))
+        for key in MENU.keys
+    },
+)
+
+class OrderChange(BaseModel):
+    item: MenuKey = Field(..., description="Menu item to change")
+    op: Literal["add", "remove", "set"] = Field("add", description="add/remove/set quantity (remove 999 = remove all)")
+    quantity: int = Field(1, ge=0, description="Quantity to add, remove or set")
+
+class ModifyOrderRequest(BaseModel):
+    changes: List[OrderChange] = Field(..., min_length=1, description="Changes to apply, in order")
+
+class ItemEntry(TypedDict):
+    item: MenuKey
+    quantity: NonNegativeInt
+
+class ChangeEntry(TypedDict):
+    item: MenuKey
+    op: Literal["add", "remove", "set"]
+    quantity: NonNegativeInt
+
+class PlaceOrder(BaseModel):
+    """Typed place_order intent. Quantities are summed and clamped to MAX_ITEM_QUANTITY when applied."""
+    # Defaulted, so a provider's ``data`` validates as is, without copying the action into it
+    action: Literal["place_order"] = "place_order"
+    items: List[ItemEntry]
+
+class ModifyOrder(BaseModel):
+    action: Literal["modify_order"] = "modify_order"
+    order_id: Optional[int] = None
+    changes: List[ChangeEntry]
+
+class CancelOrder(BaseModel):
+    action: Literal["cancel_order"] = "cancel_order"
+    order_id: Optional[int] = None
+
+IntentCommand = Annotated[Union[PlaceOrder, ModifyOrder, CancelOrder], Field(discriminator="action")]
+
+# Built once at import; only used to report unknown actions
+INTENT_COMMAND = TypeAdapter(IntentCommand)
+# pydantic-core validators, called directly: model_validate adds more than a small command costs to validate
+_VALIDATORS = {
+    command.model_fields["action"].default: command.__pydantic_validator__.validate_python
+    for command in (PlaceOrder, ModifyOrder, CancelOrder)
+}
+
+def parse_intent_command(parsed_intent: Dict[str, Any]) -> Union[PlaceOrder, ModifyOrder, CancelOrder]:
+    """Typed command for a provider result; raises ValidationError for unknown actions or bad data.
+
+    The shape is picked before validating: item and change lists validate
+    as sent, flat per-item arguments are turned into lists first, so
+    well-formed output is validated once. Only lists that fail (unknown
+    items, bad ops) are cleaned and validated again.
+    """
+    action = parsed_intent.get("action")
+    validate = _VALIDATORS.get(action)
+    if validate is None:
+        # Raises the discriminator's error
+        return INTENT_COMMAND.validate_python({"action": action})
+    data = parsed_intent.get("data")
+    if not isinstance(data, dict):
+        data = {}
+    if action == "place_order" and not isinstance(data.get("items"), list):
+        return validate({"items": [
+            {"item": key, "quantity": max(0, to_int(data[key]))} for key in MENU.keys if key in data
+        ]})
+    if action == "modify_order" and not isinstance(data.get("changes"), list):
+        return validate({"order_id": data.get("order_id") or None, "changes": MENU.legacy_changes(data)})
+    try:
+        return validate(data)
+    except ValidationError:
+        if action == "cancel_order":
+            raise
+    return validate(_lenient_payload(action, data))
+
+def _lenient_payload(action: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Sloppier item or change lists: unknown items dropped, negative or non-numeric quantities, unknown ops"""
+    if action == "place_order":
+        return {"items": [
+            {"item": entry["item"], "quantity": max(0, to_int(entry.get("quantity", 1)))}
+            for entry in data["items"]
+            if isinstance(entry, dict) and entry.get("item") in MENU
+        ]}
+    # Unknown ops have always meant "add"
+    return {"order_id": data.get("order_id") or None, "changes": [
+        {
+            "item": change["item"],
+            "op": change["op"] if change.get("op") in ("remove", "set") else "add",
+            "quantity": max(0, to_int(change.get("quantity", 1))),
+        }
+        for change in data["changes"]
+        if isinstance(change, dict) and change.get("item") in MENU
+    ]}
+
+class OrderStatusUpdate(BaseModel):
+    status: OrderStatus = Field(..., description="Next lifecycle status")
+
+class OrderDetails(BaseModel):
+    order_id: int
+    status: OrderStatus
+    items: Dict[str, int]
+    timestamp: datetime
+
+class OrderEventOut(BaseModel):
+    seq: int
+    type: str = Field(..., description="'modified' or the order's new status")
+    order_id: int
+    items: Dict[str, int]
+    timestamp: float
+
+class OrderEventsResponse(BaseModel):
+    events: List[OrderEventOut] = Field(..., description="Events after the requested sequence number, oldest first")
+    last_seq: int = Field(..., description="Pass as 'after' on the next call")
+    resync: bool = Field(False, description="Requested events are gone: replace local state with totals/orders and continue from last_seq")
+    totals: Optional[Dict[str, int]] = None
+    orders: Optional[Dict[int, Dict[str, int]]] = None
+
+class BulkOrderEntry(BaseModel):
+    idempotency_key: str = Field(..., min_length=1, max_length=128, description="Client-generated key; replays return the original result")
+    items: OrderItems = Field(..., description="Quantities to order")
+
+class BulkOrderRequest(BaseModel):
+    orders: List[BulkOrderEntry] = Field(..., min_length=1, max_length=Config.MAX_BULK_ITEMS)
+
+class BulkCancelEntry(BaseModel):
+    idempotency_key: str = Field(..., min_length=1, max_length=128, description="Client-generated key; replays return the original result")
+    order_id: int = Field(..., gt=0, description="Order to cancel")
+
+class BulkCancelRequest(BaseModel):
+    cancellations: List[BulkCancelEntry] = Field(..., min_length=1, max_length=Config.MAX_BULK_ITEMS)
+
+class BulkItemResult(BaseModel):
+    idempotency_key: str
+    success: bool
+    order_id: Optional[int] = None
+    replayed: bool = Field(False, description="True if this key was already applied by an earlier request")
+    message: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    results: List[BulkItemResult] = Field(..., description="One result per request entry, in order")
+    totals: Dict[str, int] = Field(..., description="Current totals across all orders")
+    orders: Dict[int, Dict[str, int]] = Field(..., description="All active orders")
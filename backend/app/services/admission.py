@@ -0,0 +1,131 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+from app.utils.exception_utils import OverloadedError
+
+class AdmissionController:
+    """Bounded, lane-fair admission for requests that hold a worker thread for a provider call.
+
+    At most ``max_concurrency`` requests run at once. Others wait in a
+    per-lane FIFO, and freed slots go to lanes in turn, so one busy lane
+    cannot starve the rest. A request is turned away up front, with a
+    retry hint, when the queue (or its lane's share) is full, or when the
+    predicted queueing delay plus the typical service time would overrun
+    its deadline; a queued request whose deadline passes is dropped.
+
+    All methods run on the event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        max_queue_per_lane: int,
+        initial_service_seconds: float = 1.0,
+        smoothing: float = 0.2
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_per_lane = max_queue_per_lane
+        self.smoothing = smoothing
+        # Moving average of how long an admitted request holds its slot
+        self.service_seconds = initial_service_seconds
+        self._active = 0
+        self._queued = 0
+        self._lanes: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self.stats = {
+            "admitted": 0, "queued": 0, "rejected_full": 0, "rejected_deadline": 0,
+            "expired_in_queue": 0, "completed": 0, "completed_late": 0,
+        }
+
+    async def acquire(self, lane: str, deadline: float) -> None:
+        """Wait for a slot; raises OverloadedError instead of waiting past ``deadline``"""
+        if self._active < self.max_concurrency and not self._queued:
+            self._active += 1
+            self.stats["admitted"] += 1
+            return
+
+        queue = self._lanes.get(lane)
+        if self._queued >= self.max_queue or (queue is not None and len(queue) >= self.max_queue_per_lane):
+            self.stats["rejected_full"] += 1
+            raise OverloadedError(self._retry_after(self._predicted_wait(lane)), "queue full")
+        wait = self._predicted_wait(lane)
+        if time.monotonic() + wait + self.service_seconds > deadline:
+            self.stats["rejected_deadline"] += 1
+            raise OverloadedError(self._retry_after(wait), "deadline cannot be met")
+
+        future = asyncio.get_running_loop().create_future()
+        if queue is None:
+            queue = self._lanes[lane] = deque()
+        queue.append(future)
+        self._queued += 1
+        self.stats["queued"] += 1
+        try:
+            # Leave time to do the work once admitted
+            await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - time.monotonic() - self.service_seconds))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release(None)
+            else:
+                future.cancel()
+                self._discard(lane, future)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.stats["expired_in_queue"] += 1
+            raise OverloadedError(self._retry_after(self._predicted_wait(lane)), "deadline passed while queued")
+        self.stats["admitted"] += 1
+
+    def release(self, elapsed: Optional[float], late: bool = False) -> None:
+        """Free a slot; ``elapsed`` is how long it was held (None if it was never used)"""
+        if elapsed is not None:
+            self.service_seconds += self.smoothing * (elapsed - self.service_seconds)
+            self.stats["completed"] += 1
+            self.stats["completed_late"] += late
+        # Round robin: serve the lane at the front, then move it to the back
+        while self._lanes:
+            lane, queue = next(iter(self._lanes.items()))
+            future = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._lanes.move_to_end(lane)
+            else:
+                del self._lanes[lane]
+            if not future.done():
+                future.set_result(None)
+                return
+        self._active -= 1
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "active": self._active,
+            "waiting": self._queued,
+            "lanes_waiting": len(self._lanes),
+            "service_ms": round(self.service_seconds * 1e3, 1),
+        }
+
+    def _predicted_wait(self, lane: str) -> float:
+        # Round robin: every waiting lane gets a turn for each request ahead of us in our own lane,
+        # and one more before ours, but we never wait behind more than everything queued
+        queue = self._lanes.get(lane)
+        ahead = min(self._queued, ((len(queue) if queue else 0) + 1) * len(self._lanes)) + 1
+        return ahead * self.service_seconds / self.max_concurrency
+
+    def _discard(self, lane: str, future: asyncio.Future) -> None:
+        queue = self._lanes.get(lane)
+        if queue is None:
+            return
+        try:
+            queue.remove(future)
+        except ValueError:
+            return
+        self._queued -= 1
+        if not queue:
+            del self._lanes[lane]
+
+    @staticmethod
+    def _retry_after(wait: float) -> int:
+        return max(1, math.ceil(wait))
@@ -1,5 +1,13 @@
 from .base import AIProvider
 from .openai_provider import OpenAIProvider
 from .gemini_provider import GeminiProvider
+from .replay_provider import RecordingProvider, ReplayProvider
+from .rule_provider import RuleProvider
+from .local_model import LocalModelProvider, IntentModel
+from .tiered_provider import TieredProvider
+from .model_router import ModelRouter, ComplexityScorer
 
-__all__ = ["AIProvider", "OpenAIProvider", "GeminiProvider"]
\ No newline at end of file
+__all__ = [
+    "AIProvider", "OpenAIProvider", "GeminiProvider", "RecordingProvider", "ReplayProvider",
+    "RuleProvider", "LocalModelProvider", "IntentModel", "TieredProvider", "ModelRouter", "ComplexityScorer"
+]
\ No newline at end of file
@@ -1,49 +1,69 @@
+import logging
+import random
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from app.core.config import Config
+from app.models.menu import MenuCatalog, MENU
+
+logger = logging.getLogger(__name__)
+
+# Called when a message holds no order request; tool choice is forced, so the model needs a way out
+NO_ACTION_FUNCTION = "no_action"
 
 class AIProvider(ABC):
     @abstractmethod
     def parse_intent(self, message: str) -> Dict[str, Any]:
         pass
 
+    def warm(self) -> None:
+        """Open connections before the first request; called at startup, must not raise"""
+
+    def close(self) -> None:
+        """Flush files and release connections; called at shutdown"""
+
 def get_system_prompt() -> str:
     return """You are a drive-thru ordering assistant. Your job is to:
 
-1. PLACE ORDERS: Parse requests for burgers, fries, and drinks with specific quantities
+1. PLACE ORDERS: Parse requests for menu items with specific quantities
 2. MODIFY ORDERS: Update existing orders by adding, removing, or changing items
 3. CANCEL ORDERS: Process cancellation requests with order numbers
 
 Key rules:
 - If no quantity is specified, assume 1
 - Extract ALL mentioned items and quantities
+- Only use item names from the function schema
 - Look for phrases like "each", "both", "all of us" to multiply quantities
 - Order numbers can be mentioned as "order 5", "#5", "order number 5", etc.
 - For modifications: "add", "remove", "change", "update", "modify" indicate order changes
 - For modifications: always specify what to add/remove and the order ID
 - Only respond with the specified function calls
+- One function call per request: a message can hold several ("cancel order 3 and get me two burgers"), call them all, in the order they were said
+- If the message is not an order request, call no_action
 
 PLACE ORDER Examples:
-- "I want 2 burgers and 3 fries" → place_order(burgers=2, fries=3, drinks=0)
-- "My friend and I each want a drink" → place_order(burgers=0, fries=0, drinks=2)
-- "Can I get one of everything" → place_order(burgers=1, fries=1, drinks=1)
+- "I want 2 burgers and 3 fries" → place_order(items=[{item: burgers, quantity: 2}, {item: fries, quantity: 3}])
+- "My friend and I each want a drink" → place_order(items=[{item: drinks, quantity: 2}])
 
 MODIFY ORDER Examples:
-- "Update my order 1 with 2 more burgers and no fries" → modify_order(order_id=1, add_burgers=2, remove_fries=999)
-- "Add 3 drinks to order 2" → modify_order(order_id=2, add_drinks=3)
-- "Remove all burgers from order 3" → modify_order(order_id=3, remove_burgers=999)
-- "Change order 1 to have 5 burgers instead" → modify_order(order_id=1, set_burgers=5)
+- "Update my order 1 with 2 more burgers and no fries" → modify_order(order_id=1, changes=[{item: burgers, op: add, quantity: 2}, {item: fries, op: remove, quantity: 999}])
+- "Add 3 drinks to order 2" → modify_order(order_id=2, changes=[{item: drinks, op: add, quantity: 3}])
+- "Change order 1 to have 5 burgers instead" → modify_order(order_id=1, changes=[{item: burgers, op: set, quantity: 5}])
 
 CANCEL ORDER Examples:
 - "Cancel order 5" → cancel_order(order_id=5)
 - "Please cancel my order #3" → cancel_order(order_id=3)
 
+SEVERAL REQUESTS Examples:
+- "Cancel order 3 and get me two burgers" → cancel_order(order_id=3), place_order(items=[{item: burgers, quantity: 2}])
+- "Add fries to order 4 and drop the drink from order 5" → modify_order(order_id=4, changes=[{item: fries, op: add, quantity: 1}]), modify_order(order_id=5, changes=[{item: drinks, op: remove, quantity: 999}])
+
 MODIFICATION RULES:
-- add_X: Add X items to existing quantity
-- remove_X: Remove X items (use 999 to remove all)
-- set_X: Set total quantity to X (replaces current amount)
+- add: Add items to existing quantity
+- remove: Remove items (use 999 to remove all)
+- set: Set total quantity (replaces current amount)
 - Always include order_id for modifications"""
 
-def get_function_definitions() -> list:
+def get_function_definitions(menu: MenuCatalog = MENU) -> list:
     return [
         {
             "name": "place_order",
@@ -51,11 +71,9 @@ def get_function_definitions() -> list:
             "parameters": {
                 "type": "object",
                 "properties": {
-                    "burgers": {"type": "integer", "description": "Number of burgers", "default": 0},
-                    "fries": {"type": "integer", "description": "Number of fries", "default": 0},
-                    "drinks": {"type": "integer", "description": "Number of drinks", "default": 0},
+                    "items": menu.item_list_schema("Items to order"),
                 },
-                "required": []
+                "required": ["items"]
             },
         },
         {
@@ -65,17 +83,9 @@ def get_function_definitions() -> list:
                 "type": "object",
                 "properties": {
                     "order_id": {"type": "integer", "description": "The order number to modify"},
-                    "add_burgers": {"type": "integer", "description": "Number of burgers to add", "default": 0},
-                    "add_fries": {"type": "integer", "description": "Number of fries to add", "default": 0},
-                    "add_drinks": {"type": "integer", "description": "Number of drinks to add", "default": 0},
-                    "remove_burgers": {"type": "integer", "description": "Number of burgers to remove (999=all)", "default": 0},
-                    "remove_fries": {"type": "integer", "description": "Number of fries to remove (999=all)", "default": 0},
-                    "remove_drinks": {"type": "integer", "description": "Number of drinks to remove (999=all)", "default": 0},
-                    "set_burgers": {"type": "integer", "description": "Set total burgers to this amount", "default": -1},
-                    "set_fries": {"type": "integer", "description": "Set total fries to this amount", "default": -1},
-                    "set_drinks": {"type": "integer", "description": "Set total drinks to this amount", "default": -1},
+                    "changes": menu.item_list_schema("Changes to apply", with_op=True),
                 },
-                "required": ["order_id"]
+                "required": ["order_id", "changes"]
             },
         },
         {
@@ -89,4 +99,47 @@ def get_function_definitions() -> list:
                 "required": ["order_id"],
             },
         },
-    ]
\ No newline at end of file
+        {
+            "name": NO_ACTION_FUNCTION,
+            "description": "The message does not ask to place, modify or cancel an order",
+            "parameters": {"type": "object", "properties": {}},
+        },
+    ]
+
+def get_tool_definitions(menu: MenuCatalog = MENU) -> list:
+    """``get_function_definitions`` in the chat completions ``tools`` format"""
+    return [{"type": "function", "function": definition} for definition in get_function_definitions(menu)]
+
+def function_calls_result(calls: List[Tuple[str, Dict[str, Any]]], response: Any) -> Dict[str, Any]:
+    """Provider result for the function calls of one response.
+
+    ``action``/``data`` hold the first call; when the message held several
+    requests, ``actions`` lists all of them in the order they were made.
+    ``usage`` holds the response's token counts when it reports them.
+    ``raw_response`` (``str(response)``, several KB) is only built and
+    logged at DEBUG or for the AI_RAW_RESPONSE_SAMPLE_RATE share of calls.
+    """
+    actions = [{"action": name, "data": data} for name, data in calls if name != NO_ACTION_FUNCTION]
+    if not actions:
+        result = {"success": False, "error": "No function call detected"}
+    else:
+        result = {"success": True, **actions[0]}
+        if len(actions) > 1:
+            result["actions"] = actions
+    usage = _usage(response)
+    if usage is not None:
+        result["usage"] = usage
+    if logger.isEnabledFor(logging.DEBUG) or random.random() < Config.AI_RAW_RESPONSE_SAMPLE_RATE:
+        result["raw_response"] = str(response)
+        logger.info("Raw provider response", extra={"raw_response": result["raw_response"]})
+    return result
+
+def _usage(response: Any) -> Optional[Dict[str, int]]:
+    """``{"input_tokens", "output_tokens"}`` from an OpenAI or Gemini response, None if it has no counts"""
+    usage = getattr(response, "usage", None)
+    if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+        return {"input_tokens": usage.prompt_tokens, "output_tokens": usage.completion_tokens or 0}
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is not None and getattr(metadata, "prompt_token_count", None) is not None:
+        return {"input_tokens": metadata.prompt_token_count, "output_tokens": metadata.candidates_token_count or 0}
+    return None
@@ -1,13 +1,14 @@
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.core import deadline
 from app.core.config import Config
-from .base import AIProvider, get_system_prompt, get_function_definitions
+from .base import AIProvider, get_system_prompt, get_function_definitions, function_calls_result
 
 logger = logging.getLogger(__name__)
 
 class GeminiProvider(AIProvider):
-    def __init__(self):
+    def __init__(self, model: Optional[str] = None):
         try:
             import google.generativeai as genai
             if not Config.GEMINI_API_KEY:
@@ -16,7 +17,7 @@ class GeminiProvider(AIProvider):
             genai.configure(api_key=Config.GEMINI_API_KEY)
             tools = self._convert_functions_to_tools(get_function_definitions())
             self.model = genai.GenerativeModel(
-                Config.GEMINI_MODEL,
+                model or Config.GEMINI_MODEL,
                 tools=tools
             )
             
@@ -27,29 +28,21 @@ class GeminiProvider(AIProvider):
         try:
             response = self.model.generate_content(
                 [get_system_prompt(), message],
-                tool_config={'function_calling_config': 'AUTO'}
+                # ANY forces function calls (no_action covers non-orders)
+                tool_config={'function_calling_config': {'mode': 'ANY'}},
+                generation_config={'max_output_tokens': Config.AI_MAX_OUTPUT_TOKENS},
+                request_options={'timeout': deadline.budget(Config.AI_REQUEST_TIMEOUT)}
             )
             
-            # Check if model called a function
-            if response.candidates[0].content.parts:
-                for part in response.candidates[0].content.parts:
-                    if hasattr(part, 'function_call'):
-                        function_call = part.function_call
-                        return {
-                            "success": True,
-                            "action": function_call.name,
-                            "data": dict(function_call.args),
-                            "raw_response": str(response)
-                        }
-            
-            return {
-                "success": False,
-                "error": "No function call detected",
-                "raw_response": response.text if response.text else "No response"
-            }
+            # One part per function call when the message held several requests
+            parts = response.candidates[0].content.parts
+            return function_calls_result(
+                [(part.function_call.name, _to_python(part.function_call.args)) for part in parts if part.function_call],
+                response
+            )
             
         except Exception as e:
-            logger.error(f"Gemini API error: {str(e)}")
+            logger.error("Gemini API error: %s", e)
             return {"success": False, "error": f"API error: {str(e)}"}
     
     def _convert_functions_to_tools(self, openai_functions: list) -> list:
@@ -62,17 +55,8 @@ class GeminiProvider(AIProvider):
                     genai.protos.FunctionDeclaration(
                         name=func["name"],
                         description=func["description"],
-                        parameters=genai.protos.Schema(
-                            type=genai.protos.Type.OBJECT,
-                            properties={
-                                prop_name: genai.protos.Schema(
-                                    type=self._get_gemini_type(prop_info["type"]),
-                                    description=prop_info["description"]
-                                )
-                                for prop_name, prop_info in func["parameters"]["properties"].items()
-                            },
-                            required=func["parameters"].get("required", [])
-                        )
+                        # Gemini rejects object schemas without properties (no_action)
+                        parameters=self._convert_schema(func["parameters"]) if func["parameters"].get("properties") else None
                     )
                 ]
             )
@@ -80,6 +64,26 @@ class GeminiProvider(AIProvider):
         
         return tools
     
+    def _convert_schema(self, schema: dict):
+        """Recursively convert a JSON schema (objects, arrays, enums) to a Gemini schema"""
+        import google.generativeai as genai
+        
+        kwargs = {"type": self._get_gemini_type(schema["type"])}
+        if "description" in schema:
+            kwargs["description"] = schema["description"]
+        if "enum" in schema:
+            kwargs["enum"] = schema["enum"]
+        if "items" in schema:
+            kwargs["items"] = self._convert_schema(schema["items"])
+        if "properties" in schema:
+            kwargs["properties"] = {
+                prop_name: self._convert_schema(prop_info)
+                for prop_name, prop_info in schema["properties"].items()
+            }
+            kwargs["required"] = schema.get("required", [])
+        
+        return genai.protos.Schema(**kwargs)
+    
     def _get_gemini_type(self, openai_type: str):
         """Convert OpenAI parameter types to Gemini types"""
         import google.generativeai as genai
@@ -92,4 +96,14 @@ class GeminiProvider(AIProvider):
             "array": genai.protos.Type.ARRAY,
             "object": genai.protos.Type.OBJECT
         }
-        return type_mapping.get(openai_type, genai.protos.Type.STRING)
\ No newline at end of file
+        return type_mapping.get(openai_type, genai.protos.Type.STRING)
+
+def _to_python(value: Any) -> Any:
+    """Unwrap proto map/repeated containers from function call args into plain Python"""
+    if hasattr(value, "items"):
+        return {key: _to_python(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) or type(value).__name__ == "RepeatedComposite":
+        return [_to_python(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
@@ -0,0 +1,179 @@
+"""Local intent classifier: hashed character n-grams + multinomial logistic regression.
+
+Train from RecordingProvider/ReplayProvider logs:
+
+    python -m app.services.ai_providers.local_model model.npz recording.jsonl.gz [more.jsonl ...]
+"""
+import logging
+import re
+import sys
+import zlib
+from typing import Dict, Any, List, Sequence, Tuple
+import numpy as np
+from app.models.menu import MenuCatalog, MENU
+from .base import AIProvider
+from .slots import ItemSlotParser, normalize, find_order_id
+
+logger = logging.getLogger(__name__)
+
+# Quantities the slot parser cannot work out ("each", "both"...) are left to a larger model
+_MULTIPLIER_RE = re.compile(r"\b(?:each|both|every|apiece|all of us|for everyone)\b")
+
+NO_ACTION = "none"
+ACTIONS = ("place_order", "modify_order", "cancel_order", NO_ACTION)
+
+class IntentModel:
+    """Classifies a message into one of ``ACTIONS``"""
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray, dims: int, ngram_range: Tuple[int, int] = (2, 4)):
+        self.weights = weights  # (classes, dims)
+        self.bias = bias
+        self.dims = dims
+        self.ngram_range = ngram_range
+
+    def features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed n-gram indices and L2-normalized counts for one normalized message"""
+        padded = f" {text} ".encode()
+        low, high = self.ngram_range
+        counts: Dict[int, int] = {}
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                index = zlib.crc32(padded[i:i + n]) % self.dims
+                counts[index] = counts.get(index, 0) + 1
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        return indices, values / max(np.linalg.norm(values), 1e-12)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        indices, values = self.features(text)
+        logits = self.weights[:, indices] @ values + self.bias
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        best = int(probs.argmax())
+        return ACTIONS[best], float(probs[best])
+
+    @classmethod
+    def train(
+        cls,
+        texts: Sequence[str],
+        labels: Sequence[str],
+        dims: int = 1 << 16,
+        epochs: int = 300,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5
+    ) -> "IntentModel":
+        model = cls(np.zeros((len(ACTIONS), dims)), np.zeros(len(ACTIONS)), dims)
+        # Sparse design matrix as (row, col, value) triples
+        rows, cols, vals = [], [], []
+        for row, text in enumerate(texts):
+            indices, values = model.features(text)
+            rows.append(np.full(len(indices), row))
+            cols.append(indices)
+            vals.append(values)
+        rows, cols, vals = np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+        n = len(texts)
+        targets = np.zeros((len(ACTIONS), n))
+        targets[[ACTIONS.index(label) for label in labels], np.arange(n)] = 1.0
+
+        # Full-batch gradient descent with momentum on the softmax cross-entropy
+        velocity_w, velocity_b = np.zeros_like(model.weights), np.zeros_like(model.bias)
+        for _ in range(epochs):
+            logits = np.stack([
+                np.bincount(rows, weights=vals * model.weights[c, cols], minlength=n) for c in range(len(ACTIONS))
+            ]) + model.bias[:, None]
+            probs = np.exp(logits - logits.max(axis=0))
+            probs /= probs.sum(axis=0)
+            error = (probs - targets) / n
+            grad_w = np.stack([
+                np.bincount(cols, weights=vals * error[c, rows], minlength=dims) for c in range(len(ACTIONS))
+            ]) + l2 * model.weights
+            velocity_w = 0.9 * velocity_w - learning_rate * grad_w
+            velocity_b = 0.9 * velocity_b - learning_rate * error.sum(axis=1)
+            model.weights += velocity_w
+            model.bias += velocity_b
+        return model
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path, weights=self.weights.astype(np.float32), bias=self.bias,
+            dims=self.dims, ngram_range=np.array(self.ngram_range), actions=np.array(ACTIONS)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IntentModel":
+        data = np.load(path)
+        if tuple(data["actions"]) != ACTIONS:
+            raise ValueError(f"Model {path} was trained for actions {tuple(data['actions'])}")
+        return cls(data["weights"].astype(np.float64), data["bias"], int(data["dims"]), tuple(data["ngram_range"]))
+
+class LocalModelProvider(AIProvider):
+    """CPU-only provider: the classifier picks the action, the menu slot parser fills its data.
+
+    ``confidence`` is the class probability, scaled down when the slots the
+    action needs (items, order number) are missing.
+    """
+
+    def __init__(self, model: IntentModel, menu: MenuCatalog = MENU):
+        self.model = model
+        self.slots = ItemSlotParser(menu)
+
+    @classmethod
+    def from_file(cls, path: str, menu: MenuCatalog = MENU) -> "LocalModelProvider":
+        return cls(IntentModel.load(path), menu)
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        text = normalize(message)
+        action, confidence = self.model.predict(text)
+        if action == NO_ACTION:
+            return {"success": False, "error": "No function call detected", "confidence": confidence}
+
+        order_id = find_order_id(text)
+        if action == "place_order":
+            items = self.slots.scan(text)
+            data = {"items": items}
+            # An order number means another request rides along ("cancel order 3 and get me a burger")
+            complete = bool(items) and order_id is None and not _MULTIPLIER_RE.search(text)
+        elif action == "modify_order":
+            changes = self.slots.scan(text, default_op="add")
+            data = {"order_id": order_id, "changes": changes}
+            complete = order_id is not None and bool(changes)
+        else:
+            data = {"order_id": order_id}
+            # Same for items alongside a cancel
+            complete = order_id is not None and not self.slots.scan(text)
+        return {
+            "success": True,
+            "action": action,
+            "data": data,
+            "confidence": confidence if complete else confidence * 0.3,
+        }
+
+def training_examples(records: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """(normalized message, action label) pairs from recording entries.
+
+    Messages that held several requests have no single label and are left
+    to the cloud provider.
+    """
+    texts, labels = [], []
+    for record in records:
+        result = record["r"]
+        action = result.get("action") if result.get("success") else NO_ACTION
+        if action in ACTIONS and "actions" not in result:
+            texts.append(normalize(record["m"]))
+            labels.append(action)
+    return texts, labels
+
+def main(argv: List[str]) -> None:
+    from .replay_provider import load_recording
+    if len(argv) < 2:
+        raise SystemExit(__doc__)
+    out_path, recording_paths = argv[0], argv[1:]
+    records = [record for path in recording_paths for record in load_recording(path)]
+    texts, labels = training_examples(records)
+    model = IntentModel.train(texts, labels)
+    correct = sum(model.predict(text)[0] == label for text, label in zip(texts, labels))
+    model.save(out_path)
+    print(f"Trained on {len(texts)} examples, training accuracy {correct / len(texts):.1%}, saved to {out_path}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,137 @@
+import logging
+import re
+import threading
+import time
+from typing import Dict, Any
+from pydantic import ValidationError
+from app.models.menu import MenuCatalog, MENU
+from app.schemas.schemas import PlaceOrder, parse_intent_command
+from .base import AIProvider
+from .slots import ItemSlotParser, normalize, find_order_id
+
+logger = logging.getLogger(__name__)
+
+_ACTION_RE = re.compile(r"\b(?:cancel|scrap|forget|add|remove|take off|drop|change|make|swap|replace)\b")
+_CANCEL_RE = re.compile(r"\b(?:cancel|scrap|forget)\b")
+_PLACE_RE = re.compile(r"\b(?:i want|i'd like|i would like|can i get|can i have|give me|get me|i'll have|we want|we'd like)\b")
+_MODIFY_RE = re.compile(r"\b(?:add|remove|take off|drop|change|make|swap|replace|instead|without|no more)\b")
+# Quantities that need arithmetic, or references that need context
+_MULTIPLIER_RE = re.compile(r"\b(?:each|both|every|apiece|all of us|for everyone|half|same again|double)\b")
+_REFERENCE_RE = re.compile(r"\b(?:it|that|this|mine|the order|my order|our order|last one)\b")
+_CLAUSE_RE = re.compile(r"\b(?:and then|but|actually|except|instead of|then)\b")
+
+class ComplexityScorer:
+    """Cheap estimate of how hard a message is to parse: 0 for "two burgers", 1+ for anything tricky"""
+
+    def __init__(self, menu: MenuCatalog = MENU):
+        self.slots = ItemSlotParser(menu)
+
+    def score(self, message: str) -> float:
+        text = normalize(message)
+        items = len(self.slots.scan(text))
+        has_order_id = find_order_id(text) is not None
+        refers_back = has_order_id or bool(_REFERENCE_RE.search(text))
+
+        score = max(0, len(text.split()) - 10) * 0.05
+        score += max(0, items - 3) * 0.25
+        if _MODIFY_RE.search(text):
+            score += 0.4
+        if has_order_id:
+            score += 0.2
+        elif refers_back:
+            score += 0.6
+        if _MULTIPLIER_RE.search(text):
+            score += 1.0
+        if _CLAUSE_RE.search(text):
+            score += 0.5
+        # Several requests in one message: "cancel order 3 and get me two burgers", "two fries and i'd like a drink"
+        if (
+            len(_ACTION_RE.findall(text)) > 1
+            or len(_PLACE_RE.findall(text)) > 1
+            or (_CANCEL_RE.search(text) and items)
+            or (refers_back and _PLACE_RE.search(text))
+        ):
+            score += 1.0
+        return round(score, 3)
+
+class ModelRouter(AIProvider):
+    """Sends simple messages to a fast model and the rest to a strong one.
+
+    Messages scoring below ``max_complexity`` try the fast model first; a
+    failed parse, or one whose actions do not validate, is retried on the
+    strong model. Results carry ``"route"``: the model that answered.
+    """
+
+    def __init__(self, fast: AIProvider, strong: AIProvider, max_complexity: float = 1.0, menu: MenuCatalog = MENU):
+        self.fast = fast
+        self.strong = strong
+        self.max_complexity = max_complexity
+        self.scorer = ComplexityScorer(menu)
+        self._lock = threading.Lock()
+        self._stats = {route: {"attempts": 0, "succeeded": 0, "seconds": 0.0} for route in ("fast", "strong")}
+        self._escalated = 0
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        if self.scorer.score(message) < self.max_complexity:
+            result = self._call("fast", self.fast, message)
+            if result is not None:
+                return result
+            with self._lock:
+                self._escalated += 1
+        return self._call("strong", self.strong, message, last=True)
+
+    def warm(self) -> None:
+        self.fast.warm()
+        self.strong.warm()
+
+    def close(self) -> None:
+        self.fast.close()
+        self.strong.close()
+
+    def _call(self, route: str, provider: AIProvider, message: str, last: bool = False) -> Any:
+        start = time.perf_counter()
+        try:
+            result = provider.parse_intent(message)
+        except Exception as e:
+            if last:
+                raise
+            logger.warning("%s model failed, escalating: %s", route, e)
+            result = {"success": False}
+        elapsed = time.perf_counter() - start
+
+        usable = _usable(result)
+        with self._lock:
+            stats = self._stats[route]
+            stats["attempts"] += 1
+            stats["succeeded"] += usable
+            stats["seconds"] += elapsed
+        if usable or last:
+            result["route"] = route
+            return result
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {
+                route: {
+                    "attempts": stats["attempts"],
+                    "succeeded": stats["succeeded"],
+                    "mean_ms": stats["seconds"] / stats["attempts"] * 1e3 if stats["attempts"] else 0.0,
+                }
+                for route, stats in self._stats.items()
+            }
+            routes["fast"]["escalated"] = self._escalated
+            return routes
+
+def _usable(result: Dict[str, Any]) -> bool:
+    """Whether every action validates and, for a modify or cancel, names its order"""
+    if not result.get("success"):
+        return False
+    try:
+        for intent in result.get("actions", (result,)):
+            command = parse_intent_command(intent)
+            if not isinstance(command, PlaceOrder) and command.order_id is None:
+                return False
+    except ValidationError:
+        return False
+    return True
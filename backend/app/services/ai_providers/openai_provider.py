@@ -1,16 +1,27 @@
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.core import deadline
 from app.core.config import Config
-from .base import AIProvider, get_system_prompt, get_function_definitions
+from .base import AIProvider, get_system_prompt, get_tool_definitions, function_calls_result
 
 logger = logging.getLogger(__name__)
 
 class OpenAIProvider(AIProvider):
-    def __init__(self):
+    def __init__(self, model: Optional[str] = None):
         from openai import OpenAI
         self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        self.model = Config.OPENAI_MODEL
+        self.model = model or Config.OPENAI_MODEL
+    
+    def warm(self) -> None:
+        # A cheap authenticated GET leaves a pooled TLS connection for the first order
+        try:
+            self.client.models.retrieve(self.model, timeout=5)
+        except Exception as e:
+            logger.warning("OpenAI warm-up for %s failed: %s", self.model, e)
+    
+    def close(self) -> None:
+        self.client.close()
     
     def parse_intent(self, message: str) -> Dict[str, Any]:
         try:
@@ -20,26 +31,20 @@ class OpenAIProvider(AIProvider):
                     {"role": "system", "content": get_system_prompt()},
                     {"role": "user", "content": message}
                 ],
-                functions=get_function_definitions(),
-                function_call="auto",
-                timeout=Config.AI_REQUEST_TIMEOUT
+                tools=get_tool_definitions(),
+                # Always answer with calls (no_action covers non-orders), all of them in one response
+                tool_choice="required",
+                parallel_tool_calls=True,
+                max_tokens=Config.AI_MAX_OUTPUT_TOKENS,
+                timeout=deadline.budget(Config.AI_REQUEST_TIMEOUT)
             )
             
-            choice = response.choices[0].message
-            if choice.function_call:
-                return {
-                    "success": True,
-                    "action": choice.function_call.name,
-                    "data": json.loads(choice.function_call.arguments),
-                    "raw_response": str(response)
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": "No function call detected",
-                    "raw_response": choice.content
-                }
+            tool_calls = response.choices[0].message.tool_calls or []
+            return function_calls_result(
+                [(call.function.name, json.loads(call.function.arguments)) for call in tool_calls],
+                response
+            )
                 
         except Exception as e:
-            logger.error(f"OpenAI API error: {str(e)}")
+            logger.error("OpenAI API error: %s", e)
             return {"success": False, "error": f"API error: {str(e)}"}
\ No newline at end of file
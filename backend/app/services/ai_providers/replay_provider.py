@@ -0,0 +1,94 @@
+import copy
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple, IO
+from .base import AIProvider
+
+logger = logging.getLogger(__name__)
+
+def _open(path: str, mode: str) -> IO:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """Read a recording: one ``{"m": message, "r": result, "l": latency_s}`` per line"""
+    with _open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class RecordingProvider(AIProvider):
+    """Wraps a live provider and appends every message/result/latency to a local file"""
+
+    def __init__(self, inner: AIProvider, path: str):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = _open(path, "a")
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = self.inner.parse_intent(message)
+        latency = time.perf_counter() - start
+
+        # raw_response is provider-specific debug output and dominates the file size
+        record = {
+            "m": message,
+            "r": {k: v for k, v in result.items() if k != "raw_response"},
+            "l": round(latency, 4),
+            "t": round(time.time(), 3),
+        }
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+        return result
+
+    def warm(self) -> None:
+        self.inner.warm()
+
+    def close(self) -> None:
+        self.inner.close()
+        with self._lock:
+            self._file.close()
+
+class ReplayProvider(AIProvider):
+    """Serves recorded results without network access.
+
+    Repeated messages cycle through their recordings in the order they were
+    captured. Each call sleeps for the recorded latency times
+    ``latency_scale`` (0 disables the delay).
+    """
+
+    def __init__(self, path: Optional[str], latency_scale: float = 1.0):
+        if not path:
+            raise ValueError("AI_REPLAY_FILE is required when using the replay provider")
+        self.path = path
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._recordings: Dict[str, List[Tuple[Dict[str, Any], float]]] = defaultdict(list)
+        for record in load_recording(path):
+            self._recordings[record["m"]].append((record["r"], record.get("l", 0.0)))
+        self._cursor: Dict[str, int] = defaultdict(int)
+        logger.info("Replay provider loaded %s recordings from %s", sum(map(len, self._recordings.values())), path)
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        entries = self._recordings.get(message)
+        if not entries:
+            return {"success": False, "error": "No recording for message"}
+
+        with self._lock:
+            index = self._cursor[message]
+            self._cursor[message] = index + 1
+        result, latency = entries[index % len(entries)]
+
+        if self.latency_scale > 0 and latency > 0:
+            time.sleep(latency * self.latency_scale)
+        return copy.deepcopy(result)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._cursor.clear()
@@ -0,0 +1,56 @@
+import re
+from typing import Dict, Any
+from app.models.menu import MenuCatalog, MENU
+from .base import AIProvider
+from .slots import ItemSlotParser, normalize
+
+_ORDER = r"(?:my )?order (?:number )?#?\s*(?P<order_id>\d+)"
+_PLEASE = r"(?:please |can you |could you )*"
+
+_CANCEL_RE = re.compile(rf"^{_PLEASE}cancel {_ORDER}(?: please)?$")
+_ADD_RE = re.compile(rf"^{_PLEASE}add (?P<items>.+?) to {_ORDER}(?: please)?$")
+_REMOVE_RE = re.compile(rf"^{_PLEASE}(?:remove|take) (?P<items>.+?) (?:from|off) {_ORDER}(?: please)?$")
+_PLACE_RE = re.compile(
+    r"^(?:hi |hello |hey )?(?:i want|i'd like|i would like|i'll have|i'll take|can i get|can i have|"
+    r"could i get|could i have|give me|let me get|let me have|we want|we'd like)? ?(?P<items>.+?)(?: please)?$"
+)
+
+class RuleProvider(AIProvider):
+    """Exact-phrasing rules: canonical orders, cancels and add/remove with an order number.
+
+    Anything the rules do not fully match returns confidence 0 so a tiered
+    chain escalates it.
+    """
+
+    def __init__(self, menu: MenuCatalog = MENU):
+        self.slots = ItemSlotParser(menu)
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        text = normalize(message)
+
+        match = _CANCEL_RE.match(text)
+        if match:
+            return self._intent("cancel_order", {"order_id": int(match.group("order_id"))})
+
+        for pattern, op in ((_ADD_RE, "add"), (_REMOVE_RE, "remove")):
+            match = pattern.match(text)
+            if match:
+                changes = self.slots.parse_list(match.group("items"), op)
+                if changes:
+                    return self._intent("modify_order", {"order_id": int(match.group("order_id")), "changes": changes})
+                return self._no_match()
+
+        match = _PLACE_RE.match(text)
+        if match:
+            items = self.slots.parse_list(match.group("items"))
+            if items:
+                return self._intent("place_order", {"items": items})
+        return self._no_match()
+
+    @staticmethod
+    def _intent(action: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"success": True, "action": action, "data": data, "confidence": 1.0}
+
+    @staticmethod
+    def _no_match() -> Dict[str, Any]:
+        return {"success": False, "error": "No rule matched", "confidence": 0.0}
@@ -0,0 +1,109 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from app.models.menu import MenuCatalog, REMOVE_ALL
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "another": 1, "one more": 1, "two": 2, "three": 3,
+    "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+
+# Words that switch the operation for the items after them in a modification
+OP_WORDS = {
+    "add": "add", "more": "add", "plus": "add", "extra": "add", "another": "add",
+    "remove": "remove", "no": "remove", "without": "remove", "take": "remove", "drop": "remove", "minus": "remove",
+    "make": "set", "change": "set", "set": "set", "instead": "set", "only": "set",
+}
+
+ORDER_ID_RE = re.compile(r"(?:order|#)\s*(?:number\s*|no\.?\s*)?#?\s*(\d+)")
+_SPLIT_RE = re.compile(r"\s*(?:,|\band\b|\bplus\b|\bwith\b)\s*")
+_PUNCTUATION_RE = re.compile(r"[^\w#\s,']")
+_ARTICLES = ("the", "my", "all", "any", "some")
+
+def normalize(message: str) -> str:
+    return " ".join(_PUNCTUATION_RE.sub(" ", message.lower()).split())
+
+def find_order_id(text: str) -> Optional[int]:
+    match = ORDER_ID_RE.search(text)
+    return int(match.group(1)) if match else None
+
+class ItemSlotParser:
+    """Turns item phrases ("two burgers and a drink") into item-list entries using the menu's names"""
+
+    def __init__(self, menu: MenuCatalog):
+        self.menu = menu
+        self.names: Dict[str, str] = {}
+        for item in menu:
+            for name in (item.key, item.singular, item.plural):
+                self.names[name.lower()] = item.key
+                # "order of fries" -> "fries"
+                self.names.setdefault(name.lower().split(" of ")[-1], item.key)
+        self._longest_name = max(len(name.split()) for name in self.names)
+
+    def parse_list(self, text: str, op: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Strict: every comma/"and"-separated part must be ``[quantity] item``, else None"""
+        entries = []
+        for part in _SPLIT_RE.split(text.strip()):
+            words = part.split()
+            if not words:
+                continue
+            # No number: "add fries" is one, "remove the fries" is all of them
+            quantity = REMOVE_ALL if op == "remove" else 1
+            words, explicit = self._take_quantity(words)
+            if explicit is not None:
+                quantity = explicit
+            elif len(words) > 1 and words[0] in _ARTICLES:
+                words = words[1:]
+            name = " ".join(words)
+            key = self.names.get(name.removeprefix("more ").removesuffix(" more"))
+            if key is None:
+                return None
+            entry = {"item": key, "quantity": quantity}
+            if op is not None:
+                entry["op"] = op
+            entries.append(entry)
+        return entries or None
+
+    def scan(self, text: str, default_op: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lenient: find every item mention in free text, with the nearest preceding quantity and op word"""
+        # Order numbers are not quantities
+        words = ORDER_ID_RE.sub(" ", text).replace(",", " ").split()
+        entries = []
+        op = default_op
+        quantity: Optional[int] = None
+        i = 0
+        while i < len(words):
+            match = self._match_name(words, i)
+            if match is not None:
+                key, length = match
+                entry = {"item": key, "quantity": quantity if quantity is not None else (
+                    REMOVE_ALL if op == "remove" else 1
+                )}
+                if op is not None:
+                    entry["op"] = op
+                entries.append(entry)
+                quantity = None
+                i += length
+                continue
+            word = words[i]
+            if word.isdigit():
+                quantity = int(word)
+            elif word in NUMBER_WORDS and (word not in ("a", "an") or quantity is None):
+                quantity = NUMBER_WORDS[word]
+            if default_op is not None and word in OP_WORDS:
+                op = OP_WORDS[word]
+            i += 1
+        return entries
+
+    def _take_quantity(self, words: List[str]) -> Tuple[List[str], Optional[int]]:
+        for size in (2, 1):
+            head = " ".join(words[:size])
+            if len(words) > size and (head in NUMBER_WORDS or head.isdigit()):
+                return words[size:], int(head) if head.isdigit() else NUMBER_WORDS[head]
+        return words, None
+
+    def _match_name(self, words: List[str], start: int) -> Optional[Tuple[str, int]]:
+        for length in range(min(self._longest_name, len(words) - start), 0, -1):
+            key = self.names.get(" ".join(words[start:start + length]))
+            if key is not None:
+                return key, length
+        return None
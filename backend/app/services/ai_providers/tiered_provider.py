@@ -0,0 +1,65 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, List, Tuple
+from .base import AIProvider
+
+logger = logging.getLogger(__name__)
+
+class TieredProvider(AIProvider):
+    """Tries providers cheapest first and escalates on low confidence.
+
+    ``tiers`` is a list of ``(name, provider, min_confidence)``. A tier's
+    result is used when its ``confidence`` reaches ``min_confidence``;
+    results without a confidence count as 1.0. The last tier's result is
+    always used.
+    """
+
+    def __init__(self, tiers: List[Tuple[str, AIProvider, float]]):
+        if not tiers:
+            raise ValueError("TieredProvider needs at least one tier")
+        self.tiers = tiers
+        self._lock = threading.Lock()
+        self._stats = {name: {"attempts": 0, "served": 0, "seconds": 0.0} for name, _, _ in tiers}
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        last = len(self.tiers) - 1
+        for position, (name, provider, min_confidence) in enumerate(self.tiers):
+            start = time.perf_counter()
+            try:
+                result = provider.parse_intent(message)
+            except Exception as e:
+                if position == last:
+                    raise
+                logger.warning("Tier %s failed, escalating: %s", name, e)
+                result = {"success": False, "confidence": 0.0}
+            elapsed = time.perf_counter() - start
+
+            served = position == last or result.get("confidence", 1.0) >= min_confidence
+            with self._lock:
+                stats = self._stats[name]
+                stats["attempts"] += 1
+                stats["seconds"] += elapsed
+                stats["served"] += served
+            if served:
+                result["tier"] = name
+                return result
+
+    def warm(self) -> None:
+        for _, provider, _ in self.tiers:
+            provider.warm()
+
+    def close(self) -> None:
+        for _, provider, _ in self.tiers:
+            provider.close()
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "attempts": stats["attempts"],
+                    "served": stats["served"],
+                    "mean_ms": stats["seconds"] / stats["attempts"] * 1e3 if stats["attempts"] else 0.0,
+                }
+                for name, stats in self._stats.items()
+            }
@@ -1,25 +1,132 @@
 import logging
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional, Union
+from app.core import deadline
 from app.core.config import Config
-from app.services.ai_providers import OpenAIProvider, GeminiProvider
+from app.utils.exception_utils import DeadlineExceededError
+from app.services.ai_providers import (
+    AIProvider, OpenAIProvider, GeminiProvider, RecordingProvider, ReplayProvider,
+    RuleProvider, LocalModelProvider, TieredProvider, ModelRouter
+)
+from app.services.shadow import ShadowEvaluator
 
 logger = logging.getLogger(__name__)
 
 class AIService:
-    def __init__(self, provider: str = None):
+    def __init__(self, provider: Union[str, AIProvider, None] = None, shadow: Optional[ShadowEvaluator] = None):
+        self.router: Optional[ModelRouter] = None
+        self.tiers: Optional[TieredProvider] = None
+        self.shadow = shadow
+        if isinstance(provider, AIProvider):
+            # Pre-built provider (replay harness, load tests)
+            self.provider_name = type(provider).__name__
+            self.provider = provider
+            if isinstance(provider, TieredProvider):
+                self.tiers = provider
+            elif isinstance(provider, ModelRouter):
+                self.router = provider
+            logger.info("AI Service initialized with %s provider", self.provider_name)
+            return
+        
         self.provider_name = provider or Config.AI_PROVIDER
         
         if self.provider_name == "openai":
-            self.provider = OpenAIProvider()
+            self.provider = self._route(OpenAIProvider, Config.OPENAI_FAST_MODEL)
         elif self.provider_name == "gemini":
-            self.provider = GeminiProvider()
+            self.provider = self._route(GeminiProvider, Config.GEMINI_FAST_MODEL)
+        elif self.provider_name == "replay":
+            self.provider = ReplayProvider(Config.AI_REPLAY_FILE, Config.AI_REPLAY_LATENCY_SCALE)
         else:
             raise ValueError(f"Unsupported provider: {self.provider_name}")
         
-        logger.info(f"AI Service initialized with {self.provider_name} provider")
+        if Config.AI_RECORD_FILE and self.provider_name != "replay":
+            # Only cloud traffic is recorded; it is what the local model trains on
+            self.provider = RecordingProvider(self.provider, Config.AI_RECORD_FILE)
+            logger.info("Recording provider traffic to %s", Config.AI_RECORD_FILE)
+        
+        self.provider = self._build_tiers(self.provider)
+        if isinstance(self.provider, TieredProvider):
+            self.tiers = self.provider
+        
+        if self.shadow is None and Config.AI_SHADOW_PROVIDER:
+            self.shadow = self._build_shadow()
+        
+        logger.info("AI Service initialized with %s provider", self.provider_name)
+    
+    def _route(self, provider_class: type, fast_model: str) -> AIProvider:
+        strong = provider_class()
+        if not fast_model:
+            return strong
+        logger.info("Routing simple messages to %s", fast_model)
+        self.router = ModelRouter(provider_class(fast_model), strong, Config.AI_ROUTER_MAX_COMPLEXITY)
+        return self.router
+    
+    @staticmethod
+    def _build_shadow() -> ShadowEvaluator:
+        if Config.AI_SHADOW_PROVIDER == "openai":
+            provider_class, default_model = OpenAIProvider, Config.OPENAI_MODEL
+        else:
+            provider_class, default_model = GeminiProvider, Config.GEMINI_MODEL
+        name = f"{Config.AI_SHADOW_PROVIDER}:{Config.AI_SHADOW_MODEL or default_model}"
+        logger.info("Shadowing %s of messages to %s", Config.AI_SHADOW_SAMPLE_RATE, name)
+        return ShadowEvaluator(
+            provider_class(Config.AI_SHADOW_MODEL),
+            Config.AI_SHADOW_FILE,
+            sample_rate=Config.AI_SHADOW_SAMPLE_RATE,
+            queue_size=Config.AI_SHADOW_QUEUE_SIZE,
+            workers=Config.AI_SHADOW_WORKERS,
+            name=name
+        )
+    
+    @staticmethod
+    def _build_tiers(cloud: AIProvider) -> AIProvider:
+        tiers = []
+        for name in Config.AI_TIERS:
+            if name == "rules":
+                tiers.append(("rules", RuleProvider(), 1.0))
+            elif name == "local":
+                if Config.LOCAL_MODEL_FILE:
+                    tiers.append(("local", LocalModelProvider.from_file(Config.LOCAL_MODEL_FILE), Config.LOCAL_MODEL_MIN_CONFIDENCE))
+                else:
+                    logger.info("No LOCAL_MODEL_FILE configured; skipping the local model tier")
+        if not tiers:
+            return cloud
+        logger.info("Intent tiers: %s -> cloud", " -> ".join(name for name, _, _ in tiers))
+        return TieredProvider(tiers + [("cloud", cloud, 0.0)])
     
     def parse_user_intent(self, message: str) -> Dict[str, Any]:
         if not message or not message.strip():
             return {"success": False, "error": "Empty message"}
         
-        return self.provider.parse_intent(message.strip())
\ No newline at end of file
+        # No provider call (and no order) for a customer who has already given up
+        if deadline.expired():
+            raise DeadlineExceededError("before the provider call")
+        start = time.perf_counter()
+        result = self.provider.parse_intent(message.strip())
+        if deadline.expired():
+            raise DeadlineExceededError("during the provider call")
+        if self.shadow is not None:
+            self.shadow.submit(message.strip(), result, time.perf_counter() - start)
+        return result
+    
+    def warm(self) -> None:
+        """Connect to the provider(s) ahead of traffic; failures are logged, not raised"""
+        self.provider.warm()
+        if self.shadow is not None:
+            self.shadow.candidate.warm()
+    
+    def close(self) -> None:
+        if self.shadow is not None:
+            self.shadow.close()
+        self.provider.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tier, per-model-route and shadow counters for whichever of them are in use"""
+        stats: Dict[str, Any] = {"provider": self.provider_name}
+        if self.tiers is not None:
+            stats["tiers"] = self.tiers.get_stats()
+        if self.router is not None:
+            stats["routes"] = self.router.get_stats()
+        if self.shadow is not None:
+            stats["shadow"] = self.shadow.get_stats()
+        return stats
@@ -0,0 +1,87 @@
+import time
+from typing import Dict, Any, Optional
+import numpy as np
+from app.models.menu import MenuCatalog
+from app.models.order_columns import OrderColumns, STATUS_CODES
+
+SECONDS_PER_HOUR = 3600
+
+class AnalyticsService:
+    """Time-bucketed throughput analytics over the columnar order history"""
+
+    def __init__(self, columns: OrderColumns, menu: MenuCatalog):
+        self.columns = columns
+        self.menu = menu
+
+    def get_summary(
+        self,
+        window_hours: int = 24,
+        top: int = 3,
+        now: Optional[float] = None
+    ) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+
+        # Hourly buckets aligned to local clock hours, ending with the current hour
+        utc_offset = time.localtime(now).tm_gmtoff
+        last_hour = int((now + utc_offset) // SECONDS_PER_HOUR)
+        first_hour = last_hour - window_hours + 1
+        edges = np.arange(first_hour, last_hour + 1) * SECONDS_PER_HOUR - utc_offset
+
+        # Rows are appended in time order, so each bucket is a contiguous slice
+        timestamps, quantities, basket, status = self.columns.snapshot()
+        bounds = np.searchsorted(timestamps, edges, side="left")
+        lo = int(bounds[0])
+        timestamps, quantities, basket, status = (
+            timestamps[lo:], quantities[:, lo:], basket[lo:], status[lo:]
+        )
+        bounds = bounds - lo
+
+        total = len(timestamps)
+        canceled = status == STATUS_CODES["canceled"]
+        num_canceled = int(np.count_nonzero(canceled))
+        kept_basket = np.where(canceled, 0, basket)
+        num_kept = total - num_canceled
+
+        items_per_hour = np.zeros((len(self.menu), window_hours), dtype=np.int64)
+        volume_per_hour = np.zeros(window_hours, dtype=np.int64)
+        if total:
+            non_empty = bounds < np.append(bounds[1:], total)
+            starts = bounds[non_empty]
+            volume_per_hour[non_empty] = np.add.reduceat(kept_basket, starts)
+            items_per_hour[:, non_empty] = np.add.reduceat(quantities, starts, axis=1)
+            if num_canceled:
+                # Canceled orders are rare; back them out instead of masking every row
+                canceled_rows = np.flatnonzero(canceled)
+                canceled_buckets = np.searchsorted(bounds, canceled_rows, side="right") - 1
+                flat_index = (np.arange(len(self.menu))[:, None] * window_hours + canceled_buckets).ravel()
+                items_per_hour -= np.bincount(
+                    flat_index,
+                    weights=quantities[:, canceled_rows].ravel(),
+                    minlength=items_per_hour.size,
+                ).astype(np.int64).reshape(items_per_hour.shape)
+
+        # Busiest hours of day, folded from the hourly buckets
+        hour_of_day = np.arange(first_hour, last_hour + 1) % 24
+        volume_by_hour_of_day = np.bincount(hour_of_day, weights=volume_per_hour, minlength=24)
+        top_hours = np.argsort(volume_by_hour_of_day, kind="stable")[::-1][:top]
+
+        return {
+            "window_hours": window_hours,
+            "total_orders": total,
+            "canceled_orders": num_canceled,
+            "cancel_rate": num_canceled / total if total else 0.0,
+            "mean_basket_size": float(kept_basket.sum()) / num_kept if num_kept else 0.0,
+            "items_per_hour": [
+                {
+                    "hour_start": float(edges[hour]),
+                    "total": int(volume_per_hour[hour]),
+                    "items": self.menu.to_dict(items_per_hour[:, hour].tolist()),
+                }
+                for hour in range(window_hours)
+            ],
+            "top_hours": [
+                {"hour": int(hour), "items": int(volume_by_hour_of_day[hour])}
+                for hour in top_hours
+                if volume_by_hour_of_day[hour] > 0
+            ],
+        }
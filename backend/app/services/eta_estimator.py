@@ -0,0 +1,175 @@
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from app.models.db_models import OrderEvent
+from app.models.menu import MenuCatalog
+from app.models.order_status import OrderStatus
+
+class _Fit:
+    """Exponentially weighted least squares for ``y = a + b * x``; every sample is O(1)"""
+    __slots__ = ("weight", "sx", "sy", "sxx", "sxy")
+
+    def __init__(self):
+        self.weight = self.sx = self.sy = self.sxx = self.sxy = 0.0
+
+    def add(self, x: float, y: float, decay: float) -> None:
+        self.weight = self.weight * decay + 1.0
+        self.sx = self.sx * decay + x
+        self.sy = self.sy * decay + y
+        self.sxx = self.sxx * decay + x * x
+        self.sxy = self.sxy * decay + x * y
+
+@dataclass
+class _OpenOrder:
+    placed_at: float
+    quantities: array
+    # Units of each item in not-ready orders when this order's units joined, its own included
+    ahead: array
+
+class EtaEstimator:
+    """Wait-time estimates from streaming OrderStore events.
+
+    The time from placed to ready of an order is modelled as the slowest
+    of its items, each taking ``prep[item] + per_unit[item] * ahead``
+    seconds, where ``ahead`` is how many units of that item were in
+    not-ready orders when the order was placed (active load). Both
+    coefficients are refit for the slowest item whenever an order becomes
+    ready, by least squares with exponentially decaying weights
+    (``smoothing`` per sample), starting from the menu's ``prep_seconds``
+    and ``seconds_per_unit``. Load is kept in step with every placed,
+    modified, ready, completed and canceled event; nothing is recomputed
+    from history.
+
+    Listener methods take the event's timestamp; ``estimate`` takes an
+    optional ``now`` so it can run on a virtual clock
+    (see benchmarks/eta_simulation.py).
+    """
+
+    def __init__(self, menu: MenuCatalog, smoothing: float = 0.05, seconds_per_unit: float = 10.0, min_samples: int = 5):
+        self.menu = menu
+        self.decay = 1.0 - smoothing
+        self.min_samples = min_samples
+        self._fits = [_Fit() for _ in range(len(menu))]
+        self._prep = array("d", (item.prep_seconds for item in menu))
+        self._per_unit = array("d", [seconds_per_unit] * len(menu))
+        self._load = menu.zeros()
+        self._open: Dict[int, _OpenOrder] = {}
+        self._lock = threading.Lock()
+        self.samples = 0
+
+    # ---------- OrderStore events ----------
+
+    def on_event(self, event: OrderEvent) -> None:
+        if event.type == OrderStatus.PLACED.value:
+            self.place(event.order_id, event.quantities, event.timestamp)
+        elif event.type == "modified":
+            self.modify(event.order_id, event.quantities)
+        elif event.type == OrderStatus.READY.value:
+            self.ready(event.order_id, event.timestamp)
+        elif event.type in (OrderStatus.CANCELED.value, OrderStatus.COMPLETED.value):
+            self.close(event.order_id)
+
+    def place(self, order_id: int, quantities: array, now: float) -> None:
+        with self._lock:
+            load = self._load
+            ahead = self.menu.zeros()
+            for item_id, quantity in enumerate(quantities):
+                if quantity:
+                    load[item_id] += quantity
+                    ahead[item_id] = load[item_id]
+            self._open[order_id] = _OpenOrder(now, array("i", quantities), ahead)
+
+    def modify(self, order_id: int, quantities: array) -> None:
+        with self._lock:
+            order = self._open.get(order_id)
+            if order is None:
+                return
+            load = self._load
+            for item_id, quantity in enumerate(quantities):
+                delta = quantity - order.quantities[item_id]
+                if not delta:
+                    continue
+                load[item_id] += delta
+                if not quantity:
+                    order.ahead[item_id] = 0
+                elif order.ahead[item_id]:
+                    # Added units keep the order's place in line, like the kitchen queue
+                    order.ahead[item_id] += delta
+                else:
+                    order.ahead[item_id] = load[item_id]
+            order.quantities = array("i", quantities)
+
+    def ready(self, order_id: int, now: float) -> None:
+        """Learn from the order's actual wait, then take it out of the load"""
+        with self._lock:
+            order = self._release(order_id)
+            if order is None:
+                return
+            item_id = self._slowest(order)
+            if item_id is None:
+                return
+            fit = self._fits[item_id]
+            fit.add(order.ahead[item_id], now - order.placed_at, self.decay)
+            self.samples += 1
+            if fit.weight >= self.min_samples:
+                self._refit(item_id, fit)
+
+    def close(self, order_id: int) -> None:
+        with self._lock:
+            self._release(order_id)
+
+    # ---------- Estimates ----------
+
+    def estimate(self, order_id: int, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until ``order_id`` should be ready; None once it is (or for unknown orders)"""
+        order = self._open.get(order_id)
+        if order is None:
+            return None
+        with self._lock:
+            item_id = self._slowest(order)
+            if item_id is None:
+                return None
+            total = self._prep[item_id] + self._per_unit[item_id] * order.ahead[item_id]
+        elapsed = (time.time() if now is None else now) - order.placed_at
+        return max(0.0, total - elapsed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open_orders": len(self._open),
+                "load": self.menu.to_dict(self._load),
+                "prep_seconds": {item.key: round(self._prep[item.id], 1) for item in self.menu},
+                "seconds_per_unit": {item.key: round(self._per_unit[item.id], 2) for item in self.menu},
+                "samples": self.samples,
+            }
+
+    # ---------- Internals (caller holds self._lock) ----------
+
+    def _release(self, order_id: int) -> Optional[_OpenOrder]:
+        order = self._open.pop(order_id, None)
+        if order is not None:
+            load = self._load
+            for item_id, quantity in enumerate(order.quantities):
+                if quantity:
+                    load[item_id] -= quantity
+        return order
+
+    def _slowest(self, order: _OpenOrder) -> Optional[int]:
+        slowest, longest = None, -1.0
+        prep, per_unit, ahead = self._prep, self._per_unit, order.ahead
+        for item_id, quantity in enumerate(order.quantities):
+            if quantity:
+                seconds = prep[item_id] + per_unit[item_id] * ahead[item_id]
+                if seconds > longest:
+                    slowest, longest = item_id, seconds
+        return slowest
+
+    def _refit(self, item_id: int, fit: _Fit) -> None:
+        mean_x, mean_y = fit.sx / fit.weight, fit.sy / fit.weight
+        variance = fit.sxx / fit.weight - mean_x * mean_x
+        if variance > 1e-9:
+            self._per_unit[item_id] = max(0.0, (fit.sxy / fit.weight - mean_x * mean_y) / variance)
+        # Without spread in load only the intercept can be learned
+        self._prep[item_id] = max(0.0, mean_y - self._per_unit[item_id] * mean_x)
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+from app.core import deadline
+from app.utils.exception_utils import DeadlineExceededError, IdempotencyKeyConflictError
+
+class _Entry:
+    __slots__ = ("fingerprint", "done", "result", "error", "expires_at")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.expires_at: float = float("inf")
+
+class IdempotencyCache:
+    """Bounded, TTL-evicted table of results keyed by client idempotency key.
+
+    The first request for a key executes; retries get the stored result,
+    and retries that arrive while the first attempt is still running wait
+    for it instead of executing again, for at most ``max_wait_seconds`` or
+    what is left of the request deadline.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_wait_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(
+        self, key: str, fingerprint: str, fn: Callable[[], Any], keep: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, bool]:
+        """Return ``(result, replayed)`` for ``key``, executing ``fn`` at most once.
+
+        A result ``keep`` rejects (e.g. a transient failure) is handed to the
+        requests already waiting for it but not stored, so a later retry
+        executes again.
+        """
+        with self._lock:
+            self._evict(time.monotonic())
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(fingerprint)
+                self._entries[key] = entry
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyConflictError(key)
+            if not entry.done.wait(deadline.budget(self.max_wait_seconds)):
+                raise DeadlineExceededError("waiting for the first attempt with this Idempotency-Key")
+            if entry.error is not None:
+                raise entry.error
+            return entry.result, True
+
+        try:
+            entry.result = fn()
+            if keep is not None and not keep(entry.result):
+                self._discard(key, entry)
+        except BaseException as e:
+            # Failed attempts are not cached; waiters see the same error and may retry
+            entry.error = e
+            self._discard(key, entry)
+            raise
+        finally:
+            entry.expires_at = time.monotonic() + self.ttl_seconds
+            entry.done.set()
+        return entry.result, False
+
+    def _discard(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self, now: float) -> None:
+        # Caller must hold self._lock. Entries are ordered by creation, so
+        # expired ones are found at the front. In-flight entries never expire
+        # and are skipped, so a slow request does not hold up the size bound.
+        evicted: List[str] = []
+        over = len(self._entries) - self.max_entries
+        for key, entry in self._entries.items():
+            if not entry.done.is_set():
+                continue
+            if entry.expires_at <= now or over > len(evicted):
+                evicted.append(key)
+            else:
+                break
+        for key in evicted:
+            del self._entries[key]
@@ -0,0 +1,372 @@
+import bisect
+import itertools
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from app.models.db_models import OrderEvent, OrderStore
+from app.models.menu import MenuCatalog
+from app.models.order_status import OrderStatus
+from app.utils.exception_utils import OrderNotFoundError, InvalidStatusTransitionError
+
+@dataclass(frozen=True)
+class Station:
+    name: str
+    capacity: int  # units per cooking cycle (patties on the grill, portions in a basket)
+    lanes: int = 1  # cycles that can run side by side
+
+DEFAULT_STATIONS = (
+    Station("grill", capacity=8),
+    Station("fryer", capacity=4, lanes=2),
+    Station("drinks", capacity=4),
+)
+
+SCHEDULERS = ("batch", "fifo")
+
+@dataclass
+class Ticket:
+    order_id: int
+    item_id: int
+    quantity: int
+    enqueued_at: float
+    seq: int
+
+@dataclass
+class Batch:
+    id: int
+    station: str
+    item_id: int
+    portions: List[Tuple[int, int]]  # (order_id, quantity)
+    started_at: float
+    ready_at: float
+
+    @property
+    def quantity(self) -> int:
+        return sum(quantity for _, quantity in self.portions)
+
+@dataclass
+class _KitchenOrder:
+    placed_at: float
+    quantities: array
+    queued: array
+    cooking: array
+    ready: array
+    ready_at: Optional[float] = None
+
+    @property
+    def pending(self) -> int:
+        return sum(self.queued) + sum(self.cooking)
+
+class KitchenService:
+    """Per-station production queues fed by OrderStore events.
+
+    Every order item becomes a ticket on its station's queue, ordered by the
+    age of the order. Starting a batch takes the oldest ticket and, with the
+    "batch" scheduler, fills the rest of the cooking cycle with the same item
+    from other orders enqueued within ``batch_window`` seconds of it. The
+    "fifo" scheduler cooks one ticket per cycle. Units move queued -> cooking
+    -> ready; an order is ready once nothing of it is queued or cooking.
+
+    With an ``order_store``, kitchen progress drives the order lifecycle:
+    starting a cycle moves its orders to in_progress, finishing the last one
+    to ready, and hand-off to completed. Store events arrive under the store
+    lock, so an order that a modification leaves ready is only moved to
+    ready by the next kitchen call made outside it.
+
+    All methods take an optional ``now`` so the queue can run on a virtual
+    clock (see benchmarks/kitchen_simulation.py).
+    """
+
+    def __init__(
+        self,
+        menu: MenuCatalog,
+        stations=DEFAULT_STATIONS,
+        scheduler: str = "batch",
+        batch_window: float = 120.0,
+        order_store: Optional[OrderStore] = None
+    ):
+        if scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown kitchen scheduler: {scheduler}")
+        self.menu = menu
+        self.scheduler = scheduler
+        self.batch_window = batch_window
+        self.order_store = order_store
+        self.stations: Dict[str, Station] = {station.name: station for station in stations}
+        for item in menu:
+            # Items on a station nobody configured still get a single default lane
+            self.stations.setdefault(item.station, Station(item.station, capacity=4))
+
+        self._lock = threading.Lock()
+        self._queues: Dict[str, List[Ticket]] = {name: [] for name in self.stations}
+        self._cooking: Dict[int, Batch] = {}
+        self._orders: Dict[int, _KitchenOrder] = {}
+        # Orders made ready by a store event, not yet moved to ready in the store
+        self._pending_ready: List[int] = []
+        self._batch_ids = itertools.count(1)
+        self._seq = itertools.count()
+
+    # ---------- OrderStore events ----------
+
+    def on_event(self, event: OrderEvent) -> None:
+        if event.type == OrderStatus.PLACED.value:
+            self.enqueue(event.order_id, event.quantities, event.timestamp)
+        elif event.type == "modified":
+            self.modify(event.order_id, event.quantities, event.timestamp)
+        elif event.type in (OrderStatus.CANCELED.value, OrderStatus.COMPLETED.value):
+            self.cancel(event.order_id)
+
+    def enqueue(self, order_id: int, quantities: array, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            order = _KitchenOrder(now, array("i", quantities), self.menu.zeros(), self.menu.zeros(), self.menu.zeros())
+            self._orders[order_id] = order
+            for item_id, quantity in enumerate(quantities):
+                if quantity > 0:
+                    self._push(order_id, item_id, quantity, order)
+
+    def modify(self, order_id: int, quantities: array, now: Optional[float] = None) -> None:
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                return
+            for item_id, quantity in enumerate(quantities):
+                delta = quantity - order.quantities[item_id]
+                if delta > 0:
+                    # Added items keep the order's place in line
+                    self._push(order_id, item_id, delta, order)
+                elif delta < 0:
+                    self._pull(order_id, item_id, -delta, order)
+            order.quantities = array("i", quantities)
+            if self._check_ready(order, time.time() if now is None else now):
+                self._pending_ready.append(order_id)
+
+    def cancel(self, order_id: int) -> None:
+        with self._lock:
+            order = self._orders.pop(order_id, None)
+            if order is None:
+                return
+            for item_id, quantity in enumerate(order.queued):
+                if quantity > 0:
+                    self._pull(order_id, item_id, quantity, order)
+            # Batches already on the grill finish; their portions for this order are wasted
+
+    # ---------- Scheduling ----------
+
+    def start_batch(self, station: str, now: Optional[float] = None) -> Optional[Batch]:
+        """Start the next cooking cycle on ``station``; None if it is idle or all lanes are busy"""
+        now = time.time() if now is None else now
+        self._flush_ready()
+        with self._lock:
+            batch = self._start(self._station(station), now)
+        if batch is not None:
+            self._advance([order_id for order_id, _ in batch.portions], OrderStatus.IN_PROGRESS)
+        return batch
+
+    def schedule(self, now: Optional[float] = None) -> List[Batch]:
+        """Start cycles on every free lane that has work"""
+        now = time.time() if now is None else now
+        self._flush_ready()
+        started = []
+        with self._lock:
+            for station in self.stations.values():
+                while (batch := self._start(station, now)) is not None:
+                    started.append(batch)
+        for batch in started:
+            self._advance([order_id for order_id, _ in batch.portions], OrderStatus.IN_PROGRESS)
+        return started
+
+    def complete_batch(self, batch_id: int, now: Optional[float] = None) -> List[int]:
+        """Mark a cycle done; returns the orders that became ready"""
+        now = time.time() if now is None else now
+        self._flush_ready()
+        with self._lock:
+            batch = self._cooking.pop(batch_id, None)
+            if batch is None:
+                raise ValueError(f"Batch {batch_id} is not cooking")
+            ready = []
+            for order_id, quantity in batch.portions:
+                order = self._orders.get(order_id)
+                if order is None:
+                    continue
+                order.cooking[batch.item_id] -= quantity
+                order.ready[batch.item_id] += quantity
+                if self._check_ready(order, now):
+                    ready.append(order_id)
+        self._advance(ready, OrderStatus.READY)
+        return ready
+
+    def hand_off(self, order_id: int) -> None:
+        """Hand a ready order over; raises InvalidStatusTransitionError if the store cannot complete it"""
+        self._flush_ready()
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None or order.ready_at is None:
+                raise OrderNotFoundError(order_id)
+        # Completed in the store first: a failed transition leaves the order on the board.
+        # The completed event removes it from the kitchen through on_event
+        if self.order_store is not None:
+            self.order_store.transition(order_id, OrderStatus.COMPLETED)
+        with self._lock:
+            self._orders.pop(order_id, None)
+
+    # ---------- Views ----------
+
+    def get_board(self) -> Dict[str, Any]:
+        self._flush_ready()
+        with self._lock:
+            stations = {}
+            for name, station in self.stations.items():
+                stations[name] = {
+                    "capacity": station.capacity,
+                    "lanes": station.lanes,
+                    "queued": [self._ticket_view(ticket) for ticket in self._queues[name]],
+                    "cooking": [
+                        self.describe_batch(batch) for batch in self._cooking.values() if batch.station == name
+                    ],
+                }
+            ready = sorted(
+                (order_id for order_id, order in self._orders.items() if order.ready_at is not None),
+                key=lambda order_id: self._orders[order_id].ready_at
+            )
+            return {"scheduler": self.scheduler, "stations": stations, "ready_orders": ready}
+
+    def get_order_status(self, order_id: int) -> Dict[str, Any]:
+        self._flush_ready()
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                raise OrderNotFoundError(order_id)
+            return {
+                "order_id": order_id,
+                "state": "ready" if order.ready_at is not None else "cooking" if sum(order.cooking) else "queued",
+                "queued": self.menu.to_dict(order.queued),
+                "cooking": self.menu.to_dict(order.cooking),
+                "ready": self.menu.to_dict(order.ready),
+                "placed_at": order.placed_at,
+                "ready_at": order.ready_at,
+            }
+
+    def describe_batch(self, batch: Batch) -> Dict[str, Any]:
+        return {
+            "batch_id": batch.id,
+            "item": self.menu[batch.item_id].key,
+            "quantity": batch.quantity,
+            "orders": [{"order_id": order_id, "quantity": quantity} for order_id, quantity in batch.portions],
+            "started_at": batch.started_at,
+            "ready_at": batch.ready_at,
+            "state": "cooking",
+        }
+
+    def _flush_ready(self) -> None:
+        # Called without self._lock or the store lock held
+        if not self._pending_ready:
+            return
+        with self._lock:
+            ready, self._pending_ready = self._pending_ready, []
+        self._advance(ready, OrderStatus.READY)
+
+    def _advance(self, order_ids: List[int], status: OrderStatus) -> None:
+        # Called without self._lock held: the store emits events back into on_event
+        if self.order_store is None:
+            return
+        for order_id in order_ids:
+            try:
+                self.order_store.transition(order_id, status)
+            except InvalidStatusTransitionError:
+                order_info = self.order_store.get_order(order_id)
+                if status == OrderStatus.READY and order_info is not None and order_info.status == OrderStatus.PLACED:
+                    # Ready before its cooking start reached the store; pass through it
+                    self._advance([order_id], OrderStatus.IN_PROGRESS)
+                    self._advance([order_id], OrderStatus.READY)
+                # Otherwise already further along (e.g. the second cycle of an in-progress order)
+            except OrderNotFoundError:
+                pass
+
+    # ---------- Internals (caller holds self._lock) ----------
+
+    def _station(self, name: str) -> Station:
+        station = self.stations.get(name)
+        if station is None:
+            raise ValueError(f"Unknown station: {name}")
+        return station
+
+    def _push(self, order_id: int, item_id: int, quantity: int, order: _KitchenOrder) -> None:
+        ticket = Ticket(order_id, item_id, quantity, order.placed_at, next(self._seq))
+        queue = self._queues[self.menu[item_id].station]
+        bisect.insort(queue, ticket, key=lambda t: (t.enqueued_at, t.seq))
+        order.queued[item_id] += quantity
+        order.ready_at = None
+
+    def _pull(self, order_id: int, item_id: int, quantity: int, order: _KitchenOrder) -> None:
+        # Take back queued units, newest tickets first; cooking/ready units stay put
+        queue = self._queues[self.menu[item_id].station]
+        for index in range(len(queue) - 1, -1, -1):
+            if quantity == 0:
+                break
+            ticket = queue[index]
+            if ticket.order_id != order_id or ticket.item_id != item_id:
+                continue
+            taken = min(quantity, ticket.quantity)
+            ticket.quantity -= taken
+            order.queued[item_id] -= taken
+            quantity -= taken
+            if ticket.quantity == 0:
+                del queue[index]
+
+    def _start(self, station: Station, now: float) -> Optional[Batch]:
+        queue = self._queues[station.name]
+        if not queue:
+            return None
+        busy = sum(1 for batch in self._cooking.values() if batch.station == station.name)
+        if busy >= station.lanes:
+            return None
+
+        head = queue[0]
+        if self.scheduler == "fifo":
+            candidates = [0]
+        else:
+            window_end = head.enqueued_at + self.batch_window
+            candidates = [
+                index for index, ticket in enumerate(queue)
+                if ticket.item_id == head.item_id and ticket.enqueued_at <= window_end
+            ]
+
+        free = station.capacity
+        portions: Dict[int, int] = {}
+        emptied = []
+        for index in candidates:
+            if free == 0:
+                break
+            ticket = queue[index]
+            taken = min(free, ticket.quantity)
+            ticket.quantity -= taken
+            free -= taken
+            portions[ticket.order_id] = portions.get(ticket.order_id, 0) + taken
+            order = self._orders[ticket.order_id]
+            order.queued[ticket.item_id] -= taken
+            order.cooking[ticket.item_id] += taken
+            if ticket.quantity == 0:
+                emptied.append(index)
+        for index in reversed(emptied):
+            del queue[index]
+
+        prep_seconds = self.menu[head.item_id].prep_seconds
+        batch = Batch(next(self._batch_ids), station.name, head.item_id, list(portions.items()), now, now + prep_seconds)
+        self._cooking[batch.id] = batch
+        return batch
+
+    def _check_ready(self, order: _KitchenOrder, now: float) -> bool:
+        if order.ready_at is None and order.pending == 0 and sum(order.ready) > 0:
+            order.ready_at = now
+            return True
+        return False
+
+    def _ticket_view(self, ticket: Ticket) -> Dict[str, Any]:
+        return {
+            "order_id": ticket.order_id,
+            "item": self.menu[ticket.item_id].key,
+            "quantity": ticket.quantity,
+            "enqueued_at": ticket.enqueued_at,
+            "state": "queued",
+        }
@@ -0,0 +1,233 @@
+import os
+import re
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from app.core.config import Config
+from app.models.db_models import OrderSnapshot, OrderStore
+from app.models.change_feed import OrderEvent
+from app.models.menu import MenuCatalog, MENU
+from app.models.order_archive import OrderArchive
+from app.models.order_columns import OrderColumns
+from app.models.shared_snapshot import SharedSnapshot
+from app.models.order_status import OrderStatus, TERMINAL_STATUSES
+from app.services.ai_service import AIService
+from app.services.analytics_service import AnalyticsService
+from app.services.eta_estimator import EtaEstimator
+from app.services.kitchen_service import KitchenService
+from app.services.order_service import OrderService
+from app.utils.exception_utils import LocationNotFoundError
+
+LOCATION_ID = re.compile(r"[A-Za-z0-9_-]{1,32}")
+
+@dataclass
+class Location:
+    """One restaurant: its own store (lock, order IDs, totals, indexes) and the services fed by it"""
+    id: str
+    order_store: OrderStore
+    order_service: OrderService
+    kitchen_service: Optional[KitchenService] = None
+    analytics_service: Optional[AnalyticsService] = None
+    # Set with SHARED_SNAPSHOT_DIR: this location's orders as published by the worker that writes them
+    shared: Optional[SharedSnapshot] = None
+
+    @classmethod
+    def create(cls, location_id: str, ai_service: AIService, menu: MenuCatalog = MENU) -> "Location":
+        """A location wired as configured: columns, archive file, kitchen queue and wait-time estimates"""
+        columns = OrderColumns(len(menu))
+        archive = OrderArchive(_archive_path(location_id), menu) if Config.ORDER_ARCHIVE_FILE else None
+        order_store = OrderStore(menu, columns=columns, archive=archive)
+        eta_estimator = EtaEstimator(menu, Config.ETA_SMOOTHING, Config.ETA_SECONDS_PER_UNIT)
+        kitchen_service = KitchenService(
+            menu,
+            scheduler=Config.KITCHEN_SCHEDULER,
+            batch_window=Config.KITCHEN_BATCH_WINDOW_SECONDS,
+            order_store=order_store
+        )
+        order_store.add_listener(kitchen_service.on_event)
+        order_store.add_listener(eta_estimator.on_event)
+        shared = None
+        if Config.SHARED_SNAPSHOT_DIR:
+            shared = SharedSnapshot(
+                os.path.join(Config.SHARED_SNAPSHOT_DIR, f"{location_id}.snap"), order_store, Config.SHARED_SNAPSHOT_BYTES
+            )
+            order_store.add_listener(shared.on_event)
+        return cls(
+            id=location_id,
+            order_store=order_store,
+            order_service=OrderService(order_store, ai_service, eta_estimator),
+            kitchen_service=kitchen_service,
+            analytics_service=AnalyticsService(columns, menu),
+            shared=shared,
+        )
+
+    def get_snapshot(self) -> OrderSnapshot:
+        """Active orders and totals: the writing worker's when this worker has not changed the location itself"""
+        if self.shared is not None:
+            snapshot = self.shared.get_snapshot()
+            if snapshot is not None:
+                return snapshot
+        return self.order_store.get_snapshot()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """``OrderService.get_stats``, with the store counts taken from the same place as ``get_snapshot``"""
+        stats = self.order_service.get_stats()
+        if self.shared is not None:
+            shared_stats = self.shared.get_stats()
+            if shared_stats is not None:
+                stats.update(shared_stats)
+            stats["shared_snapshot"] = self.shared.role
+        return stats
+
+def _archive_path(location_id: str) -> str:
+    # The default location keeps ORDER_ARCHIVE_FILE itself, so single-location archives stay where they were
+    if location_id == Config.DEFAULT_LOCATION:
+        return Config.ORDER_ARCHIVE_FILE
+    root, ext = os.path.splitext(Config.ORDER_ARCHIVE_FILE)
+    return f"{root}.{location_id}{ext}"
+
+class _LocationCounters:
+    """Running totals of one location, written only from its store's listener"""
+    __slots__ = ("lock", "totals", "by_status", "active")
+
+    def __init__(self, menu: MenuCatalog):
+        # Taken by the writer (already under the store lock) and by HQ readers, never by other locations
+        self.lock = threading.Lock()
+        self.totals = menu.zeros()
+        self.by_status: Dict[str, int] = {status.value: 0 for status in OrderStatus}
+        # Active order ID -> (status, quantities), for the deltas of later events
+        self.active: Dict[int, Tuple[str, array]] = {}
+
+class LocationAggregate:
+    """Cross-location totals for HQ dashboards, updated with every store event.
+
+    Each location's counters are updated by its store listener, which
+    already runs under that store's lock, plus a per-location lock shared
+    only with readers; locations never wait on each other. ``get_view``
+    adds up the counters, O(locations x menu items), without scanning orders.
+    Terminal statuses count orders since startup, active ones are current.
+    """
+
+    def __init__(self, menu: MenuCatalog):
+        self.menu = menu
+        self._counters: Dict[str, _LocationCounters] = {}
+
+    def attach(self, location_id: str, order_store: OrderStore) -> None:
+        counters = self._counters[location_id] = _LocationCounters(self.menu)
+        order_store.add_listener(lambda event: self._apply(counters, event))
+
+    def get_view(self) -> Dict[str, Any]:
+        totals = self.menu.zeros()
+        by_status = {status.value: 0 for status in OrderStatus}
+        per_location = {}
+        for location_id, counters in list(self._counters.items()):
+            with counters.lock:
+                location_totals = array("i", counters.totals)
+                location_by_status = dict(counters.by_status)
+                active_orders = len(counters.active)
+            for item_id, quantity in enumerate(location_totals):
+                totals[item_id] += quantity
+            for status, count in location_by_status.items():
+                by_status[status] += count
+            per_location[location_id] = {
+                "active_orders": active_orders,
+                "totals": self.menu.to_dict(location_totals),
+                "by_status": location_by_status,
+            }
+        return {
+            "locations": len(per_location),
+            "active_orders": sum(location["active_orders"] for location in per_location.values()),
+            "totals": self.menu.to_dict(totals),
+            "by_status": by_status,
+            "per_location": per_location,
+        }
+
+    def _apply(self, counters: _LocationCounters, event: OrderEvent) -> None:
+        with counters.lock:
+            totals = counters.totals
+            if event.type == OrderStatus.PLACED.value:
+                counters.active[event.order_id] = (event.type, event.quantities)
+                counters.by_status[event.type] += 1
+                for item_id, quantity in enumerate(event.quantities):
+                    totals[item_id] += quantity
+                return
+            previous = counters.active.get(event.order_id)
+            if previous is None:
+                return
+            status, quantities = previous
+            if event.type == "modified":
+                for item_id, quantity in enumerate(event.quantities):
+                    totals[item_id] += quantity - quantities[item_id]
+                counters.active[event.order_id] = (status, event.quantities)
+                return
+            counters.by_status[status] -= 1
+            counters.by_status[event.type] += 1
+            if OrderStatus(event.type) in TERMINAL_STATUSES:
+                del counters.active[event.order_id]
+                for item_id, quantity in enumerate(quantities):
+                    totals[item_id] -= quantity
+            else:
+                counters.active[event.order_id] = (event.type, quantities)
+
+class LocationRegistry:
+    """Locations by ID, created on first use.
+
+    Lookups of existing locations take no lock: the mapping is replaced,
+    never mutated. Only creating a location is serialized.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Location],
+        menu: MenuCatalog = MENU,
+        default_id: str = Config.DEFAULT_LOCATION,
+        allowed: Optional[List[str]] = None,
+        max_locations: int = Config.MAX_LOCATIONS
+    ):
+        self.factory = factory
+        self.default_id = default_id
+        # Empty: any well-formed ID, up to max_locations
+        self.allowed = set(Config.LOCATIONS if allowed is None else allowed)
+        self.max_locations = max_locations
+        self.aggregate = LocationAggregate(menu)
+        self._locations: Dict[str, Location] = {}
+        self._lock = threading.Lock()
+        self.default = self.get(default_id)
+
+    def get(self, location_id: str) -> Location:
+        location = self._locations.get(location_id)
+        return location if location is not None else self._create(location_id)
+
+    def __iter__(self) -> Iterator[Location]:
+        return iter(list(self._locations.values()))
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def sweep(self) -> int:
+        """``OrderStore.sweep`` on every location; total evicted"""
+        return sum(location.order_store.sweep() for location in self)
+
+    def close(self) -> None:
+        """Close every location's archive file and shared snapshot"""
+        for location in self:
+            if location.order_store.archive is not None:
+                location.order_store.archive.close()
+            if location.shared is not None:
+                location.shared.close()
+
+    def _create(self, location_id: str) -> Location:
+        if not LOCATION_ID.fullmatch(location_id) or (
+            self.allowed and location_id not in self.allowed and location_id != self.default_id
+        ):
+            raise LocationNotFoundError(location_id)
+        with self._lock:
+            location = self._locations.get(location_id)
+            if location is None:
+                if len(self._locations) >= self.max_locations:
+                    raise LocationNotFoundError(location_id)
+                location = self.factory(location_id)
+                self.aggregate.attach(location_id, location.order_store)
+                self._locations = {**self._locations, location_id: location}
+        return location
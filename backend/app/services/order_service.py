@@ -1,217 +1,510 @@
 import logging
-from typing import Dict, Any
+from array import array
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Union
+from pydantic import ValidationError
+from app.core.config import Config
 from app.services.ai_service import AIService
-from app.models.db_models import OrderStore
-from app.schemas.schemas import OrderRequest, OrderResponse, OrderItems, ActionType
+from app.services.eta_estimator import EtaEstimator
+from app.services.idempotency import IdempotencyCache
+from app.services.preview_cache import PreviewCache
+from app.services.session_service import SessionService
+from app.models.db_models import OrderStore, OrderInfo, OrderSnapshot
+from app.models.change_feed import ChangeFeedGap
+from app.models.order_status import OrderStatus, ACTIVE_STATUSES, MODIFIABLE_STATUSES
+from app.schemas.schemas import (
+    OrderRequest, OrderResponse, ActionResult, OrderItems, ActionType, ModifyOrderRequest, CommitRequest,
+    BulkOrderRequest, BulkCancelRequest, BulkItemResult, BulkResponse, OrderDetails, OrderEventOut, OrderEventsResponse,
+    PlaceOrder, ModifyOrder, CancelOrder, IntentCommand, parse_intent_command
+)
+from app.core.deadline import deadline_scope
+from app.utils.exception_utils import OrderNotFoundError, DeadlineExceededError
 
 logger = logging.getLogger(__name__)
 
+class Outcome(NamedTuple):
+    """One action's result; becomes the response itself, or one of its ``results``"""
+    success: bool
+    action: ActionType
+    order_id: Optional[int] = None
+    items: Optional[Dict[str, int]] = None
+    message: Optional[str] = None
+
 class OrderService:
-    def __init__(self, order_store: OrderStore, ai_service: AIService):
+    def __init__(self, order_store: OrderStore, ai_service: AIService, eta_estimator: Optional[EtaEstimator] = None):
         self.order_store = order_store
         self.ai_service = ai_service
+        # Fed by the store's events (see main.py); adds eta_seconds to placed/modified orders
+        self.eta_estimator = eta_estimator
+        self.menu = order_store.menu
+        self.idempotency = IdempotencyCache(
+            Config.IDEMPOTENCY_MAX_ENTRIES, Config.IDEMPOTENCY_TTL_SECONDS, Config.DEFAULT_REQUEST_TIMEOUT
+        )
+        self.previews = PreviewCache(Config.PREVIEW_MAX_ENTRIES, Config.PREVIEW_TTL_SECONDS)
+        self.sessions = SessionService(
+            self.menu, Config.SESSION_MAX_ENTRIES, Config.SESSION_TTL_SECONDS, Config.SESSION_LOCAL_RESOLUTION
+        )
+    
+    def process_order_request(
+        self, request: OrderRequest, idempotency_key: Optional[str] = None, deadline_at: Optional[float] = None
+    ) -> OrderResponse:
+        """``deadline_at`` (``time.monotonic()``) bounds provider calls; past it DeadlineExceededError is raised"""
+        if deadline_at is not None:
+            with deadline_scope(deadline_at):
+                return self.process_order_request(request, idempotency_key)
+        if idempotency_key:
+            # Provider and parse failures are not kept: a retry with the key calls the provider again
+            (response, _), replayed = self.idempotency.run(
+                idempotency_key,
+                f"{request.mode}:{request.session_id}:{request.message}",
+                lambda: self._process_order_request(request),
+                keep=lambda outcome: not outcome[1]
+            )
+            if replayed:
+                logger.info("Replayed idempotent request %s", idempotency_key)
+            return response
+        return self._process_order_request(request)[0]
     
-    def process_order_request(self, request: OrderRequest) -> OrderResponse:
+    def _process_order_request(self, request: OrderRequest) -> Tuple[OrderResponse, bool]:
+        """The response, and whether it is a failure worth retrying (nothing was applied)"""
         try:
-            logger.info(f"Processing order request: {request.message}")
+            logger.debug("Processing order request: %r", request.message)
             
-            parsed_intent = self.ai_service.parse_user_intent(request.message)
+            # Follow-ups about the lane's last order skip the provider entirely
+            state = self.sessions.get(request.session_id)
+            parsed_intent = self.sessions.resolve(request.message, state)
+            if parsed_intent is None:
+                parsed_intent = self.ai_service.parse_user_intent(
+                    self.sessions.contextualize(request.message, state)
+                )
             
             if not parsed_intent.get("success", False):
-                logger.warning(f"Failed to parse intent: {parsed_intent}")
+                logger.warning("Failed to parse intent: %s", parsed_intent.get("error"))
                 return self._create_error_response(
                     "Could not understand your request. Please specify items to order or order number to cancel."
-                )
+                ), True
+            
+            if request.mode == "preview":
+                return self.preview_action(parsed_intent), False
             
             # Execute the parsed action
             result = self.execute_action(parsed_intent)
-            logger.info(f"Order processed successfully: {result.action}")
-            return result
+            self._record(request.session_id, result)
+            logger.info("Order processed successfully: %s", result.action.value)
+            return result, False
             
+        except DeadlineExceededError:
+            raise
         except Exception as e:
-            logger.error(f"Error processing order request: {str(e)}")
+            logger.error("Error processing order request: %s", e)
             return self._create_error_response(
                 "An error occurred while processing your request. Please try again."
-            )
+            ), True
         
-    def execute_action(self, parsed_intent: Dict[str, Any]) -> OrderResponse:
-        action = parsed_intent.get("action")
-        data = parsed_intent.get("data", {})
+    def preview_action(self, parsed_intent: Dict[str, Any]) -> OrderResponse:
+        """Describe what the parsed intent would do and hold it for commit_preview"""
+        if "actions" in parsed_intent:
+            commands = [self._parse_command(intent) for intent in parsed_intent["actions"]]
+            results = [
+                command if isinstance(command, Outcome) else self._preview(command) for command in commands
+            ]
+            # All or nothing: a token is only handed out when every request can be applied
+            if not all(result.success for result in results):
+                return self._combined_response(results, success=False, action=ActionType.ERROR)
+            return self._combined_response(results, action=ActionType.PREVIEW, preview_token=self.previews.put(commands))
         
-        if action == "place_order":
-            return self.place_order(data)
-        elif action == "modify_order":
-            return self.modify_order(data)
-        elif action == "cancel_order":
-            return self.cancel_order(data.get("order_id"))
+        command = self._parse_command(parsed_intent)
+        if isinstance(command, Outcome):
+            return self._respond(command)
+        result = self._preview(command)
+        if not result.success:
+            return self._respond(result)
+        # The typed command is held, so commit skips normalization too
+        return self._respond(result, preview_token=self.previews.put(command))
+    
+    def commit_preview(self, request: CommitRequest) -> OrderResponse:
+        """Apply a previewed intent without calling the AI provider again"""
+        command = self.previews.pop(request.token)
+        if command is None:
+            return self._create_error_response("Preview expired or already committed. Please order again.")
+        # Modifications apply to the order as it is now, not as it was at preview time
+        if isinstance(command, list):
+            result = self._execute_commands(command)
         else:
-            logger.warning(f"Unknown action: {action}")
-            return self._create_error_response("Unknown action requested")
+            result = self.execute_command(command)
+        self._record(request.session_id, result)
+        return result
+    
+    def execute_action(self, parsed_intent: Dict[str, Any]) -> OrderResponse:
+        """Apply a provider result; several requests in one message get one combined response"""
+        if "actions" in parsed_intent:
+            return self._execute_commands([self._parse_command(intent) for intent in parsed_intent["actions"]])
+        command = self._parse_command(parsed_intent)
+        if isinstance(command, Outcome):
+            return self._respond(command)
+        return self.execute_command(command)
+    
+    def execute_command(self, command: IntentCommand) -> OrderResponse:
+        return self._respond(self._apply(self.order_store, command))
+    
+    def place_order(self, command: PlaceOrder) -> OrderResponse:
+        return self.execute_command(command)
+    
+    def place_structured_order(self, order_items: OrderItems) -> OrderResponse:
+        """Place an already-validated order without going through the AI provider"""
+        return self._respond(self._place(self.order_store, order_items.to_vector()))
+    
+    def modify_structured_order(self, order_id: int, request: ModifyOrderRequest) -> OrderResponse:
+        """Modify an order from typed changes without going through the AI provider"""
+        return self.modify_order(ModifyOrder(
+            action="modify_order", order_id=order_id, changes=[change.model_dump() for change in request.changes]
+        ))
+    
+    def modify_order(self, command: ModifyOrder) -> OrderResponse:
+        """Modify an existing order in place"""
+        return self._respond(self._modify(self.order_store, command))
+    
+    def cancel_order(self, order_id: int) -> OrderResponse:
+        return self._respond(self._cancel(self.order_store, order_id))
+    
+    def _execute_commands(self, commands: List[Union[IntentCommand, Outcome]]) -> OrderResponse:
+        """Apply commands in order under one store lock acquisition.
+
+        Entries that failed to parse are passed through as their error result.
+        """
+        with self.order_store.transaction() as transaction:
+            results = [
+                command if isinstance(command, Outcome) else self._apply(transaction, command)
+                for command in commands
+            ]
+        logger.info("Applied %s of %s actions", sum(result.success for result in results), len(results))
+        return self._combined_response(results)
+    
+    # ``target`` below is the OrderStore or an open OrderTransaction; both have the same write methods
+    
+    def _apply(self, target: Any, command: IntentCommand) -> Outcome:
+        if isinstance(command, PlaceOrder):
+            return self._place(target, self.menu.item_vector(command.items, Config.MAX_ITEM_QUANTITY))
+        elif isinstance(command, ModifyOrder):
+            return self._modify(target, command)
+        return self._cancel(target, command.order_id)
     
-    def place_order(self, order_data: Dict[str, Any]) -> OrderResponse:
+    def _place(self, target: Any, quantities: array) -> Outcome:
         try:
-            # Validate and clean order data
-            order_items = OrderItems(**order_data)
-            
-            if order_items.is_empty():
-                return self._create_error_response(
-                    "Please specify at least one item to order"
-                )
+            if not any(quantities):
+                return self._error("Please specify at least one item to order")
             
             # Add order to store
-            items_dict = order_items.to_dict()
-            order_id = self.order_store.add_order(items_dict)
+            order_id = target.add_order(quantities)
+            items_dict = self.menu.to_dict(quantities)
             
             # Create success message
-            message = self._format_order_message(order_items, order_id)
+            message = self._format_order_message(quantities, order_id)
             
-            logger.info(f"Order {order_id} placed: {items_dict}")
+            logger.info("Order %s placed: %s", order_id, items_dict)
             
-            return OrderResponse(
+            return Outcome(
                 success=True,
                 action=ActionType.PLACED,
                 order_id=order_id,
                 items=items_dict,
                 message=message,
-                totals=self.order_store.get_totals(),
-                orders=self.order_store.get_orders(),
             )
             
         except Exception as e:
-            logger.error(f"Error placing order: {str(e)}")
-            return self._create_error_response("Failed to place order")
+            logger.error("Error placing order: %s", e)
+            return self._error("Failed to place order")
         
-    def modify_order(self, order_data: Dict[str, Any]) -> OrderResponse:
-        """Modify an existing order in place"""
+    def _modify(self, target: Any, command: ModifyOrder) -> Outcome:
         try:
-            order_id = order_data.get("order_id")
+            order_id = command.order_id
             if not order_id:
-                return self._create_error_response("Order ID is required for modifications")
+                return self._error("Order ID is required for modifications")
             
             # Get current order
-            current_order = self.order_store.get_order(order_id)
-            if not current_order or current_order.status != "active":
-                return self._create_error_response(f"Order #{order_id} not found or not active")
-            
-            new_items = current_order.items.copy()
+            current_order = target.get_order(order_id)
+            if not current_order or current_order.status not in MODIFIABLE_STATUSES:
+                return self._error(f"Order #{order_id} not found or not active")
             
             # Apply modifications
-            for item_type in ['burgers', 'fries', 'drinks']:
-                current_qty = new_items.get(item_type, 0)
-                
-                # Handle set operations (replace current amount)
-                set_key = f'set_{item_type}'
-                if order_data.get(set_key, -1) >= 0:
-                    new_items[item_type] = order_data[set_key]
-                    continue
-                
-                # Handle add operations
-                add_key = f'add_{item_type}'
-                if order_data.get(add_key, 0) > 0:
-                    new_items[item_type] = current_qty + order_data[add_key]
-                
-                # Handle remove operations
-                remove_key = f'remove_{item_type}'
-                remove_qty = order_data.get(remove_key, 0)
-                if remove_qty > 0:
-                    if remove_qty >= 999:
-                        new_items[item_type] = 0
-                    else:
-                        new_items[item_type] = max(0, current_qty - remove_qty)
+            new_quantities = self.menu.apply_changes(
+                current_order.quantities, command.changes, Config.MAX_ITEM_QUANTITY
+            )
             
             # Update the existing order
-            current_order.items = new_items
+            if not target.update_order(order_id, new_quantities):
+                return self._error(f"Order #{order_id} not found or not active")
+            new_items = self.menu.to_dict(new_quantities)
             
-            logger.info(f"Order {order_id} modified: {new_items}")
+            logger.info("Order %s modified: %s", order_id, new_items)
                 
-            return OrderResponse(
+            return Outcome(
                 success=True,
                 action=ActionType.PLACED,
                 order_id=order_id,
                 items=new_items,
                 message=f"Order #{order_id} has been updated",
-                totals=self.order_store.get_totals(),
-                orders=self.order_store.get_orders(),
             )
             
         except Exception as e:
-            logger.error(f"Error modifying order: {str(e)}")
-            return self._create_error_response("Failed to modify order")
+            logger.error("Error modifying order: %s", e)
+            return self._error("Failed to modify order")
     
-    def cancel_order(self, order_id: int) -> OrderResponse:
+    def _cancel(self, target: Any, order_id: Optional[int]) -> Outcome:
         try:
             if order_id is None:
-                return self._create_error_response(
-                    "Please specify an order number to cancel"
-                )
+                return self._error("Please specify an order number to cancel")
             
-            canceled_items = self.order_store.cancel_order(order_id)
+            canceled = target.cancel_order(order_id)
             
-            if canceled_items:
+            if canceled is not None:
+                canceled_items = self.menu.to_dict(canceled)
                 message = f"Order #{order_id} has been canceled"
-                logger.info(f"Order {order_id} canceled: {canceled_items}")
+                logger.info("Order %s canceled: %s", order_id, canceled_items)
                 
-                return OrderResponse(
+                return Outcome(
                     success=True,
                     action=ActionType.CANCELED,
                     order_id=order_id,
                     items=canceled_items,
                     message=message,
-                    totals=self.order_store.get_totals(),
-                    orders=self.order_store.get_orders(),
                 )
             else:
-                return self._create_error_response(
-                    f"Order #{order_id} not found or already canceled"
-                )
+                return self._error(f"Order #{order_id} not found or already canceled")
                 
         except Exception as e:
-            logger.error(f"Error canceling order {order_id}: {str(e)}")
-            return self._create_error_response("Failed to cancel order")
+            logger.error("Error canceling order %s: %s", order_id, e)
+            return self._error("Failed to cancel order")
+    
+    def _preview(self, command: IntentCommand) -> Outcome:
+        order_id = None
+        try:
+            if isinstance(command, PlaceOrder):
+                quantities = self.menu.item_vector(command.items, Config.MAX_ITEM_QUANTITY)
+                if not any(quantities):
+                    return self._error("Please specify at least one item to order")
+                message = f"Place order: {self.menu.describe(quantities)}?"
+            else:
+                order_id = command.order_id
+                current_order = self.order_store.get_order(order_id) if order_id else None
+                if isinstance(command, ModifyOrder):
+                    if not current_order or current_order.status not in MODIFIABLE_STATUSES:
+                        return self._error(f"Order #{order_id} not found or not active")
+                    quantities = self.menu.apply_changes(
+                        current_order.quantities, command.changes, Config.MAX_ITEM_QUANTITY
+                    )
+                    message = f"Update order #{order_id} to {self.menu.describe(quantities)}?"
+                else:
+                    if not current_order or current_order.status not in ACTIVE_STATUSES:
+                        return self._error(f"Order #{order_id} not found or already canceled")
+                    quantities = current_order.quantities
+                    message = f"Cancel order #{order_id}?"
+        except Exception as e:
+            logger.error("Error previewing %s: %s", command.action, e)
+            return self._error("Failed to preview request")
+        
+        return Outcome(
+            success=True,
+            action=ActionType.PREVIEW,
+            order_id=order_id,
+            items=self.menu.to_dict(quantities),
+            message=message,
+        )
+    
+    def _record(self, session_id: Optional[str], response: OrderResponse) -> None:
+        for result in response.results or (response,):
+            if result.success:
+                self.sessions.record(session_id, result.action, result.order_id, result.items)
+        
+    def place_orders_bulk(self, request: BulkOrderRequest) -> BulkResponse:
+        """Apply a batch of structured orders in one store transaction"""
+        results = [
+            BulkItemResult(idempotency_key=entry.idempotency_key, success=False)
+            for entry in request.orders
+        ]
+        batch, positions = [], []
+        for position, entry in enumerate(request.orders):
+            quantities = entry.items.to_vector()
+            if any(quantities):
+                batch.append((entry.idempotency_key, quantities))
+                positions.append(position)
+            else:
+                results[position].message = "Please specify at least one item to order"
+        
+        for position, (order_id, replayed) in zip(positions, self.order_store.add_orders(batch)):
+            result = results[position]
+            result.success = True
+            result.order_id = order_id
+            result.replayed = replayed
         
-    def get_current_orders(self) -> OrderResponse:
+        logger.info("Bulk order: %s of %s entries applied", len(batch), len(results))
+        return self._bulk_response(results)
+    
+    def cancel_orders_bulk(self, request: BulkCancelRequest) -> BulkResponse:
+        """Apply a batch of cancellations in one store transaction"""
+        batch = [(entry.idempotency_key, entry.order_id) for entry in request.cancellations]
+        results = []
+        for entry, (success, replayed) in zip(request.cancellations, self.order_store.cancel_orders(batch)):
+            results.append(BulkItemResult(
+                idempotency_key=entry.idempotency_key,
+                success=success,
+                order_id=entry.order_id,
+                replayed=replayed,
+                message=None if success else f"Order #{entry.order_id} not found or already canceled",
+            ))
+        
+        logger.info("Bulk cancel: %s of %s entries succeeded", sum(r.success for r in results), len(results))
+        return self._bulk_response(results)
+    
+    def get_current_orders(self, snapshot: Optional[OrderSnapshot] = None) -> OrderResponse:
+        """``snapshot`` pins the response to a store version the caller already holds"""
         try:
-            return OrderResponse(
+            return self._build_response(
+                snapshot,
                 success=True,
                 action=ActionType.RETRIEVE,
-                orders=self.order_store.get_orders(),
-                totals=self.order_store.get_totals(),
                 message="Here are the current orders",
             )
         except Exception as e:
-            logger.error(f"Error retrieving orders: {str(e)}")
+            logger.error("Error retrieving orders: %s", e)
             return self._create_error_response("Failed to fetch current orders")
 
+    def get_order_details(self, order_id: int) -> OrderDetails:
+        order_info = self.order_store.get_order(order_id)
+        if order_info is None:
+            raise OrderNotFoundError(order_id)
+        return self._details(order_info)
+
+    def update_order_status(self, order_id: int, status: OrderStatus) -> OrderDetails:
+        order_info = self.order_store.transition(order_id, status)
+        logger.info("Order %s is now %s", order_id, order_info.status.value)
+        return self._details(order_info)
+
+    def get_orders_by_status(self, status: OrderStatus) -> list:
+        return [self._details(order_info) for order_info in self.order_store.get_orders_by_status(status)]
+
+    def get_order_history(self, limit: int) -> list:
+        return [self._details(order_info) for order_info in self.order_store.get_order_history(limit)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.order_store.get_stats()
+        if self.order_store.feed is not None:
+            stats["feed"] = self.order_store.feed.stats()
+        if isinstance(self.ai_service, AIService):
+            stats["ai"] = self.ai_service.get_stats()
+        if self.eta_estimator is not None:
+            stats["eta"] = self.eta_estimator.get_stats()
+        return stats
+    
+    def get_events(self, after: int, limit: int) -> OrderEventsResponse:
+        """Change feed page after ``after``, or a snapshot to resync from when those events are gone"""
+        feed = self.order_store.feed
+        if feed is not None:
+            try:
+                events = feed.read(after, limit)
+            except ChangeFeedGap:
+                pass
+            else:
+                return OrderEventsResponse.model_construct(
+                    events=[
+                        OrderEventOut.model_construct(
+                            seq=event.seq,
+                            type=event.type,
+                            order_id=event.order_id,
+                            items=self.menu.to_dict(event.quantities),
+                            timestamp=event.timestamp,
+                        )
+                        for event in events
+                    ],
+                    last_seq=events[-1].seq if events else max(after, 0),
+                    resync=False,
+                    totals=None,
+                    orders=None,
+                )
+        snapshot = self.order_store.get_snapshot()
+        return OrderEventsResponse.model_construct(
+            events=[], last_seq=snapshot.seq, resync=True, totals=snapshot.totals, orders=snapshot.orders
+        )
+    
+    def _build_response(self, snapshot: Optional[OrderSnapshot] = None, **fields) -> OrderResponse:
+        # Internal data is already valid: skip validation and share the store snapshot
+        snapshot = snapshot or self.order_store.get_snapshot()
+        return OrderResponse.model_construct(
+            totals=snapshot.totals,
+            orders=snapshot.orders,
+            **fields
+        )
     
     def _create_error_response(self, message: str) -> OrderResponse:
-        return OrderResponse(
+        return self._build_response(
             success=False,
             action=ActionType.ERROR,
             message=message,
-            totals=self.order_store.get_totals(),
-            orders=self.order_store.get_orders(),
         )
     
-    def _format_order_message(self, order_items: OrderItems, order_id: int) -> str:
-        items = []
-        
-        if order_items.burgers > 0:
-            items.append(f"{order_items.burgers} burger{'s' if order_items.burgers != 1 else ''}")
-        
-        if order_items.fries > 0:
-            items.append(f"{order_items.fries} order{'s' if order_items.fries != 1 else ''} of fries")
-        
-        if order_items.drinks > 0:
-            items.append(f"{order_items.drinks} drink{'s' if order_items.drinks != 1 else ''}")
-        
-        if len(items) == 1:
-            items_text = items[0]
-        elif len(items) == 2:
-            items_text = f"{items[0]} and {items[1]}"
-        else:
-            items_text = f"{', '.join(items[:-1])}, and {items[-1]}"
-        
-        return f"Order #{order_id} placed: {items_text}"
+    def _error(self, message: str) -> Outcome:
+        return Outcome(success=False, action=ActionType.ERROR, message=message)
+    
+    def _respond(self, result: Outcome, **fields) -> OrderResponse:
+        return self._build_response(
+            success=result.success,
+            action=result.action,
+            order_id=result.order_id,
+            items=result.items,
+            message=result.message,
+            eta_seconds=self._eta_seconds(result),
+            **fields
+        )
+    
+    def _eta_seconds(self, result: Outcome) -> Optional[int]:
+        # Placing and modifying both answer PLACED
+        if self.eta_estimator is None or not result.success or result.action != ActionType.PLACED:
+            return None
+        eta = self.eta_estimator.estimate(result.order_id)
+        return None if eta is None else round(eta)
+    
+    def _combined_response(self, results: List[Outcome], **fields) -> OrderResponse:
+        # Succeeds if any action did; each result says which
+        succeeded = any(result.success for result in results)
+        return self._build_response(**{
+            "success": succeeded,
+            "action": ActionType.MULTIPLE if succeeded else ActionType.ERROR,
+            "message": "; ".join(result.message for result in results if result.message),
+            "results": [
+                ActionResult.model_construct(**result._asdict(), eta_seconds=self._eta_seconds(result)) for result in results
+            ],
+            **fields,
+        })
+    
+    def _bulk_response(self, results: list) -> BulkResponse:
+        snapshot = self.order_store.get_snapshot()
+        return BulkResponse.model_construct(
+            results=results,
+            totals=snapshot.totals,
+            orders=snapshot.orders,
+        )
+    
+    def _parse_command(self, parsed_intent: Dict[str, Any]) -> Union[IntentCommand, Outcome]:
+        """Typed command for a provider result (or one of its ``actions``), or the error result"""
+        try:
+            return parse_intent_command(parsed_intent)
+        except ValidationError as e:
+            action = parsed_intent.get("action")
+            if action not in ("place_order", "modify_order", "cancel_order"):
+                logger.warning("Unknown action: %s", action)
+                return self._error("Unknown action requested")
+            logger.error("Invalid %s arguments: %s", action, e)
+            return self._error("Could not understand the order details. Please try again.")
+    
+    def _details(self, order_info: OrderInfo) -> OrderDetails:
+        return OrderDetails.model_construct(
+            order_id=order_info.id,
+            status=order_info.status,
+            items=self.menu.to_dict(order_info.quantities),
+            timestamp=order_info.timestamp,
+        )
+    
+    def _format_order_message(self, quantities: array, order_id: int) -> str:
+        return f"Order #{order_id} placed: {self.menu.describe(quantities)}"
 
 def validate_order_items(data: Dict[str, Any]) -> tuple[bool, OrderItems, str]:
     try:
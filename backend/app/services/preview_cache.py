@@ -0,0 +1,49 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+class PreviewCache:
+    """Short-lived, single-use store of parsed intents keyed by random token.
+
+    A preview stores the validated intent command; committing the token pops
+    it, so the action runs without a second provider call. Entries expire
+    after ``ttl_seconds`` and the oldest are dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, intent: Any) -> str:
+        token = secrets.token_urlsafe(16)
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            self._entries[token] = (now + self.ttl_seconds, intent)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return token
+
+    def pop(self, token: str) -> Optional[Any]:
+        """The intent stored under ``token``, or None if unknown, used or expired"""
+        with self._lock:
+            entry = self._entries.pop(token, None)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self, now: float) -> None:
+        # Caller must hold self._lock; every entry has the same TTL, so expired ones are at the front
+        while self._entries:
+            token, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[token]
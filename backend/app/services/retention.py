@@ -0,0 +1,39 @@
+import logging
+import threading
+from typing import Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+class _Sweepable(Protocol):
+    def sweep(self) -> int: ...
+
+class RetentionSweeper:
+    """Background thread that calls ``target.sweep()`` every ``interval_seconds`` (an OrderStore or a LocationRegistry)"""
+
+    def __init__(self, target: _Sweepable, interval_seconds: float):
+        self.target = target
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="order-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                evicted = self.target.sweep()
+                if evicted:
+                    logger.info("Retention sweep moved %s orders out of memory", evicted)
+            except Exception as e:
+                logger.error("Retention sweep failed: %s", e, exc_info=True)
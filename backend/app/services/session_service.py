@@ -0,0 +1,118 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from app.models.menu import MenuCatalog
+from app.services.ai_providers.slots import ItemSlotParser, normalize
+
+# "that", "it", "my order"... - only meaningful when the session has a last order
+_REFERENCE = r"(?:it|that|this|mine|my order|the order|our order|that order)"
+_REFERENCE_RE = re.compile(rf"\b{_REFERENCE}\b")
+_EXPLICIT_ORDER_RE = re.compile(r"(?:order|#)\s*(?:number\s*)?#?\s*\d+")
+# Only the explicit verb: "forget it" / "scrap that" usually mean "never mind" and go to the provider
+_CANCEL_RE = re.compile(rf"^(?:please )?cancel {_REFERENCE}(?: please)?$")
+_ADD_RE = re.compile(rf"^(?:and |also |please |can you )*add (?P<items>.+?) (?:to|on|onto) {_REFERENCE}(?: too| please)?$")
+_REMOVE_RE = re.compile(rf"^(?:please |can you )*(?:remove|take off|drop) (?P<items>.+?) (?:from|off) {_REFERENCE}(?: please)?$")
+_SET_RE = re.compile(rf"^(?:actually |please )*(?:make|change) {_REFERENCE} (?:to )?(?P<items>.+?)(?: instead)?$")
+
+@dataclass
+class SessionState:
+    """Compact dialogue state for one lane"""
+    last_order_id: Optional[int] = None
+    last_items: Dict[str, int] = field(default_factory=dict)
+    turns: int = 0
+    expires_at: float = 0.0
+
+class SessionService:
+    """Per-lane conversation state in a bounded LRU with TTL eviction.
+
+    Follow-ups that only refer back to the lane's last order ("add a drink
+    to that", "cancel it") are resolved locally into intents. Anything else
+    goes to the provider with, at most, the last order number appended as
+    context, never the dialogue history.
+    """
+
+    def __init__(self, menu: MenuCatalog, max_entries: int, ttl_seconds: float, resolve_locally: bool = True):
+        self.menu = menu
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.resolve_locally = resolve_locally
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._slots = ItemSlotParser(menu)
+        self.stats = {"local": 0, "contextualized": 0, "provider": 0}
+
+    def get(self, session_id: Optional[str]) -> Optional[SessionState]:
+        if not session_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None or state.expires_at <= now:
+                self._sessions.pop(session_id, None)
+                return None
+            self._sessions.move_to_end(session_id)
+            return state
+
+    def resolve(self, message: str, state: Optional[SessionState]) -> Optional[Dict[str, Any]]:
+        """Intent for a follow-up about the session's last order, or None to ask the provider"""
+        if not self.resolve_locally or state is None or state.last_order_id is None:
+            return None
+        text = normalize(message)
+        if _EXPLICIT_ORDER_RE.search(text):
+            return None
+
+        order_id = state.last_order_id
+        if _CANCEL_RE.match(text):
+            intent = {"action": "cancel_order", "data": {"order_id": order_id}}
+        else:
+            intent = None
+            for pattern, op in ((_ADD_RE, "add"), (_REMOVE_RE, "remove"), (_SET_RE, "set")):
+                match = pattern.match(text)
+                if match:
+                    changes = self._slots.parse_list(match.group("items"), op)
+                    if changes:
+                        intent = {"action": "modify_order", "data": {"order_id": order_id, "changes": changes}}
+                    break
+        if intent is None:
+            return None
+        self.stats["local"] += 1
+        return {"success": True, **intent}
+
+    def contextualize(self, message: str, state: Optional[SessionState]) -> str:
+        """Message for the provider, with the last order number when the customer refers to it"""
+        if state is None or state.last_order_id is None:
+            self.stats["provider"] += 1
+            return message
+        lowered = message.lower()
+        if _REFERENCE_RE.search(lowered) and not _EXPLICIT_ORDER_RE.search(lowered):
+            self.stats["contextualized"] += 1
+            return f"{message} (order #{state.last_order_id})"
+        self.stats["provider"] += 1
+        return message
+
+    def record(self, session_id: Optional[str], action: str, order_id: Optional[int], items: Optional[Dict[str, int]]) -> None:
+        """Update the lane's state after an action was applied"""
+        if not session_id:
+            return
+        now = time.monotonic()
+        with self._lock:
+            state = self._sessions.pop(session_id, None)
+            if state is None or state.expires_at <= now:
+                state = SessionState()
+            state.turns += 1
+            state.expires_at = now + self.ttl_seconds
+            if action == "canceled":
+                if order_id == state.last_order_id:
+                    state.last_order_id, state.last_items = None, {}
+            elif order_id is not None:
+                state.last_order_id, state.last_items = order_id, dict(items or {})
+            self._sessions[session_id] = state
+            while len(self._sessions) > self.max_entries:
+                self._sessions.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,262 @@
+"""Shadow evaluation of a candidate provider on live traffic.
+
+A sample of the messages the primary provider answers is copied, with the
+primary's result and latency, onto a bounded queue. Worker threads send
+each one to the candidate and append one JSON line per comparison to
+AI_SHADOW_FILE:
+
+    {"t": epoch, "m": message, "agree": bool, "agree_action": bool,
+     "primary": {"ms", "usage", "intent", "source"},
+     "candidate": {"ms", "usage", "intent", "error"}}
+
+``intent`` is the canonical form of what the order service would do with
+a result (see ``canonical_intent``). ``source`` is the tier or route that
+answered for the primary. ``summarize`` turns a file of these lines into
+the offline report (``python -m benchmarks.shadow_report``).
+
+Nothing waits on the candidate: a full queue drops the sample, and the
+candidate's result is never used.
+"""
+import json
+import logging
+import os
+import queue
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.models.menu import to_int
+from app.services.ai_providers import AIProvider
+
+logger = logging.getLogger(__name__)
+
+def canonical_intent(result: Dict[str, Any]) -> Optional[list]:
+    """What the order service would do with a provider result, in a comparable form; None if it failed.
+
+    Quantities for the same item are summed and items and changes are
+    sorted, so wording-level differences between models do not count as
+    disagreement. Requests keep the order they were spoken in.
+    Entries that are not objects are skipped and quantities are read as the
+    menu reads them, so any output the order service accepts has a form.
+    """
+    if not result.get("success"):
+        return None
+    actions = result.get("actions") or [{"action": result.get("action"), "data": result.get("data")}]
+    canonical = []
+    for entry in _objects(actions):
+        action, data = entry.get("action"), entry.get("data")
+        if not isinstance(data, dict):
+            data = {}
+        if action == "place_order":
+            items: Dict[str, int] = {}
+            for item in _objects(data.get("items")):
+                key = str(item.get("item"))
+                items[key] = items.get(key, 0) + to_int(item.get("quantity", 1))
+            canonical.append([action, sorted(items.items())])
+        elif action == "modify_order":
+            changes = sorted(
+                (str(change.get("item")), str(change.get("op", "add")), to_int(change.get("quantity", 1)))
+                for change in _objects(data.get("changes"))
+            )
+            canonical.append([action, data.get("order_id"), changes])
+        else:
+            canonical.append([action, data.get("order_id")])
+    # Round-trips through JSON so live comparisons and ones re-read from the file agree
+    return json.loads(json.dumps(canonical))
+
+def _objects(entries: Any) -> List[Dict[str, Any]]:
+    return [entry for entry in entries if isinstance(entry, dict)] if isinstance(entries, list) else []
+
+class ShadowEvaluator:
+    """Mirrors ``sample_rate`` of primary calls to ``candidate`` on ``workers`` background threads"""
+
+    def __init__(
+        self,
+        candidate: AIProvider,
+        path: Optional[str],
+        sample_rate: float = 0.1,
+        queue_size: int = 100,
+        workers: int = 2,
+        name: Optional[str] = None
+    ):
+        self.candidate = candidate
+        self.name = name or type(candidate).__name__
+        self.path = path
+        self.sample_rate = sample_rate
+        self._queue: "queue.Queue[Optional[Tuple[float, str, Dict[str, Any], float]]]" = queue.Queue(queue_size)
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(path, "a")
+        self._counts = {"sampled": 0, "dropped": 0, "compared": 0, "agreed": 0, "candidate_errors": 0, "submit_errors": 0}
+        # Recent latencies for get_stats; the file keeps every one
+        self._primary_ms: deque = deque(maxlen=1000)
+        self._candidate_ms: deque = deque(maxlen=1000)
+        self._threads = [
+            threading.Thread(target=self._run, name=f"shadow-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, message: str, primary: Dict[str, Any], primary_seconds: float) -> bool:
+        """Maybe queue a comparison; never blocks or raises. True if the message was queued"""
+        try:
+            if random.random() >= self.sample_rate:
+                return False
+            if self._queue.full():
+                with self._lock:
+                    self._counts["dropped"] += 1
+                return False
+            # A shallow copy: canonicalized on a worker, off the response path
+            self._queue.put_nowait((time.time(), message, dict(primary), primary_seconds))
+        except queue.Full:
+            with self._lock:
+                self._counts["dropped"] += 1
+            return False
+        except Exception as e:
+            with self._lock:
+                self._counts["submit_errors"] += 1
+            logger.warning("Shadow submit failed: %s", e)
+            return False
+        with self._lock:
+            self._counts["sampled"] += 1
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the workers, finishing what is already queued within ``timeout``, and close the file"""
+        deadline = time.monotonic() + timeout
+        for _ in self._threads:
+            try:
+                self._queue.put(None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                break
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self.candidate.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+            primary_ms, candidate_ms = sorted(self._primary_ms), sorted(self._candidate_ms)
+        compared = counts["compared"]
+        return {
+            "candidate": self.name,
+            "sample_rate": self.sample_rate,
+            **counts,
+            "queued": self._queue.qsize(),
+            "agreement": round(counts["agreed"] / compared, 4) if compared else None,
+            "primary_p50_ms": _percentile(primary_ms, 0.5),
+            "candidate_p50_ms": _percentile(candidate_ms, 0.5),
+            "candidate_p95_ms": _percentile(candidate_ms, 0.95),
+        }
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._compare(*item)
+            except Exception as e:
+                logger.error("Shadow comparison failed: %s", e, exc_info=True)
+
+    def _compare(self, at: float, message: str, primary_result: Dict[str, Any], primary_seconds: float) -> None:
+        primary = {
+            "ms": round(primary_seconds * 1e3, 2),
+            "usage": primary_result.get("usage"),
+            "intent": canonical_intent(primary_result),
+            "source": primary_result.get("tier") or primary_result.get("route"),
+        }
+        start = time.perf_counter()
+        error = None
+        try:
+            result = self.candidate.parse_intent(message)
+        except Exception as e:
+            result, error = {"success": False}, f"{type(e).__name__}: {e}"
+        candidate_seconds = time.perf_counter() - start
+        if error is None and not result.get("success"):
+            error = result.get("error")
+
+        primary_intent, candidate_intent = primary["intent"], canonical_intent(result)
+        agree = primary_intent == candidate_intent
+        agree_action = [entry[0] for entry in primary_intent or []] == [entry[0] for entry in candidate_intent or []]
+        record = {
+            "t": round(at, 3),
+            "m": message,
+            "agree": agree,
+            "agree_action": agree_action,
+            "primary": primary,
+            "candidate": {
+                "ms": round(candidate_seconds * 1e3, 2),
+                "usage": result.get("usage"),
+                "intent": candidate_intent,
+                "error": error,
+            },
+        }
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._counts["compared"] += 1
+            self._counts["agreed"] += agree
+            self._counts["candidate_errors"] += error is not None
+            self._primary_ms.append(record["primary"]["ms"])
+            self._candidate_ms.append(record["candidate"]["ms"])
+            if self._file is not None:
+                self._file.write(line)
+                self._file.flush()
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    return values[min(len(values) - 1, int(len(values) * q))] if values else None
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def summarize(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Offline report over shadow records: agreement, latency and token use, overall and per primary source"""
+    records = list(records)
+
+    def side(name: str, subset: List[Dict[str, Any]]) -> Dict[str, Any]:
+        ms = sorted(record[name]["ms"] for record in subset)
+        usage = [record[name]["usage"] for record in subset if record[name].get("usage")]
+        return {
+            "p50_ms": _percentile(ms, 0.5),
+            "p90_ms": _percentile(ms, 0.9),
+            "p99_ms": _percentile(ms, 0.99),
+            "mean_ms": round(statistics.mean(ms), 2) if ms else None,
+            "calls_with_usage": len(usage),
+            "mean_input_tokens": round(statistics.mean(u["input_tokens"] for u in usage), 1) if usage else None,
+            "mean_output_tokens": round(statistics.mean(u["output_tokens"] for u in usage), 1) if usage else None,
+        }
+
+    def group(subset: List[Dict[str, Any]]) -> Dict[str, Any]:
+        count = len(subset)
+        return {
+            "compared": count,
+            "agreement": round(sum(record["agree"] for record in subset) / count, 4) if count else None,
+            "action_agreement": round(sum(record["agree_action"] for record in subset) / count, 4) if count else None,
+            "candidate_errors": sum(record["candidate"].get("error") is not None for record in subset),
+            "primary": side("primary", subset),
+            "candidate": side("candidate", subset),
+        }
+
+    by_source: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        by_source.setdefault(record["primary"].get("source") or "primary", []).append(record)
+    disagreements = [
+        {"m": record["m"], "primary": record["primary"]["intent"], "candidate": record["candidate"]["intent"]}
+        for record in records if not record["agree"]
+    ]
+    return {
+        **group(records),
+        "by_primary_source": {source: group(subset) for source, subset in sorted(by_source.items())},
+        "disagreement_examples": disagreements[:10],
+    }
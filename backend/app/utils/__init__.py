@@ -15,6 +15,8 @@ from .exception_utils import (
     InvalidOrderDataError,
     AIServiceError,
     RateLimitError,
+    IdempotencyKeyConflictError,
+    InvalidStatusTransitionError,
     log_and_raise_http_exception,
     safe_execute
 )
@@ -34,6 +36,8 @@ __all__ = [
     "InvalidOrderDataError", 
     "AIServiceError",
     "RateLimitError",
+    "IdempotencyKeyConflictError",
+    "InvalidStatusTransitionError",
     "log_and_raise_http_exception",
     "safe_execute"
 ]
\ No newline at end of file
@@ -11,6 +11,11 @@ class OrderNotFoundError(Exception):
         self.order_id = order_id
         super().__init__(f"Order {order_id} not found")
 
+class LocationNotFoundError(Exception):
+    def __init__(self, location_id: str):
+        self.location_id = location_id
+        super().__init__(f"Location {location_id!r} not found")
+
 class InvalidOrderDataError(Exception):
     def __init__(self, message: str):
         self.message = message
@@ -27,6 +32,29 @@ class RateLimitError(Exception):
         self.retry_after = retry_after
         super().__init__(f"Rate limit exceeded. Retry after {retry_after} seconds.")
 
+class OverloadedError(Exception):
+    def __init__(self, retry_after: int, reason: str):
+        self.retry_after = retry_after
+        self.reason = reason
+        super().__init__(f"Server busy ({reason}). Retry after {retry_after} seconds.")
+
+class DeadlineExceededError(TimeoutError):
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"Request deadline passed {stage}")
+
+class IdempotencyKeyConflictError(Exception):
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"Idempotency key {key} was already used with a different request")
+
+class InvalidStatusTransitionError(Exception):
+    def __init__(self, order_id: int, current: str, requested: str):
+        self.order_id = order_id
+        self.current = current
+        self.requested = requested
+        super().__init__(f"Order {order_id} cannot move from {current} to {requested}")
+
 class ExceptionContext:
     def __init__(self, default_value=None, log_errors=True):
         self.default_value = default_value
@@ -40,15 +68,20 @@ class ExceptionContext:
         if exc_type is not None:
             self.exception = exc_val
             if self.log_errors:
-                logger.error(f"Exception in context: {str(exc_val)}")
+                logger.error("Exception in context: %s", exc_val)
             return True
         return False
 
 EXCEPTION_MAP = {
     OrderNotFoundError: (404, lambda e: str(e)),
+    LocationNotFoundError: (404, lambda e: str(e)),
     InvalidOrderDataError: (400, lambda e: e.message),
     AIServiceError: (503, lambda e: f"AI service unavailable: {e.message}"),
     RateLimitError: (429, lambda e: str(e)),
+    OverloadedError: (503, lambda e: str(e)),
+    DeadlineExceededError: (504, lambda e: "Request deadline exceeded. Please try again."),
+    IdempotencyKeyConflictError: (422, lambda e: str(e)),
+    InvalidStatusTransitionError: (409, lambda e: str(e)),
     ValueError: (400, lambda e: str(e)),
     FileNotFoundError: (404, lambda e: "Resource not found"),
     PermissionError: (403, lambda e: "Access forbidden"),
@@ -62,15 +95,15 @@ def _get_exception_details(exception: Exception) -> tuple[int, str, dict]:
     if exception_type in EXCEPTION_MAP:
         status_code, message_func = EXCEPTION_MAP[exception_type]
         detail = message_func(exception)
-        # Special handling for rate limit
+        # Special handling for rate limit and load shedding
         headers = {}
-        if isinstance(exception, RateLimitError):
+        if isinstance(exception, (RateLimitError, OverloadedError)):
             headers["Retry-After"] = str(exception.retry_after)
         
         return status_code, detail, headers
     
     error_id = str(uuid.uuid4())
-    logger.error(f"Unexpected error (ID: {error_id}): {str(exception)}", exc_info=True)
+    logger.error("Unexpected error (ID: %s): %s", error_id, exception, exc_info=True)
     return 500, f"An unexpected error occurred. Error ID: {error_id}", {}
 
 def handle_exceptions(func):
@@ -84,9 +117,9 @@ def handle_exceptions(func):
             status_code, detail, headers = _get_exception_details(e)
             
             if status_code >= 500:
-                logger.error(f"Server error in {func.__name__}: {str(e)}")
+                logger.error("Server error in %s: %s", func.__name__, e)
             elif status_code >= 400:
-                logger.warning(f"Client error in {func.__name__}: {str(e)}")
+                logger.warning("Client error in %s: %s", func.__name__, e)
             
             raise HTTPException(
                 status_code=status_code,
@@ -104,9 +137,9 @@ def handle_exceptions(func):
             status_code, detail, headers = _get_exception_details(e)
             
             if status_code >= 500:
-                logger.error(f"Server error in {func.__name__}: {str(e)}")
+                logger.error("Server error in %s: %s", func.__name__, e)
             elif status_code >= 400:
-                logger.warning(f"Client error in {func.__name__}: {str(e)}")
+                logger.warning("Client error in %s: %s", func.__name__, e)
             
             raise HTTPException(
                 status_code=status_code,
@@ -136,7 +169,7 @@ def safe_execute(func, default_value=None, log_errors=True):
         return func()
     except Exception as e:
         if log_errors:
-            logger.error(f"Error in safe_execute: {str(e)}")
+            logger.error("Error in safe_execute: %s", e)
         return default_value
 
 def validate_and_raise(condition: bool, exception_class: type, *args, **kwargs):
@@ -0,0 +1,108 @@
+import gzip
+from typing import Any, Callable, Optional
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+from app.core.config import Config
+from app.models.db_models import OrderSnapshot
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without it
+    brotli = None
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def encode_model(model: BaseModel) -> bytes:
+    """Encode a trusted model straight from its attributes, skipping re-validation"""
+    return orjson.dumps(_plain(model), option=ORJSON_OPTIONS)
+
+def encode_order_response(response: Any, snapshot: Optional[OrderSnapshot] = None) -> bytes:
+    """Encode an OrderResponse (or BulkResponse).
+
+    When ``snapshot`` is the one the response was built from, its cached
+    totals/orders fragment is spliced in instead of re-encoding them.
+    """
+    if snapshot is None or response.orders is not snapshot.orders:
+        return encode_model(response)
+
+    head = {
+        name: _plain(getattr(response, name))
+        for name in type(response).model_fields
+        if name not in ("totals", "orders")
+    }
+    return orjson.dumps(head, option=ORJSON_OPTIONS)[:-1] + b"," + snapshot.fragment() + b"}"
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(_plain(content), option=ORJSON_OPTIONS)
+
+class OrderJSONResponse(FastJSONResponse):
+    def __init__(self, response: Any, snapshot: Optional[OrderSnapshot] = None, **kwargs):
+        super().__init__(encode_order_response(response, snapshot), **kwargs)
+
+def snapshot_response(
+    snapshot: OrderSnapshot,
+    build: Callable[[], bytes],
+    if_none_match: Optional[str] = None,
+    accept_encoding: Optional[str] = None
+) -> Response:
+    """Response whose body depends only on ``snapshot``'s version.
+
+    A client already holding this version gets 304 without ``build`` being
+    called. Otherwise the body, and each compressed variant of it, is built
+    once per version and then shared by every poller.
+    """
+    headers = {"ETag": snapshot.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+
+    body = snapshot.memo("identity", build)
+    encoding = _choose_encoding(accept_encoding) if len(body) >= Config.ORDER_LIST_COMPRESSION_MIN_BYTES else None
+    if encoding is not None:
+        body = snapshot.memo(encoding, lambda: _compress(encoding, body))
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison, as If-None-Match calls for
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def _choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+def _compress(encoding: str, body: bytes) -> bytes:
+    # Built once per store version, so spend a little more than the fastest settings
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return {name: _plain(getattr(value, name)) for name in type(value).model_fields}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
@@ -0,0 +1,96 @@
+"""Columnar analytics vs a naive loop over ``get_order_history()``.
+
+    python -m benchmarks.analytics [num_orders]
+"""
+import sys
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from app.models.db_models import OrderInfo
+from app.models.menu import MENU
+from app.models.order_columns import OrderColumns, STATUS_CODES
+from app.models.order_status import OrderStatus
+from app.services.analytics_service import AnalyticsService, SECONDS_PER_HOUR
+from benchmarks.common import report
+
+WINDOW_HOURS = 24 * 7
+
+def synthetic_history(num_orders: int, now: float):
+    rng = np.random.default_rng(7)
+    timestamps = np.sort(rng.uniform(now - WINDOW_HOURS * SECONDS_PER_HOUR, now, num_orders))
+    quantities = rng.integers(0, 4, size=(len(MENU), num_orders), dtype=np.int32)
+    status = np.where(rng.random(num_orders) < 0.05, STATUS_CODES["canceled"], STATUS_CODES["placed"]).astype(np.int8)
+    return timestamps, quantities, status
+
+def naive_summary(history: list, now: float) -> dict:
+    # Same clock-hour buckets as AnalyticsService.get_summary
+    utc_offset = time.localtime(now).tm_gmtoff
+    first_hour = int((now + utc_offset) // SECONDS_PER_HOUR) - WINDOW_HOURS + 1
+    start = first_hour * SECONDS_PER_HOUR - utc_offset
+    per_hour = Counter()
+    by_hour_of_day = Counter()
+    total = canceled = basket_total = kept = 0
+    for order in history:
+        ts = order.timestamp.timestamp()
+        if ts < start:
+            continue
+        total += 1
+        if order.status == "canceled":
+            canceled += 1
+            continue
+        size = sum(order.quantities)
+        kept += 1
+        basket_total += size
+        per_hour[int((ts - start) // SECONDS_PER_HOUR)] += size
+        by_hour_of_day[order.timestamp.hour] += size
+    return {
+        "cancel_rate": canceled / total if total else 0.0,
+        "mean_basket_size": basket_total / kept if kept else 0.0,
+        "items_per_hour": [per_hour[h] for h in range(WINDOW_HOURS)],
+        "top_hours": by_hour_of_day.most_common(3),
+    }
+
+def main() -> None:
+    num_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    now = time.time()
+    timestamps, quantities, status = synthetic_history(num_orders, now)
+
+    columns = OrderColumns(len(MENU))
+    columns.extend(timestamps, quantities, status)
+    service = AnalyticsService(columns, MENU)
+
+    history = [
+        OrderInfo(
+            id=i + 1,
+            quantities=array("i", quantities[:, i].tolist()),
+            timestamp=datetime.fromtimestamp(timestamps[i]),
+            status=OrderStatus.CANCELED if status[i] == STATUS_CODES["canceled"] else OrderStatus.PLACED,
+        )
+        for i in range(num_orders)
+    ]
+
+    start = time.perf_counter()
+    summary = service.get_summary(window_hours=WINDOW_HOURS, now=now)
+    columnar_ms = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    naive = naive_summary(history, now)
+    naive_ms = (time.perf_counter() - start) * 1e3
+
+    assert abs(summary["cancel_rate"] - naive["cancel_rate"]) < 1e-9
+    assert abs(summary["mean_basket_size"] - naive["mean_basket_size"]) < 1e-9
+    assert [h["total"] for h in summary["items_per_hour"]] == naive["items_per_hour"]
+    assert sum(sum(h["items"].values()) for h in summary["items_per_hour"]) == sum(naive["items_per_hour"])
+
+    report(f"Analytics summary over {num_orders:,} orders, {WINDOW_HOURS}h window (ms)", [
+        ("naive loop", f"{naive_ms:.1f}"),
+        ("columnar numpy", f"{columnar_ms:.1f}"),
+        ("speedup", f"{naive_ms / columnar_ms:.0f}x"),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Bulk ingestion throughput: one batch request vs one request per order.
+
+    python -m benchmarks.bulk_orders [num_orders] [batch_size]
+"""
+import sys
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from benchmarks.common import build_app, report
+
+def order_entry() -> dict:
+    return {"idempotency_key": uuid.uuid4().hex, "items": {"burgers": 2, "fries": 1, "drinks": 2}}
+
+def run(client: TestClient, num_orders: int, batch_size: int) -> float:
+    entries = [order_entry() for _ in range(num_orders)]
+    start = time.perf_counter()
+    for offset in range(0, num_orders, batch_size):
+        response = client.post("/api/v1/orders/bulk", json={"orders": entries[offset:offset + batch_size]})
+        assert response.status_code == 200
+    elapsed = time.perf_counter() - start
+
+    # Replaying the same keys must not create new orders
+    replay = client.post("/api/v1/orders/bulk", json={"orders": entries[:batch_size]}).json()
+    assert all(result["replayed"] for result in replay["results"])
+    return num_orders / elapsed
+
+def main() -> None:
+    num_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    single = run(TestClient(build_app()), num_orders, 1)
+    batched = run(TestClient(build_app()), num_orders, batch_size)
+
+    report(f"Ingest {num_orders} orders (orders/sec)", [
+        ("one request per order", f"{single:,.0f}"),
+        (f"batches of {batch_size}", f"{batched:,.0f}"),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Order change feed: publish overhead and fan-out to many subscribers.
+
+Publish overhead compares add_order + cancel_order on a store without a
+feed against one publishing every mutation. Fan-out runs one producer
+thread placing orders while N subscriber threads poll their own cursor;
+one extra subscriber is deliberately slow and gets dropped and resynced
+from a snapshot whenever it falls more than ``max_lag`` behind.
+
+    python -m benchmarks.change_feed [num_events]
+"""
+import sys
+import threading
+import time
+
+from app.models.change_feed import ChangeFeedGap
+from app.models.db_models import OrderStore
+from app.models.menu import MENU
+from benchmarks.common import measure_pair, report
+
+ORDER = MENU.to_vector({"burgers": 2, "fries": 1, "drinks": 2})
+
+def publish_overhead() -> list:
+    without_feed = OrderStore(MENU, feed_capacity=0)
+    with_feed = OrderStore(MENU, feed_capacity=65536)
+    plain, published = measure_pair(
+        lambda: without_feed.cancel_order(without_feed.add_order(ORDER)),
+        lambda: with_feed.cancel_order(with_feed.add_order(ORDER)),
+    )
+    return [
+        ("no feed", f"{plain:6.2f} us per add_order + cancel_order"),
+        ("feed", f"{published:6.2f} us per add_order + cancel_order", f"+{(published - plain) / 2:.2f} us per event"),
+    ]
+
+def fan_out(num_subscribers: int, num_events: int) -> tuple:
+    store = OrderStore(MENU, feed_capacity=65536)
+    feed = store.feed
+    done = threading.Event()
+    received = [0] * num_subscribers
+    slow = {"events": 0, "resyncs": 0}
+
+    def consume(index: int) -> None:
+        subscription = feed.subscribe(f"sub-{index}")
+        while not (done.is_set() and subscription.lag == 0):
+            received[index] += len(subscription.poll(limit=1000, timeout=0.05))
+
+    def consume_slowly() -> None:
+        subscription = feed.subscribe("slow", max_lag=2000)
+        while not done.is_set():
+            try:
+                events = subscription.poll(limit=100, timeout=0.05)
+            except ChangeFeedGap:
+                subscription.resync(store.get_snapshot().seq)
+                slow["resyncs"] += 1
+                continue
+            slow["events"] += len(events)
+            time.sleep(0.002)
+
+    threads = [threading.Thread(target=consume, args=(i,)) for i in range(num_subscribers)]
+    threads.append(threading.Thread(target=consume_slowly))
+    for thread in threads:
+        thread.start()
+    start = time.perf_counter()
+    for _ in range(num_events // 2):
+        store.cancel_order(store.add_order(ORDER))
+    produced = time.perf_counter() - start
+    done.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    delivered = sum(received)
+    assert all(count == feed.last_seq for count in received)
+    return (
+        f"{num_subscribers:>4} subscribers",
+        f"produce {num_events / produced:9,.0f} ev/s",
+        f"delivered {delivered / elapsed:11,.0f} ev/s",
+        f"drain {elapsed:5.2f} s",
+        f"slow consumer resyncs {slow['resyncs']}",
+    )
+
+def main() -> None:
+    num_events = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    report("Publish overhead", publish_overhead())
+    report(f"Fan-out, {num_events:,} events", [fan_out(n, num_events) for n in (1, 8, 64, 256)])
+
+if __name__ == "__main__":
+    main()
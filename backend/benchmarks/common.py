@@ -0,0 +1,76 @@
+import time
+from typing import Callable, Optional, Tuple
+
+def measure(fn: Callable[[], object], number: int = 1000, repeat: int = 5) -> float:
+    """Best-of-``repeat`` mean time per call, in microseconds"""
+    best: Optional[float] = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6
+
+def measure_pair(first: Callable[[], object], second: Callable[[], object], rounds: int = 15, number: int = 5000) -> Tuple[float, float]:
+    """``measure`` for two candidates, interleaved so both see the same machine noise"""
+    best_first = best_second = float("inf")
+    for _ in range(rounds):
+        best_first = min(best_first, measure(first, number=number, repeat=1))
+        best_second = min(best_second, measure(second, number=number, repeat=1))
+    return best_first, best_second
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken when installed, otherwise the ~4 chars/token heuristic"""
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except Exception:
+        return max(1, len(text) // 4)
+
+def report(title: str, rows: list) -> None:
+    print(f"\n{title}")
+    width = max(len(str(row[0])) for row in rows)
+    for label, *values in rows:
+        print(f"  {str(label).ljust(width)}  " + "  ".join(str(v) for v in values))
+
+class StaticAIService:
+    """Stand-in for AIService that returns a fixed intent after a simulated provider delay"""
+
+    def __init__(self, intent: dict, latency: float = 0.0):
+        self.intent = intent
+        self.latency = latency
+
+    def parse_user_intent(self, message: str) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.intent
+
+def build_app(ai_service=None, order_store=None, admission=None):
+    """Minimal app with the orders router, wired like main.py but without a live provider.
+
+    Every location is a bare store and OrderService; ``order_store`` (when
+    given) backs the default one, also exposed as ``app.state.order_store``.
+    """
+    from fastapi import FastAPI
+    from app.api.routers.orders import router as orders_router
+    from app.core.config import Config
+    from app.models.db_models import OrderStore
+    from app.services.admission import AdmissionController
+    from app.services.locations import Location, LocationRegistry
+    from app.services.order_service import OrderService
+
+    def location(location_id: str) -> Location:
+        store = order_store if order_store is not None and location_id == Config.DEFAULT_LOCATION else OrderStore()
+        return Location(location_id, store, OrderService(store, ai_service))
+
+    app = FastAPI()
+    app.state.locations = LocationRegistry(location)
+    app.state.order_store = app.state.locations.default.order_store
+    app.state.order_service = app.state.locations.default.order_service
+    app.state.ai_service = ai_service
+    app.state.admission = admission or AdmissionController(
+        Config.PROCESS_MAX_CONCURRENCY, Config.PROCESS_MAX_QUEUE, Config.PROCESS_MAX_QUEUE_PER_LANE
+    )
+    app.include_router(orders_router)
+    return app
@@ -0,0 +1,132 @@
+"""Wait-time estimate error and update cost, on the simulated kitchen.
+
+Orders arrive as a Poisson process into the real KitchenService (batch
+scheduler) on a virtual clock, as in benchmarks/kitchen_simulation.py;
+about 10% add an item a little later and 3% are canceled. The
+EtaEstimator sees the same placed/modified/ready/canceled stream the
+store would publish, and every order's estimate at placement is compared
+with when it actually became ready. The first ``WARMUP`` orders are left
+out of the error figures. Baselines:
+
+- menu prep time: the slowest item's ``prep_seconds``, ignoring load;
+- recent average: an EWMA of placed -> ready over all orders.
+
+    python -m benchmarks.eta_simulation [num_orders]
+"""
+import heapq
+import random
+import statistics
+import sys
+from typing import Dict, List, Tuple
+
+from app.models.menu import MENU
+from app.services.eta_estimator import EtaEstimator
+from app.services.kitchen_service import KitchenService
+from app.utils.exception_utils import OrderNotFoundError
+from benchmarks.common import measure, report
+from benchmarks.kitchen_simulation import random_order
+
+WARMUP = 100
+
+def simulate(orders_per_hour: float, num_orders: int, seed: int = 7) -> Dict[str, List[float]]:
+    """Signed errors (estimate - actual, seconds) per estimator"""
+    rng = random.Random(seed)
+    kitchen = KitchenService(MENU, scheduler="batch")
+    estimator = EtaEstimator(MENU)
+    events: List[Tuple[float, int, str, object]] = []
+    seq = 0
+    now = 0.0
+    for order_id in range(1, num_orders + 1):
+        now += rng.expovariate(orders_per_hour / 3600)
+        events.append((now, seq, "arrive", (order_id, random_order(rng))))
+        seq += 1
+        roll = rng.random()
+        if roll < 0.10:
+            events.append((now + rng.uniform(10, 90), seq, "modify", order_id))
+            seq += 1
+        elif roll < 0.13:
+            events.append((now + rng.uniform(10, 120), seq, "cancel", order_id))
+            seq += 1
+    heapq.heapify(events)
+
+    placed: Dict[int, float] = {}
+    quantities = {}
+    predicted: Dict[int, Tuple[float, float, float]] = {}
+    errors: Dict[str, List[float]] = {"menu prep time": [], "recent average": [], "EtaEstimator": []}
+    recent = None
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if kind == "arrive":
+            order_id, order = payload
+            placed[order_id], quantities[order_id] = now, order
+            kitchen.enqueue(order_id, order, now=now)
+            estimator.place(order_id, order, now)
+            menu_time = max(MENU[item_id].prep_seconds for item_id, quantity in enumerate(order) if quantity)
+            predicted[order_id] = (menu_time, recent if recent is not None else menu_time, estimator.estimate(order_id, now))
+        elif kind == "modify":
+            if order_id_open(kitchen, payload):
+                order = quantities[payload] = quantities[payload][:]
+                order[rng.randrange(len(MENU))] += 1
+                kitchen.modify(payload, order, now=now)
+                estimator.modify(payload, order)
+        elif kind == "cancel":
+            if order_id_open(kitchen, payload):
+                kitchen.cancel(payload)
+                estimator.close(payload)
+                predicted.pop(payload, None)
+        else:
+            for order_id in kitchen.complete_batch(payload, now=now):
+                actual = now - placed[order_id]
+                estimator.ready(order_id, now)
+                kitchen.hand_off(order_id)
+                recent = actual if recent is None else recent + 0.05 * (actual - recent)
+                estimates = predicted.pop(order_id, None)
+                if estimates is not None and order_id > WARMUP:
+                    for name, estimate in zip(errors, estimates):
+                        errors[name].append(estimate - actual)
+        for batch in kitchen.schedule(now=now):
+            heapq.heappush(events, (batch.ready_at, seq, "complete", batch.id))
+            seq += 1
+    return errors
+
+def order_id_open(kitchen: KitchenService, order_id: int) -> bool:
+    # Only orders still waiting can change; ready ones are handed off straight away
+    try:
+        return kitchen.get_order_status(order_id)["state"] != "ready"
+    except OrderNotFoundError:
+        return False
+
+def update_cost() -> Tuple[float, float]:
+    """Microseconds per event (place + ready, averaged) and per estimate, with 30 orders open"""
+    estimator = EtaEstimator(MENU)
+    order = MENU.to_vector({"burgers": 2, "fries": 1, "drinks": 2})
+    for order_id in range(30):
+        estimator.place(order_id, order, 0.0)
+    next_id = iter(range(30, 10 ** 9))
+
+    def cycle():
+        order_id = next(next_id)
+        estimator.place(order_id, order, 0.0)
+        estimator.ready(order_id, 300.0)
+
+    return measure(cycle, number=20000) / 2, measure(lambda: estimator.estimate(5, 60.0), number=20000)
+
+def main() -> None:
+    num_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    for orders_per_hour in (15, 30, 45):
+        rows = []
+        for name, signed in simulate(orders_per_hour, num_orders).items():
+            absolute = sorted(abs(error) for error in signed)
+            rows.append((
+                name,
+                f"MAE {statistics.mean(absolute) / 60:5.2f}",
+                f"p90 {absolute[int(len(absolute) * 0.9)] / 60:5.2f}",
+                f"bias {statistics.mean(signed) / 60:+6.2f}",
+                f"within 2 min {sum(error <= 120 for error in absolute) / len(absolute):6.1%}",
+            ))
+        report(f"Estimate at placement vs actual wait, {orders_per_hour} orders/h (minutes)", rows)
+    per_event, per_estimate = update_cost()
+    report("Cost (us)", [("per event", f"{per_event:.2f}"), ("per estimate", f"{per_estimate:.2f}")])
+
+if __name__ == "__main__":
+    main()
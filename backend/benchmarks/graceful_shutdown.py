@@ -0,0 +1,132 @@
+"""SIGTERM under load: requests the server accepted must all be answered.
+
+Starts ``python main.py`` (production launch) with a replay provider that
+takes ``provider_latency`` seconds per call. ``clients`` clients, more than
+PROCESS_MAX_CONCURRENCY so some wait in admission, post to /api/v1/process
+back to back, each on a new connection. SIGTERM is sent partway through
+a round of calls. Every attempt ends up as one of:
+
+- answered: a response from the app (200, or a 503 shed by admission);
+- refused: the connection was not accepted because the server had stopped
+  listening, which a load balancer retries elsewhere;
+- cut off: still running when the drain bound ran out; uvicorn answers 500;
+- dropped: accepted, then closed without a response.
+
+With the default bound nothing sent before SIGTERM may be cut off or
+dropped. The second run uses a bound shorter than a provider call, to
+show what it cuts off. uvicorn re-raises the signal once it has shut
+down, so the server exits with -15.
+
+    python -m benchmarks.graceful_shutdown [clients] [provider_latency]
+"""
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, Tuple
+
+import httpx
+
+from benchmarks.common import report
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MESSAGE = "Two burgers please"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(
+    recording: str, port: int, drain_seconds: float, log_level: str = "WARNING", output=subprocess.DEVNULL
+) -> subprocess.Popen:
+    """Launch ``main.py``; its JSON log lines go to ``output``"""
+    env = {
+        **os.environ,
+        "AI_PROVIDER": "replay", "AI_REPLAY_FILE": recording, "AI_TIERS": "cloud",
+        "DEBUG": "false", "HOST": "127.0.0.1", "PORT": str(port), "LOG_LEVEL": log_level,
+        "SERVER_WORKERS": "1", "SERVER_DRAIN_SECONDS": str(drain_seconds),
+    }
+    server = subprocess.Popen([sys.executable, "main.py"], cwd=BACKEND, env=env, stdout=output)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+async def load(port: int, clients: int, server: subprocess.Popen, signal_after: float) -> Tuple[Counter, Counter, float]:
+    """(outcomes of attempts in flight or sent before SIGTERM, outcomes of later attempts, seconds to exit)"""
+    url = f"http://127.0.0.1:{port}/api/v1/process"
+    before: Counter = Counter()
+    after: Counter = Counter()
+    signaled_at = None
+    # No keep-alive: every attempt opens its own connection, so "accepted" is unambiguous
+    limits = httpx.Limits(max_keepalive_connections=0)
+
+    async def client(client_id: int, http: httpx.AsyncClient) -> None:
+        while server.poll() is None:
+            sent_at = time.monotonic()
+            try:
+                response = await http.post(url, json={"message": MESSAGE, "session_id": f"lane-{client_id}"})
+                outcome = "cut off" if response.status_code == 500 else f"answered {response.status_code}"
+            except httpx.ConnectError:
+                outcome = "refused"
+                await asyncio.sleep(0.05)
+            except httpx.TransportError as e:
+                outcome = f"dropped ({type(e).__name__})"
+            (before if signaled_at is None or sent_at < signaled_at else after)[outcome] += 1
+
+    async with httpx.AsyncClient(timeout=60, limits=limits) as http:
+        tasks = [asyncio.create_task(client(client_id, http)) for client_id in range(clients)]
+        await asyncio.sleep(signal_after)
+        signaled_at = time.monotonic()
+        server.send_signal(signal.SIGTERM)
+        await asyncio.gather(*tasks)
+    return before, after, time.monotonic() - signaled_at
+
+def run(recording: str, clients: int, latency: float, drain_seconds: float) -> Dict[str, object]:
+    port = free_port()
+    server = start_server(recording, port, drain_seconds)
+    try:
+        before, after, exit_seconds = asyncio.run(load(port, clients, server, signal_after=2.5 * latency))
+        server.wait(timeout=drain_seconds + 30)
+    finally:
+        if server.poll() is None:
+            server.kill()
+    return {"before": before, "after": after, "exit_seconds": exit_seconds, "exit_code": server.returncode}
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+    recording = os.path.join(tempfile.mkdtemp(), "slow.jsonl")
+    with open(recording, "w") as f:
+        result = {"success": True, "action": "place_order", "data": {"items": [{"item": "burgers", "quantity": 2}]}}
+        f.write(json.dumps({"m": MESSAGE, "r": result, "l": latency}) + "\n")
+
+    rows = []
+    for drain_seconds in (10.0, latency / 4):
+        outcome = run(recording, clients, latency, drain_seconds)
+        before = outcome["before"]
+        lost = sum(count for name, count in before.items() if name == "cut off" or name.startswith("dropped"))
+        rows.append((
+            f"SERVER_DRAIN_SECONDS={drain_seconds:g}",
+            "sent before SIGTERM: " + ", ".join(f"{name} {count}" for name, count in sorted(before.items())),
+            "| after: " + (", ".join(f"{name} {count}" for name, count in sorted(outcome["after"].items())) or "none"),
+            f"| exit {outcome['exit_code']} after {outcome['exit_seconds']:.1f} s",
+            "OK" if lost == 0 else f"{lost} LOST",
+        ))
+    report(f"{clients} clients, {latency:g} s provider calls, SIGTERM after {2.5 * latency:g} s", rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Concurrent duplicate /process submissions with an Idempotency-Key.
+
+Fires bursts of identical retries at the same key while the first attempt
+is still waiting on a slow provider, and checks that each key reaches the
+provider and the store exactly once.
+
+    python -m benchmarks.idempotency [num_keys] [retries_per_key]
+"""
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from app.services.admission import AdmissionController
+from benchmarks.common import StaticAIService, build_app, report
+
+class CountingAIService(StaticAIService):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def parse_user_intent(self, message: str) -> dict:
+        with self._lock:
+            self.calls += 1
+        return super().parse_user_intent(message)
+
+def main() -> None:
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    retries = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    ai = CountingAIService(
+        {"success": True, "action": "place_order", "data": {"items": [{"item": "burgers", "quantity": 1}]}},
+        latency=0.2,
+    )
+    # Room for the whole burst: this checks deduplication, not load shedding
+    burst = num_keys * retries
+    app = build_app(ai, admission=AdmissionController(burst, burst, burst))
+    client = TestClient(app)
+
+    def submit(attempt: int) -> dict:
+        key = f"lane-1-{attempt // retries}"
+        return client.post(
+            "/api/v1/process",
+            json={"message": "one burger please"},
+            headers={"Idempotency-Key": key},
+        ).json()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_keys * retries) as pool:
+        responses = list(pool.map(submit, range(num_keys * retries)))
+    elapsed = time.perf_counter() - start
+
+    order_ids = {response["order_id"] for response in responses}
+    assert ai.calls == num_keys, ai.calls
+    assert len(order_ids) == num_keys, order_ids
+    assert len(app.state.order_store.get_orders()) == num_keys
+
+    report(f"{num_keys} keys x {retries} concurrent submissions", [
+        ("requests", len(responses)),
+        ("provider calls", ai.calls),
+        ("orders created", len(order_ids)),
+        ("wall time", f"{elapsed:.2f} s"),
+    ])
+
+if __name__ == "__main__":
+    main()
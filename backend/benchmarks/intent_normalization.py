@@ -0,0 +1,141 @@
+"""Per-request cost of turning provider output into something the store can apply.
+
+"before" is the previous path, reproduced here: Pydantic v1-style
+``@validator`` hooks on OrderRequest and OrderItems, per-request
+``add_``/``remove_``/``set_`` key building and dict-based change lists.
+"after" validates into a typed command through the prebuilt
+``INTENT_COMMAND`` TypeAdapter and applies it.
+
+    python -m benchmarks.intent_normalization
+"""
+import warnings
+from array import array
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field, create_model, validator
+
+from app.core.config import Config
+from app.models.menu import MENU, REMOVE_ALL, clamp_quantity, to_int
+from app.schemas.schemas import OrderRequest, OrderItems, parse_intent_command, PlaceOrder, ModifyOrder
+from benchmarks.common import measure_pair, report
+
+MAX_QTY = Config.MAX_ITEM_QUANTITY
+CURRENT = MENU.to_vector({"burgers": 2, "fries": 1, "drinks": 2})
+
+INTENTS = {
+    "place, item list": {"action": "place_order", "data": {"items": [
+        {"item": "burgers", "quantity": 2}, {"item": "fries", "quantity": 1}, {"item": "drinks", "quantity": "3"},
+    ]}},
+    "place, flat keys": {"action": "place_order", "data": {"burgers": 2, "fries": 0, "drinks": "3"}},
+    "modify, changes": {"action": "modify_order", "data": {"order_id": 7, "changes": [
+        {"item": "burgers", "op": "add", "quantity": 2}, {"item": "fries", "op": "remove", "quantity": REMOVE_ALL},
+    ]}},
+    "modify, flat keys": {"action": "modify_order", "data": {"order_id": 7, "add_burgers": 2, "remove_fries": 999, "set_drinks": -1}},
+    "cancel": {"action": "cancel_order", "data": {"order_id": 7}},
+}
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+
+    class LegacyOrderRequest(BaseModel):
+        message: str = Field(..., min_length=1, max_length=500)
+
+        @validator("message")
+        def validate_message(cls, v):
+            cleaned = v.strip()
+            if not cleaned:
+                raise ValueError("Message cannot be empty")
+            return cleaned
+
+    class _LegacyOrderItemsBase(BaseModel):
+
+        @validator("*", pre=True)
+        def validate_quantities(cls, v):
+            if isinstance(v, str):
+                try:
+                    v = int(v)
+                except ValueError:
+                    v = 0
+            return max(0, v) if isinstance(v, (int, float)) else 0
+
+        def to_vector(self) -> array:
+            return MENU.to_vector({key: getattr(self, key) for key in MENU.keys})
+
+    LegacyOrderItems = create_model(
+        "LegacyOrderItems",
+        __base__=_LegacyOrderItemsBase,
+        # Quantities above the limit are rejected here, not clamped
+        **{key: (int, Field(0, ge=0)) for key in MENU.keys},
+    )
+
+def legacy_changes(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    changes = []
+    for key in MENU.keys:
+        set_qty = to_int(data.get("set_" + key, -1))
+        if set_qty >= 0:
+            changes.append({"item": key, "op": "set", "quantity": set_qty})
+            continue
+        add_qty = to_int(data.get("add_" + key, 0))
+        if add_qty > 0:
+            changes.append({"item": key, "op": "add", "quantity": add_qty})
+        remove_qty = to_int(data.get("remove_" + key, 0))
+        if remove_qty > 0:
+            changes.append({"item": key, "op": "remove", "quantity": remove_qty})
+    return changes
+
+def legacy_apply(vector: array, changes: List[Dict[str, Any]]) -> array:
+    result = array("i", vector)
+    for change in changes:
+        item = MENU.get(change.get("item"))
+        if item is None:
+            continue
+        op = change.get("op", "add")
+        quantity = to_int(change.get("quantity", 1))
+        if op == "set":
+            result[item.id] = clamp_quantity(quantity, MAX_QTY)
+        elif op == "remove":
+            result[item.id] = 0 if quantity >= REMOVE_ALL else max(0, result[item.id] - quantity)
+        else:
+            result[item.id] = clamp_quantity(result[item.id] + quantity, MAX_QTY)
+    return result
+
+def before(intent: Dict[str, Any]) -> Any:
+    LegacyOrderRequest(message="  two burgers please ")
+    action, data = intent["action"], intent["data"]
+    if action == "place_order":
+        if "items" in data:
+            return MENU.parse_item_list(data["items"], MAX_QTY)
+        return LegacyOrderItems(**data).to_vector()
+    if action == "modify_order":
+        changes = data.get("changes")
+        if changes is None:
+            changes = legacy_changes(data)
+        return legacy_apply(CURRENT, changes)
+    return data.get("order_id")
+
+def after(intent: Dict[str, Any]) -> Any:
+    OrderRequest(message="  two burgers please ")
+    command = parse_intent_command(intent)
+    if isinstance(command, PlaceOrder):
+        return MENU.item_vector(command.items, MAX_QTY)
+    if isinstance(command, ModifyOrder):
+        return MENU.apply_changes(CURRENT, command.changes, MAX_QTY)
+    return command.order_id
+
+def compare(label: str, old_fn, new_fn) -> tuple:
+    old, new = measure_pair(old_fn, new_fn)
+    return label, f"before {old:6.2f} us", f"after {new:6.2f} us", f"{old / new:4.1f}x"
+
+def main() -> None:
+    rows = []
+    for label, intent in INTENTS.items():
+        assert before(intent) == after(intent)
+        rows.append(compare(label, lambda: before(intent), lambda: after(intent)))
+    report("/process: request + intent normalization and apply, per request", rows)
+
+    body = {"burgers": 2, "fries": "1", "drinks": 3}
+    assert list(LegacyOrderItems(**body).to_vector()) == list(OrderItems(**body).to_vector())
+    report("POST /orders body", [compare("OrderItems", lambda: LegacyOrderItems(**body), lambda: OrderItems(**body))])
+
+if __name__ == "__main__":
+    main()
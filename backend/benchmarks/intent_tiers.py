@@ -0,0 +1,108 @@
+"""Per-tier coverage, accuracy and latency of tiered intent parsing.
+
+Synthesizes provider recordings (single messages plus multi-turn lane
+sessions), trains the local IntentModel on 80% of them and replays the
+other 20% through each tier on its own and through the rules -> local ->
+cloud chain. The cloud tier is a ReplayProvider over the held-out
+recordings, so its answers are the labels and its latency is the recorded
+one; the other tiers are timed for real.
+
+    python -m benchmarks.intent_tiers [num_records] [local_min_confidence]
+"""
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from app.services.ai_providers import IntentModel, LocalModelProvider, ReplayProvider, RuleProvider, TieredProvider
+from app.services.ai_providers.local_model import training_examples
+from benchmarks.common import report
+from benchmarks.recordings import synthesize, synthesize_sessions, write
+
+def canonical(result: Dict[str, Any]) -> Optional[tuple]:
+    """Comparable form of an intent: what the order service would actually do with it"""
+    if not result.get("success"):
+        return None
+    action, data = result.get("action"), result.get("data") or {}
+    if action == "place_order":
+        items = {}
+        for entry in data.get("items", []):
+            items[entry["item"]] = items.get(entry["item"], 0) + entry["quantity"]
+        return action, tuple(sorted(items.items()))
+    if action == "modify_order":
+        changes = sorted((c["item"], c.get("op", "add"), c["quantity"]) for c in data.get("changes", []))
+        return action, data.get("order_id"), tuple(changes)
+    return action, data.get("order_id")
+
+def main() -> None:
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    min_confidence = float(sys.argv[2]) if len(sys.argv) > 2 else 0.9
+    logging.disable(logging.WARNING)
+
+    records = synthesize(num_records) + synthesize_sessions(num_records // 4)
+    random.Random(3).shuffle(records)
+    split = int(len(records) * 0.8)
+    train, test = records[:split], records[split:]
+
+    start = time.perf_counter()
+    model = IntentModel.train(*training_examples(train))
+    train_seconds = time.perf_counter() - start
+
+    test_path = os.path.join(tempfile.mkdtemp(), "held_out.jsonl")
+    write(test_path, test)
+    recorded_latency = {record["m"]: record["l"] for record in test}
+    tiers = [
+        ("rules", RuleProvider(), 1.0),
+        ("local", LocalModelProvider(model), min_confidence),
+        ("cloud", ReplayProvider(test_path, latency_scale=0), 0.0),
+    ]
+
+    rows = []
+    for name, provider, threshold in tiers:
+        accepted = correct = 0
+        seconds = []
+        for record in test:
+            start = time.perf_counter()
+            result = provider.parse_intent(record["m"])
+            elapsed = time.perf_counter() - start
+            seconds.append(record["l"] if name == "cloud" else elapsed)
+            if result.get("confidence", 1.0) >= threshold:
+                accepted += 1
+                correct += canonical(result) == canonical(record["r"])
+        rows.append((
+            f"{name:<6}",
+            f"coverage {accepted / len(test):6.1%}",
+            f"accuracy when accepted {correct / max(accepted, 1):6.1%}",
+            f"mean {statistics.mean(seconds) * 1e3:8.3f} ms",
+        ))
+    report(f"Each tier alone, {len(test)} held-out requests (trained on {len(train)} in {train_seconds:.1f} s)", rows)
+
+    chain = TieredProvider(tiers)
+    for provider in (tier[1] for tier in tiers):
+        if isinstance(provider, ReplayProvider):
+            provider.reset()
+    served = {name: 0 for name, _, _ in tiers}
+    correct = 0
+    seconds = []
+    for record in test:
+        start = time.perf_counter()
+        result = chain.parse_intent(record["m"])
+        elapsed = time.perf_counter() - start
+        served[result["tier"]] += 1
+        correct += canonical(result) == canonical(record["r"])
+        seconds.append(elapsed + (recorded_latency[record["m"]] if result["tier"] == "cloud" else 0.0))
+
+    cloud_only = statistics.mean(record["l"] for record in test)
+    report(f"rules -> local (>= {min_confidence:g}) -> cloud", [
+        ("served by", ", ".join(f"{name} {count / len(test):.1%}" for name, count in served.items())),
+        ("accuracy", f"{correct / len(test):.2%}"),
+        ("cloud calls avoided", f"{1 - served['cloud'] / len(test):.1%}"),
+        ("mean latency", f"{statistics.mean(seconds) * 1e3:.1f} ms (cloud only {cloud_only * 1e3:.1f} ms)"),
+    ])
+
+if __name__ == "__main__":
+    main()
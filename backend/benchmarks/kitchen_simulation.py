@@ -0,0 +1,74 @@
+"""Discrete-event simulation of the kitchen queue: batch scheduler vs FIFO.
+
+Orders arrive as a Poisson process and go through the real KitchenService
+on a virtual clock. Every free lane starts a cycle as soon as it has work
+and each cycle takes the item's prep_seconds regardless of how many units
+it holds. Reports order completion time (placed -> ready).
+
+    python -m benchmarks.kitchen_simulation [orders_per_hour] [num_orders]
+"""
+import heapq
+import random
+import statistics
+import sys
+
+from app.models.menu import MENU
+from app.services.kitchen_service import KitchenService
+from benchmarks.common import report
+
+def random_order(rng: random.Random):
+    while True:
+        quantities = MENU.zeros()
+        for item_id in range(len(MENU)):
+            if rng.random() < 0.6:
+                quantities[item_id] = rng.randint(1, 3)
+        if sum(quantities):
+            return quantities
+
+def simulate(scheduler: str, orders_per_hour: float, num_orders: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    kitchen = KitchenService(MENU, scheduler=scheduler)
+    events = []  # (time, seq, kind, payload)
+    seq = 0
+    now = 0.0
+    for order_id in range(1, num_orders + 1):
+        now += rng.expovariate(orders_per_hour / 3600)
+        events.append((now, seq, "arrive", (order_id, random_order(rng))))
+        seq += 1
+    heapq.heapify(events)
+
+    placed = {}
+    completion = []
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if kind == "arrive":
+            order_id, quantities = payload
+            placed[order_id] = now
+            kitchen.enqueue(order_id, quantities, now=now)
+        else:
+            for order_id in kitchen.complete_batch(payload, now=now):
+                completion.append(now - placed[order_id])
+                kitchen.hand_off(order_id)
+        for batch in kitchen.schedule(now=now):
+            heapq.heappush(events, (batch.ready_at, seq, "complete", batch.id))
+            seq += 1
+    return completion
+
+def main() -> None:
+    orders_per_hour = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    num_orders = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    rows = []
+    for scheduler in ("fifo", "batch"):
+        times = sorted(simulate(scheduler, orders_per_hour, num_orders))
+        rows.append((
+            scheduler,
+            f"mean {statistics.mean(times) / 60:6.1f}",
+            f"p50 {times[len(times) // 2] / 60:6.1f}",
+            f"p95 {times[int(len(times) * 0.95)] / 60:6.1f}",
+            f"completed {len(times)}",
+        ))
+    report(f"Order completion time, {orders_per_hour:g} orders/h, {num_orders} orders (minutes)", rows)
+
+if __name__ == "__main__":
+    main()
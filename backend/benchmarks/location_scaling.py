@@ -0,0 +1,95 @@
+"""Store write throughput with 1 to 64 locations under concurrent writers.
+
+``WRITERS`` threads each serve one location (writer ``i`` -> location
+``i % locations``) and run orders through their lifecycle: place, modify,
+start, ready, complete, with every tenth order canceled instead. Each
+location is wired as in main.py (``Location.create``: kitchen queue,
+wait-time estimates and analytics columns as store listeners) plus the HQ
+aggregate. With 1 location every writer shares one store lock and one ID
+sequence, as before locations existed.
+
+Afterwards the HQ view is checked against the stores and each location's
+order IDs against 1..n.
+
+    python -m benchmarks.location_scaling [orders_per_writer] [writers]
+"""
+import logging
+import statistics
+import sys
+import threading
+import time
+from typing import List, Tuple
+
+from app.models.menu import MENU
+from app.models.order_status import OrderStatus
+from app.services.locations import Location, LocationRegistry
+from benchmarks.common import report
+
+def run(num_locations: int, writers: int, orders_per_writer: int) -> Tuple[float, List[float]]:
+    registry = LocationRegistry(lambda location_id: Location.create(location_id, None), allowed=[], max_locations=num_locations)
+    locations = [registry.default, *(registry.get(f"store-{i}") for i in range(1, num_locations))]
+    placed, modified = MENU.to_vector({"burgers": 2, "drinks": 1}), MENU.to_vector({"burgers": 1, "fries": 2, "drinks": 1})
+    barrier = threading.Barrier(writers + 1)
+    latencies: List[List[float]] = [[] for _ in range(writers)]
+
+    def write(writer: int) -> None:
+        store = locations[writer % num_locations].order_store
+        timings = latencies[writer]
+        clock = time.perf_counter
+        barrier.wait()
+        for n in range(orders_per_writer):
+            start = clock()
+            order_id = store.add_order(placed)
+            store.update_order(order_id, modified)
+            if n % 10 == 9:
+                store.cancel_order(order_id)
+            else:
+                for status in (OrderStatus.IN_PROGRESS, OrderStatus.READY, OrderStatus.COMPLETED):
+                    store.transition(order_id, status)
+            timings.append(clock() - start)
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(writers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    check(registry, writers * orders_per_writer)
+    return writers * orders_per_writer / elapsed, sorted(latency for timings in latencies for latency in timings)
+
+def check(registry: LocationRegistry, total_orders: int) -> None:
+    view = registry.aggregate.get_view()
+    assert sum(view["by_status"].values()) == total_orders, view["by_status"]
+    for location in registry:
+        store = location.order_store
+        counts = view["per_location"][location.id]
+        assert counts["by_status"] == store.count_by_status(), (location.id, counts, store.count_by_status())
+        assert counts["totals"] == store.get_totals(), location.id
+        assert sorted(store.get_all_orders()) == list(range(1, len(store.get_all_orders()) + 1)), location.id
+
+def main() -> None:
+    orders_per_writer = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    logging.disable(logging.WARNING)
+
+    rows = []
+    baseline = None
+    for num_locations in (1, 2, 4, 8, 16, 32, 64):
+        throughput, latencies = run(num_locations, writers, orders_per_writer)
+        baseline = baseline or throughput
+        rows.append((
+            f"{num_locations} location{'s' if num_locations > 1 else ''}",
+            f"{throughput:7.0f} orders/s",
+            f"x{throughput / baseline:4.2f}",
+            f"p50 {statistics.median(latencies) * 1e3:7.2f} ms",
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:7.2f} ms",
+        ))
+    report(
+        f"{writers} writer threads x {orders_per_writer} orders (6 store writes each; HQ view checked after every run)",
+        rows,
+    )
+
+if __name__ == "__main__":
+    main()
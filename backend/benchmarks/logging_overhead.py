@@ -0,0 +1,125 @@
+"""Request latency with INFO logging under high concurrency.
+
+``WORKERS`` threads drive OrderService.process_order_request with a fake
+provider (``PROVIDER_LATENCY`` seconds per call) while the app logs at
+INFO to a file:
+
+- stream handler: records are formatted and written by the request thread
+  under the handler lock (``logging.basicConfig``, as main.py used to);
+- queue + JSON: ``setup_logging``; request threads only enqueue records
+  and a listener thread formats and writes them;
+- queue + JSON + sampling: as above, keeping 10% of OrderService INFO lines.
+
+The last row is the per-call cost of ``str(response)`` for an OpenAI chat
+completion with one tool call, which every call used to pay for
+``raw_response`` and now only debug or sampled calls do.
+
+    python -m benchmarks.logging_overhead [requests] [workers]
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from app.core import logging_config
+from app.core.config import Config
+from app.models.db_models import OrderStore
+from app.models.menu import MENU
+from app.schemas.schemas import OrderRequest
+from app.services.ai_providers import AIProvider
+from app.services.ai_providers.base import function_calls_result
+from app.services.ai_service import AIService
+from app.services.order_service import OrderService
+from benchmarks.common import measure, report
+
+PROVIDER_LATENCY = 0.002
+
+def completion() -> Any:
+    """A chat completion shaped like the provider's answer to "Two drinks please" """
+    from openai.types.chat import ChatCompletion
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "finish_reason": "tool_calls", "message": {
+            "role": "assistant", "content": None,
+            "tool_calls": [{"id": "call_1", "type": "function", "function": {
+                "name": "modify_order",
+                "arguments": '{"order_id": 1, "changes": [{"item": "drinks", "op": "set", "quantity": 2}]}',
+            }}],
+        }}],
+        "usage": {"prompt_tokens": 900, "completion_tokens": 30, "total_tokens": 930},
+    })
+
+class FakeProvider(AIProvider):
+    def __init__(self, response: Any):
+        self.response = response
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        time.sleep(PROVIDER_LATENCY)
+        return function_calls_result(
+            [("modify_order", {"order_id": 1, "changes": [{"item": "drinks", "op": "set", "quantity": 2}]})],
+            self.response
+        )
+
+def run(mode: str, requests: int, workers: int, response: Any) -> List[float]:
+    path = os.path.join(tempfile.mkdtemp(), "app.log")
+    stream = open(path, "w")
+    logging.disable(logging.NOTSET)
+    root = logging.getLogger()
+    if mode == "stream handler":
+        logging_config.stop_logging()
+        root.handlers.clear()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter(Config.LOG_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+    else:
+        Config.LOG_SAMPLE_RATES = {"app.services.order_service": 0.1} if "sampling" in mode else {}
+        logging_config.setup_logging(stream)
+
+    store = OrderStore()
+    store.add_order(MENU.to_vector({"drinks": 1}))
+    service = OrderService(store, AIService(FakeProvider(response)))
+    request = OrderRequest(message="Two drinks please")
+
+    def handle(_: int) -> float:
+        start = time.perf_counter()
+        service.process_order_request(request)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = sorted(pool.map(handle, range(requests)))
+    logging_config.stop_logging()
+    root.handlers.clear()
+    stream.close()
+    return latencies
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    Config.LOG_LEVEL = "INFO"
+    Config.ENABLE_LOGGING = True
+    response = completion()
+
+    rows = []
+    for mode in ("stream handler", "queue + JSON", "queue + JSON + sampling"):
+        start = time.perf_counter()
+        latencies = run(mode, requests, workers, response)
+        elapsed = time.perf_counter() - start
+        rows.append((
+            mode,
+            f"p50 {statistics.median(latencies) * 1e3:6.2f} ms",
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:6.2f} ms",
+            f"{requests / elapsed:7.0f} req/s",
+        ))
+    rows.append(("str(response) per provider call", f"{measure(lambda: str(response), number=2000):6.1f} us"))
+    report(
+        f"{requests:,} requests, {workers} threads, {PROVIDER_LATENCY * 1e3:g} ms fake provider, LOG_LEVEL=INFO",
+        rows,
+    )
+
+if __name__ == "__main__":
+    main()
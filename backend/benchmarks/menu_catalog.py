@@ -0,0 +1,88 @@
+"""Menu catalog benchmark on a 200-item menu.
+
+Compares the per-item tool schema and dict-backed totals scan with the
+catalog's item-list schema and incremental vector totals.
+
+    python -m benchmarks.menu_catalog
+"""
+import json
+import random
+from typing import Dict
+
+from app.models.menu import MenuCatalog
+from app.models.db_models import OrderStore
+from app.services.ai_providers.base import get_function_definitions
+from benchmarks.common import measure, count_tokens, report
+
+MENU_SIZE = 200
+ACTIVE_ORDERS = 1000
+MAX_QTY = 50
+
+def build_menu(size: int) -> MenuCatalog:
+    return MenuCatalog.from_keys((f"item_{i}", f"item {i}", f"item {i}s") for i in range(size))
+
+def legacy_function_definitions(menu: MenuCatalog) -> list:
+    """Flat per-item parameters, as the schema looked before the catalog"""
+    place = {key: {"type": "integer", "description": f"Number of {key}", "default": 0} for key in menu.keys}
+    modify = {"order_id": {"type": "integer", "description": "The order number to modify"}}
+    for key in menu.keys:
+        modify[f"add_{key}"] = {"type": "integer", "description": f"Number of {key} to add", "default": 0}
+        modify[f"remove_{key}"] = {"type": "integer", "description": f"Number of {key} to remove (999=all)", "default": 0}
+        modify[f"set_{key}"] = {"type": "integer", "description": f"Set total {key} to this amount", "default": -1}
+    return [
+        {"name": "place_order", "parameters": {"type": "object", "properties": place}},
+        {"name": "modify_order", "parameters": {"type": "object", "properties": modify}},
+    ]
+
+def legacy_parse(menu: MenuCatalog, data: Dict[str, int]) -> Dict[str, int]:
+    items = {}
+    for key in menu.keys:
+        value = data.get(key, 0)
+        items[key] = min(max(0, int(value)), MAX_QTY)
+    return items
+
+def legacy_totals(menu: MenuCatalog, orders: list) -> Dict[str, int]:
+    totals = {key: 0 for key in menu.keys}
+    for items in orders:
+        for key, quantity in items.items():
+            if key in totals:
+                totals[key] += quantity
+    return totals
+
+def main() -> None:
+    rng = random.Random(7)
+    menu = build_menu(MENU_SIZE)
+
+    legacy_schema = json.dumps(legacy_function_definitions(menu))
+    compact_schema = json.dumps(get_function_definitions(menu))
+    report("Tool schema prompt tokens", [
+        ("per-item params", count_tokens(legacy_schema)),
+        ("item-list arg", count_tokens(compact_schema)),
+    ])
+
+    picks = rng.sample(menu.keys, 4)
+    flat_data = {key: rng.randint(1, 3) for key in picks}
+    list_data = [{"item": key, "quantity": qty} for key, qty in flat_data.items()]
+    report("Parse provider output (us/call)", [
+        ("flat per-item dict", f"{measure(lambda: legacy_parse(menu, flat_data)):.2f}"),
+        ("item list -> vector", f"{measure(lambda: menu.parse_item_list(list_data, MAX_QTY)):.2f}"),
+    ])
+
+    store = OrderStore(menu)
+    legacy_orders = []
+    for _ in range(ACTIVE_ORDERS):
+        vector = menu.parse_item_list(
+            [{"item": key, "quantity": rng.randint(1, 3)} for key in rng.sample(menu.keys, 4)],
+            MAX_QTY,
+        )
+        store.add_order(vector)
+        legacy_orders.append(menu.to_dict(vector))
+
+    new_order = menu.parse_item_list(list_data, MAX_QTY)
+    report(f"Totals after one new order, {ACTIVE_ORDERS} active (us/call)", [
+        ("rescan all orders", f"{measure(lambda: legacy_totals(menu, legacy_orders), number=20):.2f}"),
+        ("vector add + read", f"{measure(lambda: (store._add_totals(new_order, 1), store.get_totals()), number=1000):.2f}"),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Fast/strong model routing on recorded traffic: agreement, latency and cost.
+
+Replays a fast-model and a strong-model recording of the same messages
+through ModelRouter, and through each model alone. Record real traffic
+with AI_RECORD_FILE once per model (same messages) and pass both files;
+without them both are synthesized. The strong recording is then the
+label set. The fast model answers in ~40% of the time, and it misreads
+the hard cases: it drops the second request of compound messages, forgets
+"each", loses the order a "that" refers to, and fails 2% of everything
+else outright.
+
+Agreement is measured against the strong recording. Latency per request
+is the recorded latency of every call made, including escalations. Cost
+is in strong-call units with a fast call costing ``FAST_COST``.
+
+    python -m benchmarks.model_routing [fast.jsonl.gz strong.jsonl.gz] [max_complexity]
+"""
+import copy
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from app.services.ai_providers import ComplexityScorer, ModelRouter, ReplayProvider
+from app.services.ai_providers.replay_provider import load_recording
+from benchmarks.common import report
+from benchmarks.intent_tiers import canonical
+from benchmarks.multi_action import RoundTrips
+from benchmarks.recordings import NAMES, NUMBERS, merge_compound, synthesize, synthesize_sessions, write
+
+FAST_COST = 0.25
+FAST_LATENCY = 0.4
+
+def outcome(result: Dict[str, Any]) -> Optional[tuple]:
+    if not result.get("success"):
+        return None
+    return tuple(canonical({"success": True, **intent}) for intent in result.get("actions", [result]))
+
+def multiplier_requests(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    records = []
+    for _ in range(count):
+        people = rng.choice([2, 3, 4])
+        item = rng.choice(list(NAMES))
+        opener = "My friend and I each want" if people == 2 else f"{NUMBERS[people].capitalize()} of us want"
+        message = f"{opener} a {NAMES[item][0]}" + ("" if people == 2 else " each")
+        records.append({
+            "m": message,
+            "r": {"success": True, "action": "place_order", "data": {"items": [{"item": item, "quantity": people}]}},
+            "l": round(min(5.0, rng.lognormvariate(-0.5, 0.35)), 4),
+        })
+    return records
+
+def fast_answer(rng: random.Random, record: Dict[str, Any]) -> Dict[str, Any]:
+    """What a smaller model plausibly records for a message the strong model got right"""
+    result = copy.deepcopy(record["r"])
+    message = record["m"].lower()
+    if "actions" in result and rng.random() < 0.4:
+        del result["actions"]
+    elif " each" in message and rng.random() < 0.5:
+        for entry in result["data"]["items"]:
+            entry["quantity"] = 1
+    elif record.get("s") and result.get("action") in ("modify_order", "cancel_order") and rng.random() < 0.3:
+        result["data"]["order_id"] = None
+    elif rng.random() < 0.02:
+        result = {"success": False, "error": "No function call detected"}
+    return {"m": record["m"], "r": result, "l": round(record["l"] * FAST_LATENCY, 4)}
+
+def main() -> None:
+    args = sys.argv[1:]
+    max_complexity = float(args.pop()) if args and not args[-1].endswith((".jsonl", ".gz")) else 1.0
+    logging.disable(logging.WARNING)
+    directory = tempfile.mkdtemp()
+    if len(args) == 2:
+        fast_path, strong_path = args
+        source = f"{fast_path} vs {strong_path}"
+    else:
+        rng = random.Random(9)
+        strong = merge_compound(synthesize(6000)) + synthesize_sessions(1000) + multiplier_requests(rng, 300)
+        rng.shuffle(strong)
+        # One recording per message, so each message has a single label
+        unique = {}
+        for record in strong:
+            unique.setdefault(record["m"], {key: record[key] for key in ("m", "r", "l", "s") if key in record})
+        strong = list(unique.values())
+        fast_path, strong_path = os.path.join(directory, "fast.jsonl"), os.path.join(directory, "strong.jsonl")
+        write(fast_path, [fast_answer(rng, record) for record in strong])
+        write(strong_path, strong)
+        source = f"{len(strong):,} synthetic requests"
+
+    labels = {record["m"]: outcome(record["r"]) for record in load_recording(strong_path)}
+    messages = [record["m"] for record in load_recording(strong_path)]
+    latencies = {path: {r["m"]: r.get("l", 0.0) for r in load_recording(path)} for path in (fast_path, strong_path)}
+    scorer = ComplexityScorer()
+
+    rows, router_stats = [], None
+    for name in ("strong only", "fast only", f"routed (< {max_complexity:g})"):
+        fast = RoundTrips(ReplayProvider(fast_path, latency_scale=0), latencies[fast_path], single_call=False)
+        strong = RoundTrips(ReplayProvider(strong_path, latency_scale=0), latencies[strong_path], single_call=False)
+        provider = {"strong only": strong, "fast only": fast}.get(name) or ModelRouter(fast, strong, max_complexity)
+        agree, seconds = 0, []
+        for message in messages:
+            spent = fast.seconds + strong.seconds
+            agree += outcome(provider.parse_intent(message)) == labels[message]
+            seconds.append(fast.seconds + strong.seconds - spent)
+        seconds.sort()
+        rows.append((
+            name,
+            f"agreement {agree / len(messages):6.1%}",
+            f"p50 {statistics.median(seconds) * 1e3:5.0f} ms",
+            f"p95 {seconds[int(len(seconds) * 0.95)] * 1e3:5.0f} ms",
+            f"cost {(strong.calls + FAST_COST * fast.calls) / len(messages):5.3f}",
+            f"fast calls {fast.calls:>6,}  strong calls {strong.calls:>6,}",
+        ))
+        if isinstance(provider, ModelRouter):
+            router_stats = provider.get_stats()
+
+    report(f"{source}; fast call = {FAST_COST:g} strong calls", rows)
+    scores = sorted(scorer.score(message) for message in messages)
+    print(f"\n  complexity p50 {statistics.median(scores):.2f}, p90 {scores[int(len(scores) * 0.9)]:.2f}; "
+          f"router stats {router_stats}")
+
+if __name__ == "__main__":
+    main()
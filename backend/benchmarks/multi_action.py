@@ -0,0 +1,128 @@
+"""Provider round trips per resolved customer request, single vs parallel tool calls.
+
+Replays a recording (synthetic by default, with ~15% of requests joined
+into two-request messages by ``merge_compound``) through OrderService twice:
+
+- single call: the provider only returns the first function call, as the
+  old ``functions`` API did, so the customer repeats each dropped request
+  and every repeat is another round trip;
+- parallel calls: one round trip returns every action, applied under one
+  store lock acquisition.
+
+Provider time is the recorded latency of each call made. Both runs must
+apply the same number of actions. The last rows time applying a
+two-action intent in-process, one transaction vs one call per action.
+
+    python -m benchmarks.multi_action [recording.jsonl.gz | num_records]
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from app.models.db_models import OrderStore
+from app.schemas.schemas import OrderRequest
+from app.services.ai_providers import AIProvider, ReplayProvider
+from app.services.ai_providers.replay_provider import load_recording
+from app.services.ai_service import AIService
+from app.services.order_service import OrderService
+from benchmarks.common import measure_pair, report
+from benchmarks.recordings import merge_compound, synthesize, write
+
+class RoundTrips(AIProvider):
+    """Counts provider calls and their recorded latency; ``single_call`` drops all but the first action"""
+
+    def __init__(self, inner: AIProvider, latencies: Dict[str, float], single_call: bool):
+        self.inner = inner
+        self.latencies = latencies
+        self.single_call = single_call
+        self.calls = 0
+        self.seconds = 0.0
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        self.calls += 1
+        self.seconds += self.latencies.get(message, 0.0)
+        result = self.inner.parse_intent(message)
+        if self.single_call and "actions" in result:
+            result = {key: value for key, value in result.items() if key != "actions"}
+        return result
+
+def parts(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The requests a compound record is made of; real recordings only have the joined message"""
+    if "p" in record:
+        return record["p"]
+    return [
+        {"m": f"{record['m']} ({i + 1})", "r": {"success": True, **action}, "l": record["l"]}
+        for i, action in enumerate(record["r"].get("actions", [record["r"]]))
+    ]
+
+def run(records: List[Dict[str, Any]], replay_path: str, latencies: Dict[str, float], single_call: bool) -> tuple:
+    provider = RoundTrips(ReplayProvider(replay_path, latency_scale=0), latencies, single_call)
+    service = OrderService(OrderStore(), AIService(provider))
+    round_trips, seconds, applied = [], [], 0
+    for record in records:
+        calls, spent = provider.calls, provider.seconds
+        response = service.process_order_request(OrderRequest(message=record["m"]))
+        applied += sum(r.success for r in response.results) if response.results else response.success
+        if single_call and "actions" in record["r"]:
+            # The customer repeats whatever the first answer dropped
+            for part in parts(record)[1:]:
+                applied += service.process_order_request(OrderRequest(message=part["m"])).success
+        round_trips.append(provider.calls - calls)
+        seconds.append(provider.seconds - spent)
+    return round_trips, seconds, applied
+
+def main() -> None:
+    arg = sys.argv[1] if len(sys.argv) > 1 else "8000"
+    logging.disable(logging.WARNING)
+    if arg.isdigit():
+        records, source = merge_compound(synthesize(int(arg))), f"{int(arg):,} synthetic requests"
+    else:
+        records, source = load_recording(arg), arg
+
+    # The replay file also answers the repeated parts of compound requests
+    replay = [record for record in records]
+    replay += [part for record in records if "actions" in record["r"] for part in parts(record)[1:]]
+    replay_path = os.path.join(tempfile.mkdtemp(), "multi_action.jsonl")
+    write(replay_path, [{"m": r["m"], "r": r["r"], "l": r.get("l", 0.0)} for r in replay])
+    latencies = {r["m"]: r.get("l", 0.0) for r in replay}
+
+    compound = [i for i, record in enumerate(records) if "actions" in record["r"]]
+    rows = []
+    for name, single_call in (("single call", True), ("parallel calls", False)):
+        round_trips, seconds, applied = run(records, replay_path, latencies, single_call)
+        compound_seconds = sorted(seconds[i] for i in compound) or [0.0]
+        rows.append((
+            name,
+            f"round trips/request {statistics.mean(round_trips):5.3f}",
+            f"compound {statistics.mean(round_trips[i] for i in compound) if compound else 0:4.2f}",
+            f"provider s/compound p50 {statistics.median(compound_seconds):5.3f} "
+            f"p95 {compound_seconds[int(len(compound_seconds) * 0.95)]:5.3f}",
+            f"total provider {sum(seconds):8.1f} s",
+            f"actions applied {applied:,}",
+        ))
+    report(f"{source}, {len(compound):,} with two requests in one message", rows)
+
+    # In-process: both actions under one lock acquisition vs one execute_action each
+    # (modifications of one order, so the store does not grow between rounds)
+    service = OrderService(OrderStore(), None)
+    order_id = service.order_store.add_order(service.menu.to_vector({"burgers": 1}))
+    first = {"success": True, "action": "modify_order", "data": {
+        "order_id": order_id, "changes": [{"item": "burgers", "op": "set", "quantity": 2}]}}
+    second = {"success": True, "action": "modify_order", "data": {
+        "order_id": order_id, "changes": [{"item": "fries", "op": "set", "quantity": 1}]}}
+    both = {**first, "actions": [first, second]}
+    separate, combined = measure_pair(
+        lambda: (service.execute_action(first), service.execute_action(second)),
+        lambda: service.execute_action(both),
+        number=2000,
+    )
+    report("Applying two actions in-process", [
+        ("one execute_action per action", f"{separate:7.2f} us"),
+        ("one transaction, one response", f"{combined:7.2f} us"),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Server CPU and bytes sent for dashboards polling GET /api/v1/orders.
+
+``POLLERS`` clients poll once a (simulated) second while orders change
+rarely. Requests go straight into the ASGI app, so the CPU time measured
+is the server's: routing, the handler and encoding, no HTTP client.
+
+- legacy: the previous handler, which builds and encodes the full
+  response on every poll, behind a sync dependency (a thread pool round
+  trip per request);
+- etag: clients send If-None-Match and get 304 until the store changes;
+- etag + compression: as above, also accepting brotli/gzip (the encoded
+  and compressed bodies are cached per store version).
+
+Bytes count the status line, headers and body.
+
+    python -m benchmarks.order_polling [pollers] [active_orders] [seconds] [mutations_per_second]
+"""
+import asyncio
+import logging
+import random
+import sys
+import time
+from typing import Annotated, Dict, Optional, Tuple
+
+from fastapi import Depends, Request
+
+from app.models.menu import MENU
+from app.services.order_service import OrderService
+from app.utils import json_utils
+from app.utils.exception_utils import handle_exceptions
+from app.utils.json_utils import OrderJSONResponse
+from benchmarks.common import build_app, report
+
+async def get(app, path: str, headers: Dict[str, str]) -> Tuple[int, int, Optional[str]]:
+    """One request through the ASGI app: (status, bytes on the wire, ETag)"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    status, size, etag = 0, 0, None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, size, etag
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            size += len("HTTP/1.1 200 OK\r\n\r\n")
+            for name, value in message["headers"]:
+                size += len(name) + len(value) + 4
+                if name == b"etag":
+                    etag = value.decode()
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size, etag
+
+async def run(mode: str, pollers: int, active_orders: int, seconds: int, mutation_rate: float) -> Tuple[float, int, int]:
+    app = build_app()
+    order_service = app.state.order_service
+    store = order_service.order_store
+    for i in range(active_orders):
+        store.add_order(MENU.to_vector({"burgers": i % 3 + 1, "fries": i % 2, "drinks": 1}))
+
+    # As before: a sync dependency and handler, and a full response per poll
+    def sync_order_service(request: Request) -> OrderService:
+        return request.app.state.order_service
+
+    @app.get("/legacy/orders")
+    @handle_exceptions
+    def legacy_orders(order_service: Annotated[OrderService, Depends(sync_order_service)]) -> OrderJSONResponse:
+        return OrderJSONResponse(order_service.get_current_orders(), order_service.order_store.get_snapshot())
+
+    path = "/legacy/orders" if mode == "legacy" else "/api/v1/orders"
+    etags: Dict[int, Optional[str]] = {poller: None for poller in range(pollers)}
+    rng = random.Random(2)
+    sent, not_modified = 0, 0
+    cpu = time.process_time()
+    for _ in range(seconds):
+        if rng.random() < mutation_rate:
+            order_id = rng.randint(1, active_orders)
+            store.update_order(order_id, MENU.to_vector({"burgers": rng.randint(1, 4), "drinks": 1}))
+        for poller in range(pollers):
+            headers = {}
+            if mode != "legacy" and etags[poller]:
+                headers["If-None-Match"] = etags[poller]
+            if mode == "etag + compression":
+                headers["Accept-Encoding"] = "br, gzip"
+            status, size, etag = await get(app, path, headers)
+            etags[poller] = etag or etags[poller]
+            sent += size
+            not_modified += status == 304
+    return time.process_time() - cpu, sent, not_modified
+
+def main() -> None:
+    pollers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    active_orders = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    seconds = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    mutation_rate = float(sys.argv[4]) if len(sys.argv) > 4 else 0.1
+    logging.disable(logging.WARNING)
+
+    rows = []
+    for mode in ("legacy", "etag", "etag + compression"):
+        cpu, sent, not_modified = asyncio.run(run(mode, pollers, active_orders, seconds, mutation_rate))
+        polls = pollers * seconds
+        rows.append((
+            mode,
+            f"CPU {cpu / seconds * 100:5.1f}% of a core",
+            f"{cpu / polls * 1e6:6.0f} us/poll",
+            f"{sent / seconds / 1e6:7.3f} MB/s sent",
+            f"{sent / polls:7.0f} B/poll",
+            f"304s {not_modified / polls:6.1%}",
+        ))
+    compression = "brotli" if json_utils.brotli is not None else "gzip (brotli not installed)"
+    report(
+        f"{pollers} pollers at 1 Hz for {seconds} s, {active_orders} active orders, "
+        f"{mutation_rate:g} mutations/s; compression: {compression}",
+        rows,
+    )
+
+if __name__ == "__main__":
+    main()
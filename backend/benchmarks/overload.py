@@ -0,0 +1,150 @@
+"""Goodput of /process under overload, with and without admission control.
+
+A slow fake provider (log-normal latency around ``LATENCY`` seconds, and a
+client-side timeout at the request's deadline budget like the real SDKs)
+serves ``CONCURRENCY`` requests at a time. An open-loop generator sends
+``OVERLOAD`` times that capacity for ``DURATION`` seconds, from one hot
+lane and three quiet ones, each request allowing ``DEADLINE`` seconds.
+Goodput counts 200 responses the client got within its deadline:
+
+- no deadline: the server does not know the client's deadline (the old
+  behavior), so the backlog grows and almost every answer comes too late;
+- deadline only: stale requests are dropped before the provider call, but
+  each one still waits its turn in the thread pool first;
+- admission: requests the queue cannot serve in time get an early 503 with
+  Retry-After, and lanes take turns, so quiet lanes are not starved.
+
+    python -m benchmarks.overload [duration_seconds] [overload_factor]
+"""
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+import anyio.to_thread
+import httpx
+
+from app.core import deadline
+from app.core.config import Config
+from app.models.db_models import OrderStore
+from app.models.menu import MENU
+from app.services.admission import AdmissionController
+from app.services.ai_providers import AIProvider
+from app.services.ai_service import AIService
+from benchmarks.common import build_app, report
+
+CONCURRENCY = 16
+LATENCY = 0.4
+DEADLINE = 1.5
+LANES = {"lane-0": 0.55, "lane-1": 0.15, "lane-2": 0.15, "lane-3": 0.15}
+
+INTENT = {"success": True, "action": "modify_order", "data": {
+    "order_id": 1, "changes": [{"item": "drinks", "op": "set", "quantity": 2}],
+}}
+
+class SlowProvider(AIProvider):
+    """Sleeps like a provider call; gives up at the deadline budget as the SDK timeouts do"""
+
+    def __init__(self, latency: float, seed: int = 3):
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.calls = 0
+
+    def parse_intent(self, message: str) -> Dict[str, Any]:
+        self.calls += 1
+        latency = self.rng.lognormvariate(0, 0.3) * self.latency
+        timeout = deadline.budget(Config.AI_REQUEST_TIMEOUT)
+        time.sleep(min(latency, timeout))
+        if latency > timeout:
+            return {"success": False, "error": "API error: Request timed out."}
+        return dict(INTENT)
+
+async def run(mode: str, rate: float, duration: float) -> Tuple[Counter, Dict[str, Counter], List[float], int]:
+    # The thread pool is the server's worker capacity in every mode
+    anyio.to_thread.current_default_thread_limiter().total_tokens = CONCURRENCY
+    unlimited = 10 ** 9
+    admission = (
+        AdmissionController(CONCURRENCY, 64, 16, initial_service_seconds=LATENCY)
+        if mode == "admission" else AdmissionController(unlimited, unlimited, unlimited)
+    )
+    provider = SlowProvider(LATENCY)
+    order_store = OrderStore()
+    order_store.add_order(MENU.to_vector({"drinks": 1}))
+    app = build_app(AIService(provider), order_store, admission)
+    # Without propagation the server only knows its own timeout
+    header = str(int(DEADLINE * 1000 if mode != "no deadline" else Config.DEFAULT_REQUEST_TIMEOUT * 1000))
+
+    totals: Counter = Counter()
+    lanes: Dict[str, Counter] = {lane: Counter() for lane in LANES}
+    good_latencies: List[float] = []
+    rng = random.Random(1)
+
+    async def send(client: httpx.AsyncClient, lane: str) -> None:
+        start = time.monotonic()
+        response = await client.post(
+            "/api/v1/process",
+            json={"message": "Two drinks please", "session_id": lane},
+            headers={"X-Deadline-Ms": header},
+        )
+        elapsed = time.monotonic() - start
+        if response.status_code == 200 and elapsed <= DEADLINE:
+            outcome = "good"
+            good_latencies.append(elapsed)
+        elif response.status_code == 200:
+            outcome = "late"
+        else:
+            outcome = str(response.status_code)
+        totals[outcome] += 1
+        lanes[lane][outcome] += 1
+        lanes[lane]["sent"] += 1
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        tasks = []
+        start = time.monotonic()
+        next_at = start
+        names, weights = list(LANES), list(LANES.values())
+        while next_at < start + duration:
+            await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+            lane = rng.choices(names, weights)[0]
+            tasks.append(asyncio.create_task(send(client, lane)))
+            next_at += rng.expovariate(rate)
+        await asyncio.gather(*tasks)
+    return totals, lanes, good_latencies, provider.calls
+
+def main() -> None:
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    overload = float(sys.argv[2]) if len(sys.argv) > 2 else 2.5
+    logging.disable(logging.CRITICAL)
+    capacity = CONCURRENCY / LATENCY
+    rate = capacity * overload
+
+    rows, fairness = [], []
+    for mode in ("no deadline", "deadline only", "admission"):
+        totals, lanes, good, calls = asyncio.run(run(mode, rate, duration))
+        sent = sum(totals.values())
+        rows.append((
+            mode,
+            f"goodput {totals['good'] / duration:5.1f}/s ({totals['good'] / sent:5.1%})",
+            f"late {totals['late']:>5,}",
+            f"503 {totals['503']:>5,}",
+            f"504 {totals['504']:>5,}",
+            f"provider calls {calls:>5,}",
+            f"good p50 {statistics.median(good) * 1e3 if good else 0:5.0f} ms",
+        ))
+        fairness.append((mode, *(
+            f"{lane} {lanes[lane]['good'] / max(1, lanes[lane]['sent']):5.1%}" for lane in LANES
+        )))
+
+    report(
+        f"{rate:.0f} req/s offered for {duration:g} s against capacity {capacity:.0f}/s "
+        f"({CONCURRENCY} workers, ~{LATENCY * 1e3:.0f} ms provider), {DEADLINE:g} s deadline",
+        rows,
+    )
+    report("Share of each lane's requests answered in time (lane-0 sends 55%)", fairness)
+
+if __name__ == "__main__":
+    main()
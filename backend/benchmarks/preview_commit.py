@@ -0,0 +1,61 @@
+"""Confirmation latency: one-phase /process vs preview + commit.
+
+One-phase runs the provider when the customer confirms. Two-phase runs it
+during the preview (while the customer is still looking at the screen) and
+the confirmation is only POST /process/commit. The provider is a stand-in
+with a fixed delay.
+
+    python -m benchmarks.preview_commit [num_orders] [llm_latency_s]
+"""
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.common import StaticAIService, build_app, report
+
+PLACE_INTENT = {
+    "success": True,
+    "action": "place_order",
+    "data": {"items": [{"item": "burgers", "quantity": 2}, {"item": "drinks", "quantity": 1}]},
+}
+MESSAGE = "two burgers and a drink"
+
+def main() -> None:
+    num_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    llm_latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.4
+
+    ai_service = StaticAIService(PLACE_INTENT, llm_latency)
+    client = TestClient(build_app(ai_service))
+
+    one_phase = []
+    for _ in range(num_orders):
+        start = time.perf_counter()
+        response = client.post("/api/v1/process", json={"message": MESSAGE})
+        one_phase.append(time.perf_counter() - start)
+        assert response.json()["action"] == "placed", response.text
+
+    preview, commit = [], []
+    for _ in range(num_orders):
+        start = time.perf_counter()
+        response = client.post("/api/v1/process", json={"message": MESSAGE, "mode": "preview"})
+        preview.append(time.perf_counter() - start)
+        token = response.json()["preview_token"]
+
+        start = time.perf_counter()
+        response = client.post("/api/v1/process/commit", json={"token": token})
+        commit.append(time.perf_counter() - start)
+        assert response.json()["action"] == "placed", response.text
+
+    replay = client.post("/api/v1/process/commit", json={"token": token}).json()
+    assert not replay["success"], "a token must commit only once"
+
+    mean_ms = lambda samples: f"{sum(samples) / len(samples) * 1e3:8.2f} ms"
+    report(f"Mean latency per order, {num_orders} orders, {llm_latency}s provider", [
+        ("one-phase /process (on confirm)", mean_ms(one_phase)),
+        ("preview (before confirm)", mean_ms(preview)),
+        ("commit (on confirm)", mean_ms(commit)),
+    ])
+
+if __name__ == "__main__":
+    main()
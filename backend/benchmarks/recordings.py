@@ -0,0 +1,170 @@
+"""Synthetic provider recordings in the RecordingProvider file format.
+
+Used when no production recording is at hand:
+
+    python -m benchmarks.recordings out.jsonl.gz [num_records] [--sessions] [--compound]
+
+``--sessions`` writes multi-turn lane sessions instead: each record also
+carries ``"s"`` (session ID), and follow-ups refer back to the session's
+order ("add a drink to that") while the recorded result holds the order ID
+a context-aware model would resolve.
+
+``--compound`` joins some consecutive requests into one message ("Cancel
+order 3 and I want two burgers") recorded with every action, as a provider
+making parallel tool calls returns them.
+"""
+import gzip
+import json
+import random
+import sys
+import time
+from typing import Dict, Any, List
+
+NUMBERS = {1: "one", 2: "two", 3: "three", 4: "four"}
+NAMES = {"burgers": ("burger", "burgers"), "fries": ("fries", "fries"), "drinks": ("drink", "drinks")}
+
+def _phrase(rng: random.Random, item: str, quantity: int) -> str:
+    singular, plural = NAMES[item]
+    count = NUMBERS[quantity] if rng.random() < 0.5 else str(quantity)
+    return f"{count} {singular if quantity == 1 else plural}"
+
+def _join(parts: List[str]) -> str:
+    return parts[0] if len(parts) == 1 else ", ".join(parts[:-1]) + " and " + parts[-1]
+
+def synthesize(num_records: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    records = []
+    now = time.time()
+    next_order = 1
+    for i in range(num_records):
+        roll = rng.random()
+        if roll < 0.7 or next_order == 1:
+            chosen = rng.sample(list(NAMES), rng.randint(1, 3))
+            items = [{"item": item, "quantity": rng.randint(1, 4)} for item in chosen]
+            prefix = rng.choice(["I want", "Can I get", "Give me", "I'd like"])
+            message = f"{prefix} {_join([_phrase(rng, e['item'], e['quantity']) for e in items])}"
+            result = {"success": True, "action": "place_order", "data": {"items": items}}
+            next_order += 1
+        elif roll < 0.85:
+            order_id = rng.randint(1, next_order - 1)
+            item = rng.choice(list(NAMES))
+            quantity = rng.randint(1, 3)
+            message = f"Add {_phrase(rng, item, quantity)} to order {order_id}"
+            result = {
+                "success": True,
+                "action": "modify_order",
+                "data": {"order_id": order_id, "changes": [{"item": item, "op": "add", "quantity": quantity}]},
+            }
+        elif roll < 0.97:
+            order_id = rng.randint(1, next_order - 1)
+            message = rng.choice([f"Cancel order {order_id}", f"Please cancel my order #{order_id}"])
+            result = {"success": True, "action": "cancel_order", "data": {"order_id": order_id}}
+        else:
+            message = rng.choice(["Hello?", "What do you have", "hmm let me think"])
+            result = {"success": False, "error": "No function call detected"}
+
+        # Provider latency is roughly log-normal around ~600 ms
+        latency = round(min(5.0, rng.lognormvariate(-0.5, 0.35)), 4)
+        records.append({"m": message, "r": result, "l": latency, "t": round(now + i * 2.0, 3)})
+    return records
+
+FOLLOW_UPS = [
+    # (message template, changes) - {n}/{item} are filled per turn
+    ("Add {n} {item} to that", "add"),
+    ("can you add {n} more {item} to my order", "add"),
+    ("Actually make that {n} {item}", "set"),
+    ("remove the {item} from it", "remove"),
+    ("Oh and {n} {item} for my friend too", "add"),
+    ("could we also get {n} {item} on that order please", "add"),
+]
+
+def synthesize_sessions(num_sessions: int, lanes: int = 4, seed: int = 11) -> List[Dict[str, Any]]:
+    """Interleaved multi-turn sessions; order IDs assume a fresh store replaying them in file order"""
+    rng = random.Random(seed)
+    now = time.time()
+    open_sessions: Dict[str, Dict[str, Any]] = {}
+    records = []
+    started = 0
+    next_order = 1
+    while started < num_sessions or open_sessions:
+        lane = f"lane-{rng.randrange(lanes)}"
+        session = open_sessions.get(lane)
+        if session is None:
+            if started >= num_sessions:
+                lane, session = next(iter(open_sessions.items()))
+            else:
+                chosen = rng.sample(list(NAMES), rng.randint(1, 3))
+                items = [{"item": item, "quantity": rng.randint(1, 3)} for item in chosen]
+                message = f"I'd like {_join([_phrase(rng, e['item'], e['quantity']) for e in items])}"
+                result = {"success": True, "action": "place_order", "data": {"items": items}}
+                open_sessions[lane] = {"id": f"{lane}-{started}", "order_id": next_order, "turns": rng.randint(1, 4)}
+                records.append({"s": open_sessions[lane]["id"], "m": message, "r": result})
+                started += 1
+                next_order += 1
+                continue
+
+        order_id = session["order_id"]
+        session["turns"] -= 1
+        if session["turns"] <= 0:
+            message = rng.choice(["Cancel it", "cancel that order please", "That's all, thanks"])
+            if message.startswith("That's"):
+                result = {"success": False, "error": "No function call detected"}
+            else:
+                result = {"success": True, "action": "cancel_order", "data": {"order_id": order_id}}
+            del open_sessions[lane]
+        else:
+            template, op = rng.choice(FOLLOW_UPS)
+            item = rng.choice(list(NAMES))
+            quantity = rng.randint(1, 3)
+            singular, plural = NAMES[item]
+            message = template.format(n=NUMBERS[quantity], item=singular if quantity == 1 and op != "remove" else plural)
+            change = {"item": item, "op": op, "quantity": 999 if op == "remove" else quantity}
+            result = {"success": True, "action": "modify_order", "data": {"order_id": order_id, "changes": [change]}}
+        records.append({"s": session["id"], "m": message, "r": result})
+
+    for i, record in enumerate(records):
+        record["l"] = round(min(5.0, rng.lognormvariate(-0.5, 0.35)), 4)
+        record["t"] = round(now + i * 2.0, 3)
+    return records
+
+def merge_compound(records: List[Dict[str, Any]], share: float = 0.15, seed: int = 5) -> List[Dict[str, Any]]:
+    """Join about ``share`` of the successful requests with the next one.
+
+    A joined record keeps its parts under ``"p"`` (the original records, in
+    order) so a harness can replay them one at a time. Its latency is the
+    first part's plus a little for the extra call's output tokens.
+    """
+    rng = random.Random(seed)
+    merged = []
+    i = 0
+    while i < len(records):
+        first = records[i]
+        second = records[i + 1] if i + 1 < len(records) else None
+        if second and first["r"]["success"] and second["r"]["success"] and rng.random() < share:
+            actions = [{"action": r["r"]["action"], "data": r["r"]["data"]} for r in (first, second)]
+            merged.append({
+                "m": f"{first['m']} and {second['m'][0].lower()}{second['m'][1:]}",
+                "r": {"success": True, **actions[0], "actions": actions},
+                "l": round(first["l"] + 0.06, 4),
+                "t": first["t"],
+                "p": [first, second],
+            })
+            i += 2
+        else:
+            merged.append(first)
+            i += 1
+    return merged
+
+def write(path: str, records: List[Dict[str, Any]]) -> None:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[1]) if len(args) > 1 else 1000
+    records = synthesize_sessions(count) if "--sessions" in sys.argv else synthesize(count)
+    if "--compound" in sys.argv:
+        records = merge_compound(records)
+    write(args[0], records)
@@ -0,0 +1,58 @@
+"""Replay recorded provider traffic through OrderService.
+
+With ``latency_scale`` 0 the provider is instant, which isolates
+OrderService/OrderStore throughput; 1.0 reproduces recorded latencies.
+
+    python -m benchmarks.replay_load [recording] [concurrency] [latency_scale]
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.db_models import OrderStore
+from app.schemas.schemas import OrderRequest
+from app.services.ai_providers import ReplayProvider
+from app.services.ai_providers.replay_provider import load_recording
+from app.services.ai_service import AIService
+from app.services.order_service import OrderService
+from benchmarks import recordings
+from benchmarks.common import report
+
+def recording_path(argv: list) -> str:
+    if len(argv) > 1 and argv[1] != "-":
+        return argv[1]
+    path = os.path.join(tempfile.gettempdir(), "synthetic_recording.jsonl.gz")
+    recordings.write(path, recordings.synthesize(5000))
+    return path
+
+def main() -> None:
+    path = recording_path(sys.argv)
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    latency_scale = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+
+    logging.disable(logging.WARNING)
+    messages = [record["m"] for record in load_recording(path)]
+    service = OrderService(OrderStore(), AIService(ReplayProvider(path, latency_scale)))
+
+    def handle(message: str) -> float:
+        start = time.perf_counter()
+        service.process_order_request(OrderRequest(message=message))
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(handle, messages))
+    elapsed = time.perf_counter() - start
+
+    report(f"Replayed {len(messages)} requests, concurrency {concurrency}, latency x{latency_scale}", [
+        ("throughput", f"{len(messages) / elapsed:,.0f} req/s"),
+        ("p50 latency", f"{statistics.median(latencies) * 1e3:.2f} ms"),
+        ("p95 latency", f"{latencies[int(len(latencies) * 0.95)] * 1e3:.2f} ms"),
+    ])
+
+if __name__ == "__main__":
+    main()
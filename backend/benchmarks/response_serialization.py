@@ -0,0 +1,64 @@
+"""OrderResponse build + encode cost at 10k active orders.
+
+"validated" reproduces the previous path: a validated OrderResponse built
+from fresh get_orders()/get_totals() copies, re-validated against the
+response model and encoded with FastAPI's default encoder. "fast" is the
+current path: model_construct over the shared store snapshot, encoded with
+orjson and the snapshot's cached fragment.
+
+    python -m benchmarks.response_serialization [active_orders]
+"""
+import json
+import sys
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.db_models import OrderStore
+from app.models.menu import MENU
+from app.schemas.schemas import OrderResponse, ActionType
+from app.utils.json_utils import encode_order_response
+from benchmarks.common import measure, report
+
+def validated_path(store: OrderStore) -> bytes:
+    response = OrderResponse(
+        success=True,
+        action=ActionType.RETRIEVE,
+        message="Here are the current orders",
+        totals=store.get_totals(),
+        orders=store.get_orders(),
+    )
+    revalidated = OrderResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(revalidated)).encode()
+
+def fast_path(store: OrderStore) -> bytes:
+    snapshot = store.get_snapshot()
+    response = OrderResponse.model_construct(
+        success=True,
+        action=ActionType.RETRIEVE,
+        message="Here are the current orders",
+        totals=snapshot.totals,
+        orders=snapshot.orders,
+    )
+    return encode_order_response(response, store.get_snapshot())
+
+def main() -> None:
+    active_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    store = OrderStore()
+    for i in range(active_orders):
+        store.add_order(MENU.to_vector({"burgers": i % 3 + 1, "fries": i % 2, "drinks": 1}))
+
+    assert json.loads(validated_path(store)) == json.loads(fast_path(store))
+
+    # A write between polls invalidates the cached fragment
+    def fast_after_write():
+        store.update_order(1, MENU.to_vector({"burgers": 1}))
+        return fast_path(store)
+
+    report(f"Build + encode one response, {active_orders:,} active orders (ms)", [
+        ("validated + default encoder", f"{measure(lambda: validated_path(store), number=5) / 1e3:.2f}"),
+        ("fast path, store changed", f"{measure(fast_after_write, number=20) / 1e3:.2f}"),
+        ("fast path, cached fragment", f"{measure(lambda: fast_path(store), number=1000) / 1e3:.3f}"),
+    ])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Provider calls and prompt tokens saved by per-lane session context.
+
+Replays recorded multi-turn lane sessions (``benchmarks.recordings
+--sessions`` format) through OrderService twice: stateless, where every
+utterance goes to the provider, and with sessions, where follow-ups about
+the lane's last order are resolved locally and the rest carry at most an
+order-number hint. The provider returns the recorded result for each turn;
+both runs must end with identical orders.
+
+    python -m benchmarks.session_context [recording.jsonl[.gz] | num_sessions]
+"""
+import copy
+import json
+import logging
+import sys
+
+from app.models.db_models import OrderStore
+from app.schemas.schemas import OrderRequest
+from app.services.ai_providers import AIProvider
+from app.services.ai_providers.base import get_function_definitions, get_system_prompt
+from app.services.ai_providers.replay_provider import load_recording
+from app.services.ai_service import AIService
+from app.services.order_service import OrderService
+from benchmarks.common import count_tokens, report
+from benchmarks.recordings import synthesize_sessions
+
+# Sent with every provider call: system prompt plus tool schemas
+FIXED_PROMPT_TOKENS = count_tokens(get_system_prompt()) + count_tokens(json.dumps(get_function_definitions()))
+
+class ScriptedProvider(AIProvider):
+    """Returns the recorded result of the current turn and tallies what was sent"""
+
+    def __init__(self):
+        self.result = None
+        self.calls = 0
+        self.tokens = 0
+
+    def parse_intent(self, message: str):
+        self.calls += 1
+        self.tokens += FIXED_PROMPT_TOKENS + count_tokens(message)
+        return copy.deepcopy(self.result)
+
+def replay(records: list, sessions: bool):
+    provider = ScriptedProvider()
+    store = OrderStore()
+    service = OrderService(store, AIService(provider))
+    for record in records:
+        provider.result = record["r"]
+        service.process_order_request(OrderRequest(
+            message=record["m"],
+            session_id=record["s"].rsplit("-", 1)[0] if sessions else None,
+        ))
+    return provider, store.get_snapshot(), service.sessions.stats
+
+def main() -> None:
+    arg = sys.argv[1] if len(sys.argv) > 1 else "500"
+    records = synthesize_sessions(int(arg)) if arg.isdigit() else load_recording(arg)
+    logging.disable(logging.WARNING)
+
+    stateless, stateless_orders, _ = replay(records, sessions=False)
+    stateful, stateful_orders, stats = replay(records, sessions=True)
+    assert stateless_orders.orders == stateful_orders.orders, "session replay diverged from the recording"
+
+    report(f"{len(records):,} turns over {len({r['s'] for r in records}):,} sessions", [
+        ("", "provider calls", "prompt tokens"),
+        ("stateless", f"{stateless.calls:>14,}", f"{stateless.tokens:>13,}"),
+        ("with sessions", f"{stateful.calls:>14,}", f"{stateful.tokens:>13,}"),
+        ("saved", f"{1 - stateful.calls / stateless.calls:>14.0%}", f"{1 - stateful.tokens / stateless.tokens:>13.0%}"),
+    ])
+    print(f"\n  resolved locally: {stats['local']:,}, sent with order hint: {stats['contextualized']:,}, "
+          f"sent as-is: {stats['provider']:,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Shadow evaluation: what it costs the response path, and what it reports.
+
+The primary replays synthetic recordings of the strong model. The candidate
+replays a smaller model's answers to the same messages (``fast_answer``
+from the model-routing benchmark), at 40% of the latency. Both recordings
+carry token usage, as OpenAI and Gemini results now do.
+
+1. Overhead: ``AIService.parse_user_intent`` on a zero-latency primary,
+   without a shadow and with one sampling 10% and 100% of messages.
+   At 100% the candidate cannot keep up, so most calls take the drop path.
+2. Pressure: ``clients`` threads send requests to a primary with
+   ``provider_latency`` seconds per call. The candidate is slowed to 4x
+   the primary and has 2 workers. Primary latency is compared with and
+   without the shadow, with queued, dropped and compared counts.
+3. The offline report (``benchmarks.shadow_report``) for the file written
+   by run 2.
+
+    python -m benchmarks.shadow_eval [clients] [provider_latency]
+"""
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services.ai_providers import ReplayProvider
+from app.services.ai_service import AIService
+from app.services.shadow import ShadowEvaluator, load_records, summarize
+from benchmarks.common import count_tokens, measure_pair, report
+from benchmarks.model_routing import fast_answer
+from benchmarks.recordings import merge_compound, synthesize, write
+from benchmarks.shadow_report import print_report
+
+# System prompt and tool definitions, sent with every call
+PROMPT_TOKENS = 900
+
+def with_usage(record: Dict[str, Any]) -> Dict[str, Any]:
+    actions = len(record["r"].get("actions", [record["r"]])) if record["r"].get("success") else 1
+    record["r"]["usage"] = {"input_tokens": PROMPT_TOKENS + count_tokens(record["m"]), "output_tokens": 20 * actions}
+    return record
+
+def build_recordings(directory: str, count: int = 3000) -> List[str]:
+    rng = random.Random(3)
+    unique: Dict[str, Dict[str, Any]] = {}
+    for record in merge_compound(synthesize(count)):
+        unique.setdefault(record["m"], {"m": record["m"], "r": record["r"], "l": record["l"]})
+    primary = [with_usage(record) for record in unique.values()]
+    candidate = [with_usage(fast_answer(rng, record)) for record in primary]
+    paths = [os.path.join(directory, "primary.jsonl"), os.path.join(directory, "candidate.jsonl")]
+    write(paths[0], primary)
+    write(paths[1], candidate)
+    return [record["m"] for record in primary]
+
+def overhead(directory: str, messages: List[str]) -> None:
+    primary_path, candidate_path = (os.path.join(directory, name) for name in ("primary.jsonl", "candidate.jsonl"))
+    plain = AIService(ReplayProvider(primary_path, latency_scale=0))
+    rows = []
+    for sample_rate in (0.1, 1.0):
+        shadow = ShadowEvaluator(ReplayProvider(candidate_path, latency_scale=0.01), None, sample_rate=sample_rate)
+        shadowed = AIService(ReplayProvider(primary_path, latency_scale=0), shadow=shadow)
+        cursor = iter(range(10 ** 9))
+
+        def call(service: AIService) -> None:
+            service.parse_user_intent(messages[next(cursor) % len(messages)])
+
+        without, with_shadow = measure_pair(lambda: call(plain), lambda: call(shadowed), rounds=5, number=2000)
+        shadow.close(timeout=0)
+        stats = shadow.get_stats()
+        rows.append((
+            f"sample {sample_rate:.0%}",
+            f"without {without:6.1f} µs",
+            f"with {with_shadow:6.1f} µs",
+            f"(+{with_shadow - without:4.1f})",
+            f"| sampled {stats['sampled']:,} dropped {stats['dropped']:,}",
+        ))
+    report("Response-path cost of parse_user_intent, zero-latency primary", rows)
+
+def pressure(directory: str, messages: List[str], clients: int, latency: float, shadow_file: Optional[str]) -> Dict[str, Any]:
+    primary_path, candidate_path = (os.path.join(directory, name) for name in ("primary.jsonl", "candidate.jsonl"))
+    # Recorded latencies average ~0.6 s; scale them to ``latency`` per call
+    scale = latency / 0.6
+    shadow = None
+    if shadow_file is not None:
+        # fast_answer already scaled the candidate to 40%; 10x makes it 4x the primary
+        shadow = ShadowEvaluator(ReplayProvider(candidate_path, latency_scale=scale * 10), shadow_file, sample_rate=0.5, queue_size=50)
+    service = AIService(ReplayProvider(primary_path, latency_scale=scale), shadow=shadow)
+    seconds: List[float] = []
+    lock = threading.Lock()
+
+    def client(client_id: int) -> None:
+        rng = random.Random(client_id)
+        for _ in range(len(messages) // clients):
+            start = time.perf_counter()
+            service.parse_user_intent(rng.choice(messages))
+            with lock:
+                seconds.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stats = shadow.get_stats() if shadow is not None else {}
+    if shadow is not None:
+        # Lets the candidate finish what is queued, so the file holds every sampled message
+        shadow.close()
+    seconds.sort()
+    return {
+        "requests": len(seconds),
+        "throughput": len(seconds) / elapsed,
+        "p50": statistics.median(seconds) * 1e3,
+        "p99": seconds[int(len(seconds) * 0.99)] * 1e3,
+        **stats,
+    }
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    logging.disable(logging.WARNING)
+    directory = tempfile.mkdtemp()
+    messages = build_recordings(directory)
+
+    overhead(directory, messages)
+
+    shadow_file = os.path.join(directory, "shadow.jsonl")
+    rows = []
+    for name, path in (("no shadow", None), ("shadow 50%", shadow_file)):
+        outcome = pressure(directory, messages, clients, latency, path)
+        row = [
+            name,
+            f"{outcome['throughput']:7.0f} req/s",
+            f"p50 {outcome['p50']:5.1f} ms",
+            f"p99 {outcome['p99']:5.1f} ms",
+        ]
+        if path is not None:
+            row.append(
+                f"| sampled {outcome['sampled']:,}, dropped {outcome['dropped']:,}, "
+                f"compared {outcome['compared']:,} (candidate p50 {outcome['candidate_p50_ms']} ms)"
+            )
+        rows.append(tuple(row))
+    report(f"{clients} clients, {latency * 1e3:g} ms primary, candidate 4x slower on 2 workers, queue 50", rows)
+
+    print_report(f"Offline report: {shadow_file}", summarize(load_records(shadow_file)))
+
+if __name__ == "__main__":
+    main()
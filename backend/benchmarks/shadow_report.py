@@ -0,0 +1,62 @@
+"""Offline report on a shadow evaluation file (AI_SHADOW_FILE).
+
+Agreement with the primary (exact, and on the actions alone), latency
+percentiles and mean token use for both sides, overall and per primary
+source (the tier or model route that answered), plus a few disagreements
+to look at.
+
+    python -m benchmarks.shadow_report shadow/candidate.jsonl
+"""
+import json
+import sys
+from typing import Any, Dict
+
+from app.services.shadow import load_records, summarize
+from benchmarks.common import report
+
+def _fmt(value: Any, unit: str = "") -> str:
+    return "-" if value is None else f"{value:g}{unit}"
+
+def print_report(title: str, summary: Dict[str, Any]) -> None:
+    rows = []
+    groups = {"all": summary}
+    if len(summary["by_primary_source"]) > 1:
+        groups.update(summary["by_primary_source"])
+    for source, group in groups.items():
+        rows.append((
+            source,
+            f"{group['compared']:>6,} compared",
+            f"agreement {group['agreement']:6.1%}" if group["compared"] else "agreement -",
+            f"actions {group['action_agreement']:6.1%}" if group["compared"] else "actions -",
+            f"candidate errors {group['candidate_errors']:,}",
+        ))
+    report(title, rows)
+
+    rows = []
+    for source, group in groups.items():
+        for side in ("primary", "candidate"):
+            stats = group[side]
+            rows.append((
+                f"{source} {side}",
+                f"p50 {_fmt(stats['p50_ms'], ' ms')}",
+                f"p90 {_fmt(stats['p90_ms'], ' ms')}",
+                f"p99 {_fmt(stats['p99_ms'], ' ms')}",
+                f"tokens in {_fmt(stats['mean_input_tokens'])} out {_fmt(stats['mean_output_tokens'])}",
+                f"({stats['calls_with_usage']:,} calls reported usage)",
+            ))
+    report("Latency and mean tokens per call", rows)
+
+    if summary["disagreement_examples"]:
+        print("\nDisagreements")
+        for example in summary["disagreement_examples"]:
+            print(f"  {example['m']!r}")
+            print(f"    primary   {json.dumps(example['primary'])}")
+            print(f"    candidate {json.dumps(example['candidate'])}")
+
+def main() -> None:
+    if len(sys.argv) != 2:
+        sys.exit(__doc__)
+    print_report(sys.argv[1], summarize(load_records(sys.argv[1])))
+
+if __name__ == "__main__":
+    main()
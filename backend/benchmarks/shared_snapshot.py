@@ -0,0 +1,181 @@
+"""Order-list reads across worker processes: per-process stores vs a shared snapshot.
+
+``workers`` processes serve reads of one location's order list for
+``seconds``, while ``writes_per_second`` modifications keep changing it
+(``orders`` active orders, each modified in turn). A read builds the
+response body:
+
+- get_orders(): each worker has its own full copy of the store and
+  applies every write itself. A read encodes ``get_totals()`` and
+  ``get_orders()``, as a handler without the snapshot cache would.
+- snapshot (per process): the same copies, read through
+  ``get_snapshot()`` and its per-version body cache (the current
+  GET /orders path).
+- shared: one writer process applies the writes and publishes to
+  SharedSnapshot. The workers only read the mapped region, decoding each
+  version once and reusing its body until the next one.
+
+On a single CPU all processes share it, so the totals are comparable
+but do not grow with the number of workers.
+
+    python -m benchmarks.shared_snapshot [workers] [orders] [writes_per_second] [seconds]
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Tuple
+
+import orjson
+
+from app.models.db_models import OrderSnapshot, OrderStore
+from app.models.shared_snapshot import SharedSnapshot, SharedSnapshotReader, SharedSnapshotWriter
+from benchmarks.common import measure, report
+
+SLOT_BYTES = 16 * 1024 * 1024
+SHM = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+def body(snapshot: OrderSnapshot) -> bytes:
+    return snapshot.memo("identity", lambda: b"{" + snapshot.fragment() + b"}")
+
+def filled_store(orders: int) -> OrderStore:
+    store = OrderStore(feed_capacity=0)
+    for i in range(orders):
+        store.add_order(array("i", [1 + i % 3, i % 2, 1]))
+    return store
+
+def apply_writes(store: OrderStore, orders: int, rate: float, stop: threading.Event) -> None:
+    """Modify order 1, 2, ... in turn, ``rate`` times a second"""
+    interval, n = 1.0 / rate, 0
+    next_at = time.perf_counter()
+    while not stop.is_set():
+        store.update_order(1 + n % orders, array("i", [n % 4, 1, 2]))
+        n += 1
+        next_at += interval
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+def worker(mode: str, path: str, orders: int, rate: float, seconds: float, start, results) -> None:
+    store = filled_store(orders)
+    stop = threading.Event()
+    if mode == "shared":
+        shared = SharedSnapshot(path, store, SLOT_BYTES)
+        # Never mutated here, so this process stays a reader
+        snapshot: Callable[[], OrderSnapshot] = shared.get_snapshot
+    else:
+        writes = threading.Thread(target=apply_writes, args=(store, orders, rate, stop), daemon=True)
+        writes.start()
+        snapshot = store.get_snapshot
+    if mode == "get_orders()":
+        def read() -> Tuple[int, bytes]:
+            version = store.version
+            return version, orjson.dumps({"totals": store.get_totals(), "orders": store.get_orders()}, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        def read() -> Tuple[int, bytes]:
+            current = snapshot()
+            return current.version, body(current)
+    start.wait()
+    reads, size, versions, last = 0, 0, 0, None
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            version, encoded = read()
+            if version != last:
+                versions, last = versions + 1, version
+        size = len(encoded)
+        reads += 100
+    stop.set()
+    results.put((reads, size, versions))
+
+def writer(path: str, orders: int, rate: float, seconds: float, ready, start, results) -> None:
+    store = filled_store(0)
+    shared = SharedSnapshot(path, store, SLOT_BYTES)
+    store.add_listener(shared.on_event)
+    for i in range(orders):
+        store.add_order(array("i", [1 + i % 3, i % 2, 1]))
+    shared.writer.publish()
+    ready.set()
+    stop = threading.Event()
+    start.wait()
+    threading.Timer(seconds, stop.set).start()
+    apply_writes(store, orders, rate, stop)
+    results.put((shared.writer.publications, measure(shared.writer.publish, number=20, repeat=3)))
+    shared.close()
+
+def run(mode: str, workers: int, orders: int, rate: float, seconds: float) -> Dict[str, object]:
+    context = multiprocessing.get_context("fork")
+    directory = tempfile.mkdtemp(dir=SHM)
+    path = os.path.join(directory, "bench.snap")
+    start, ready, results, writer_results = context.Event(), context.Event(), context.Queue(), context.Queue()
+    processes = []
+    if mode == "shared":
+        processes.append(context.Process(target=writer, args=(path, orders, rate, seconds, ready, start, writer_results)))
+        processes[0].start()
+        ready.wait(60)
+    processes += [
+        context.Process(target=worker, args=(mode, path, orders, rate, seconds, start, results)) for _ in range(workers)
+    ]
+    for process in processes[1 if mode == "shared" else 0:]:
+        process.start()
+    time.sleep(1.0)
+    start.set()
+    outcomes = [results.get() for _ in range(workers)]
+    writer_outcome = writer_results.get() if mode == "shared" else None
+    for process in processes:
+        process.join()
+    shutil.rmtree(directory)
+    reads = sum(count for count, _, _ in outcomes)
+    return {
+        "reads_per_second": reads / seconds,
+        "per_worker": [count / seconds for count, _, _ in outcomes],
+        "versions_per_second": [versions / seconds for _, _, versions in outcomes],
+        "bytes": outcomes[0][1],
+        "writer": writer_outcome,
+    }
+
+def decode_cost(orders: int) -> float:
+    """Microseconds for a reader to decode one version holding ``orders`` orders"""
+    directory = tempfile.mkdtemp(dir=SHM)
+    path = os.path.join(directory, "decode.snap")
+    store = filled_store(orders)
+    writer = SharedSnapshotWriter.claim(path, store, SLOT_BYTES)
+    writer.publish()
+    reader = SharedSnapshotReader(path, store.menu)
+    view = reader._open()
+    cost = measure(lambda: reader._decode(view, writer.publications), number=20, repeat=3)
+    reader.close()
+    writer.close()
+    shutil.rmtree(directory)
+    return cost
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    orders = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 50
+    seconds = float(sys.argv[4]) if len(sys.argv) > 4 else 5
+
+    rows = []
+    for mode in ("get_orders()", "snapshot (per process)", "shared"):
+        outcome = run(mode, workers, orders, rate, seconds)
+        per_worker = outcome["per_worker"]
+        row = [
+            mode,
+            f"{outcome['reads_per_second']:>10,.0f} reads/s",
+            f"per worker {min(per_worker):,.0f}-{max(per_worker):,.0f}",
+            f"| versions served/s per worker {min(outcome['versions_per_second']):,.0f}-{max(outcome['versions_per_second']):,.0f}",
+            f"| {outcome['bytes']:,} B body",
+        ]
+        if outcome["writer"] is not None:
+            publications, publish_us = outcome["writer"]
+            row.append(f"| {publications:,} publications, {publish_us:,.0f} µs each")
+        rows.append(tuple(row))
+    report(f"{workers} worker processes, {orders:,} active orders, {rate:g} writes/s, {os.cpu_count()} CPU(s)", rows)
+    print(f"\n  decoding one version in a reader: {decode_cost(orders):,.0f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Soak test: memory and /process latency over millions of requests.
+
+Drives OrderService.process_order_request in-process with a scripted
+intent stream (3 places, then a cancel), completes orders a short while
+after they are placed (as the kitchen would), and runs the retention
+sweeper against a temporary archive file. Each row covers one slice of
+the run; with retention RSS and latency stay flat, with ``--no-retention``
+RSS grows with every order.
+
+    python -m benchmarks.soak [num_requests] [--no-retention]
+"""
+import logging
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections import deque
+
+from app.models.db_models import OrderStore
+from app.models.menu import MENU
+from app.models.order_archive import OrderArchive
+from app.models.order_columns import OrderColumns
+from app.models.order_status import OrderStatus
+from app.schemas.schemas import OrderRequest
+from app.services.order_service import OrderService
+from app.services.retention import RetentionSweeper
+from benchmarks.common import StaticAIService, report
+
+ACTIVE_ORDERS = 50  # orders in flight before the "kitchen" completes them
+SLICES = 10
+
+PLACE = {"success": True, "action": "place_order", "data": {"items": [
+    {"item": "burgers", "quantity": 2}, {"item": "fries", "quantity": 1}, {"item": "drinks", "quantity": 2},
+]}}
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main() -> None:
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    num_requests = int(args[0]) if args else 2_000_000
+    retention = "--no-retention" not in sys.argv
+    logging.disable(logging.WARNING)
+
+    archive_path = os.path.join(tempfile.mkdtemp(), "orders_archive.jsonl")
+    store = OrderStore(
+        MENU,
+        columns=OrderColumns(len(MENU)),
+        archive=OrderArchive(archive_path, MENU) if retention else None,
+        retention_seconds=5,
+        max_archived=5000,
+        # Compressed timeline: keep ~5 s of analytics history instead of 31 days
+        history_seconds=5,
+    )
+    ai_service = StaticAIService(PLACE)
+    service = OrderService(store, ai_service)
+    sweeper = RetentionSweeper(store, interval_seconds=0.2)
+    if retention:
+        sweeper.start()
+
+    request = OrderRequest(message="soak test order")
+    in_flight = deque()
+    slice_size = num_requests // SLICES
+    rows = []
+    latencies = []
+    for i in range(1, num_requests + 1):
+        if i % 4 == 0 and in_flight:
+            ai_service.intent = {"success": True, "action": "cancel_order", "data": {"order_id": in_flight.pop()}}
+        else:
+            ai_service.intent = PLACE
+
+        start = time.perf_counter()
+        response = service.process_order_request(request)
+        latencies.append(time.perf_counter() - start)
+
+        if response.action == "placed":
+            in_flight.appendleft(response.order_id)
+        while len(in_flight) > ACTIVE_ORDERS:
+            order_id = in_flight.pop()
+            store.transition(order_id, OrderStatus.IN_PROGRESS)
+            store.transition(order_id, OrderStatus.READY)
+            store.transition(order_id, OrderStatus.COMPLETED)
+
+        if i % slice_size == 0:
+            latencies.sort()
+            stats = store.get_stats()
+            rows.append((
+                f"{i:>10,}",
+                f"rss {rss_mb():7.1f} MB",
+                f"p50 {statistics.median(latencies) * 1e6:6.1f} us",
+                f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.1f} us",
+                f"in memory {stats['in_memory_orders']:>9,}",
+                f"archived {len(store.archive) if store.archive else 0:>9,}",
+            ))
+            latencies = []
+
+    sweeper.stop()
+    history = store.get_order_history(limit=3 * 5000)
+    report(f"Soak, {num_requests:,} /process requests, retention {'on' if retention else 'off'}", rows)
+    print(f"\n  history query reaching into the archive file: {len(history):,} orders, "
+          f"oldest #{history[-1].id}, archive {os.path.getsize(archive_path) / 2**20:.1f} MB"
+          if retention else "")
+
+if __name__ == "__main__":
+    main()
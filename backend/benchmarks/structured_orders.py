@@ -0,0 +1,49 @@
+"""Structured order endpoints vs the LLM-backed /process path.
+
+/process uses a stand-in provider with a fixed delay, so the comparison
+shows what a kiosk lane saves by skipping the model entirely.
+
+    python -m benchmarks.structured_orders [num_requests] [llm_latency_s]
+"""
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.common import StaticAIService, build_app, report
+
+PLACE_INTENT = {
+    "success": True,
+    "action": "place_order",
+    "data": {"items": [{"item": "burgers", "quantity": 2}, {"item": "drinks", "quantity": 1}]},
+}
+
+def timed(client: TestClient, num_requests: int, send) -> float:
+    start = time.perf_counter()
+    for i in range(num_requests):
+        response = send(client, i)
+        assert response.status_code == 200 and response.json()["success"], response.text
+    return (time.perf_counter() - start) / num_requests
+
+def main() -> None:
+    num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    llm_latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.4
+
+    client = TestClient(build_app(StaticAIService(PLACE_INTENT, llm_latency)))
+
+    place = timed(client, num_requests, lambda c, i: c.post("/api/v1/orders", json={"burgers": 2, "drinks": 1}))
+    modify = timed(client, num_requests, lambda c, i: c.patch(
+        f"/api/v1/orders/{i + 1}", json={"changes": [{"item": "fries", "op": "add", "quantity": 1}]}
+    ))
+    cancel = timed(client, num_requests, lambda c, i: c.delete(f"/api/v1/orders/{i + 1}"))
+    process = timed(client, 5, lambda c, i: c.post("/api/v1/process", json={"message": "two burgers and a drink"}))
+
+    report(f"Per-request latency and single-client throughput ({num_requests} requests)", [
+        ("POST /orders", f"{place * 1e3:.2f} ms", f"{1 / place:,.0f} req/s"),
+        ("PATCH /orders/{id}", f"{modify * 1e3:.2f} ms", f"{1 / modify:,.0f} req/s"),
+        ("DELETE /orders/{id}", f"{cancel * 1e3:.2f} ms", f"{1 / cancel:,.0f} req/s"),
+        (f"POST /process ({llm_latency}s LLM)", f"{process * 1e3:.2f} ms", f"{1 / process:,.1f} req/s"),
+    ])
+
+if __name__ == "__main__":
+    main()
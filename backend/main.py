@@ -1,20 +1,49 @@
-import uvicorn
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from app.core.config import Config
+from app.core.logging_config import setup_logging, stop_logging
+from app.core.server import run_server, tune_threadpool
 from app.schemas.schemas import OrderRequest, OrderResponse
-from app.models.db_models import OrderStore
+from app.models.menu import MENU
 from app.services.ai_service import AIService
-from app.services.order_service import OrderService
+from app.services.locations import Location, LocationRegistry
+from app.services.retention import RetentionSweeper
+from app.services.admission import AdmissionController
 from app.api.routers.orders import router as orders_router
+from app.api.routers.analytics import router as analytics_router
+from app.api.routers.kitchen import router as kitchen_router
+from app.api.routers.locations import router as locations_router
 # Log
-logging.basicConfig(level=logging.INFO)
+setup_logging()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tune_threadpool()
+    await run_in_threadpool(ai_service.warm)
+    retention_sweeper.start()
+    logger.info(
+        "Ready: %s provider, %s threads, %s event loop",
+        ai_service.provider_name, Config.SERVER_THREADPOOL_SIZE, type(asyncio.get_running_loop()).__module__
+    )
+    yield
+    # The server has stopped accepting and drained in-flight requests (up to SERVER_DRAIN_SECONDS)
+    retention_sweeper.stop(timeout=5)
+    ai_service.close()
+    locations.close()
+    logger.info("Shutdown complete")
+    stop_logging()
 
 app = FastAPI(
     title="Drive Thru Ordering System",
     description="AI - powered drive-thru ordering system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS
@@ -26,15 +55,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
-order_store = OrderStore()
+# Initialize services: one store, kitchen and estimator per location (X-Location header)
 ai_service = AIService()
-order_service = OrderService(order_store, ai_service)
+locations = LocationRegistry(lambda location_id: Location.create(location_id, ai_service, MENU), MENU)
+# Started by the lifespan handler, so only serving processes run it
+retention_sweeper = RetentionSweeper(locations, Config.ORDER_SWEEP_INTERVAL_SECONDS)
+admission = AdmissionController(
+    Config.PROCESS_MAX_CONCURRENCY,
+    Config.PROCESS_MAX_QUEUE,
+    Config.PROCESS_MAX_QUEUE_PER_LANE
+)
 
-app.state.order_store = order_store
+app.state.locations = locations
 app.state.ai_service = ai_service
-app.state.order_service = order_service
+app.state.retention_sweeper = retention_sweeper
+app.state.admission = admission
 app.include_router(orders_router, tags=["Orders"])
+app.include_router(analytics_router, tags=["Analytics"])
+app.include_router(kitchen_router, tags=["Kitchen"])
+app.include_router(locations_router, tags=["Locations"])
 
 # Endpoints
 @app.get("/")
@@ -47,10 +86,14 @@ def detailed_health_check():
 
 # Startup
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=Config.HOST,
-        port=Config.PORT,
-        reload=Config.DEBUG,
-        log_level="info"
-    )
\ No newline at end of file
+    if Config.DEBUG and Config.RELOAD:
+        uvicorn.run(
+            "main:app",
+            host=Config.HOST,
+            port=Config.PORT,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # One worker serves the app built above; several import it in their own processes
+        run_server(app if Config.SERVER_WORKERS == 1 else "main:app")
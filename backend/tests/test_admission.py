@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.admission import AdmissionController
+from app.utils.exception_utils import OverloadedError
+from benchmarks.common import StaticAIService, build_app
+
+PLACE_BURGER = {"success": True, "action": "place_order", "data": {"items": [{"item": "burgers", "quantity": 1}]}}
+
+def later(seconds: float = 60.0) -> float:
+    return time.monotonic() + seconds
+
+async def settle() -> None:
+    # Let woken waiters run up to their next await
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+def test_full_queue_is_shed_with_503_and_retry_after():
+    admission = AdmissionController(max_concurrency=1, max_queue=0, max_queue_per_lane=0)
+    client = TestClient(build_app(StaticAIService(PLACE_BURGER), admission=admission))
+    # Another request holds the only slot
+    asyncio.run(admission.acquire("other", later()))
+
+    response = client.post("/api/v1/process", json={"message": "one burger please"})
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert admission.get_stats()["rejected_full"] == 1
+
+    admission.release(None)
+    assert client.post("/api/v1/process", json={"message": "one burger please"}).status_code == 200
+
+def test_lane_share_of_the_queue_is_bounded():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=10, max_queue_per_lane=1, initial_service_seconds=0.01)
+        await admission.acquire("busy", later())
+        waiter = asyncio.create_task(admission.acquire("busy", later()))
+        await settle()
+        with pytest.raises(OverloadedError) as rejected:
+            await admission.acquire("busy", later())
+        # Another lane still gets a place in the queue
+        other = asyncio.create_task(admission.acquire("quiet", later()))
+        await settle()
+        assert admission.get_stats()["waiting"] == 2
+        for task in (waiter, other):
+            task.cancel()
+        return rejected.value
+
+    error = asyncio.run(scenario())
+    assert error.reason == "queue full" and error.retry_after >= 1
+
+def test_deadline_that_cannot_be_met_is_rejected_up_front():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=10, max_queue_per_lane=10, initial_service_seconds=2.0)
+        await admission.acquire("a", later())
+        with pytest.raises(OverloadedError) as rejected:
+            await admission.acquire("b", later(1.0))
+        return admission, rejected.value
+
+    admission, error = asyncio.run(scenario())
+    assert error.reason == "deadline cannot be met"
+    assert error.retry_after >= 2
+    assert admission.get_stats()["rejected_deadline"] == 1
+    assert admission.get_stats()["waiting"] == 0
+
+def test_freed_slots_go_to_lanes_in_turn():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=10, max_queue_per_lane=10, initial_service_seconds=0.01)
+        await admission.acquire("holder", later())
+        admitted = []
+
+        async def request(name: str, lane: str):
+            await admission.acquire(lane, later())
+            admitted.append(name)
+
+        tasks = []
+        for name, lane in [("a1", "a"), ("a2", "a"), ("a3", "a"), ("b1", "b"), ("c1", "c")]:
+            tasks.append(asyncio.create_task(request(name, lane)))
+            await settle()
+        for _ in tasks:
+            admission.release(0.01)
+            await settle()
+        await asyncio.gather(*tasks)
+        return admitted
+
+    assert asyncio.run(scenario()) == ["a1", "b1", "c1", "a2", "a3"]
+
+def test_slot_handed_over_as_the_wait_times_out_is_passed_on(monkeypatch):
+    async def times_out_on_handover(awaitable, timeout):
+        # The timeout fires in the same tick the slot arrives
+        await awaitable
+        raise asyncio.TimeoutError
+
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue=10, max_queue_per_lane=10, initial_service_seconds=0.01)
+        await admission.acquire("holder", later())
+        with monkeypatch.context() as patch:
+            patch.setattr(asyncio, "wait_for", times_out_on_handover)
+            unlucky = asyncio.create_task(admission.acquire("a", later()))
+            await settle()
+        next_in_line = asyncio.create_task(admission.acquire("b", later()))
+        await settle()
+
+        admission.release(0.01)
+        await settle()
+
+        with pytest.raises(OverloadedError):
+            await unlucky
+        await asyncio.wait_for(next_in_line, 1)
+        return admission.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["expired_in_queue"] == 1
+    assert stats["active"] == 1 and stats["waiting"] == 0
@@ -0,0 +1,53 @@
+import json
+import signal
+import threading
+import time
+
+import httpx
+
+from benchmarks.graceful_shutdown import MESSAGE, free_port, start_server
+
+PROVIDER_LATENCY = 2.0
+
+def write_recording(path) -> str:
+    result = {"success": True, "action": "place_order", "data": {"items": [{"item": "burgers", "quantity": 2}]}}
+    path.write_text(json.dumps({"m": MESSAGE, "r": result, "l": PROVIDER_LATENCY}) + "\n")
+    return str(path)
+
+def wait_until_in_flight(base_url: str) -> None:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if httpx.get(f"{base_url}/api/v1/orders/stats").json()["admission"]["active"] == 1:
+            return
+        time.sleep(0.05)
+    raise AssertionError("the /process call never started")
+
+def test_sigterm_drains_an_in_flight_process_call_before_lifespan_shutdown(tmp_path):
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    log_path = tmp_path / "server.log"
+    with open(log_path, "wb") as log:
+        server = start_server(write_recording(tmp_path / "slow.jsonl"), port, drain_seconds=10, log_level="INFO", output=log)
+    try:
+        responses = []
+        call = threading.Thread(
+            target=lambda: responses.append(httpx.post(f"{base_url}/api/v1/process", json={"message": MESSAGE}, timeout=30))
+        )
+        call.start()
+        wait_until_in_flight(base_url)
+
+        server.send_signal(signal.SIGTERM)
+        call.join(30)
+        server.wait(timeout=30)
+    finally:
+        if server.poll() is None:
+            server.kill()
+
+    assert len(responses) == 1 and responses[0].status_code == 200
+    assert responses[0].json()["action"] == "placed"
+    # uvicorn re-raises the signal once shutdown is done
+    assert server.returncode == -signal.SIGTERM
+
+    messages = [json.loads(line)["message"] for line in log_path.read_text().splitlines() if line.startswith("{")]
+    answered = next(i for i, message in enumerate(messages) if "POST /api/v1/process" in message and message.endswith("200"))
+    assert messages.index("Shutting down") < answered < messages.index("Shutdown complete")
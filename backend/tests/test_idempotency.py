@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from fastapi.testclient import TestClient
+
+from app.services.admission import AdmissionController
+from benchmarks.common import build_app
+
+PLACE_BURGER = {"success": True, "action": "place_order", "data": {"items": [{"item": "burgers", "quantity": 1}]}}
+
+class ScriptedAIService:
+    """Returns ``results`` in turn (the last one repeats) and counts provider calls"""
+
+    def __init__(self, results: List[dict], entered: threading.Event = None, release: threading.Event = None):
+        self.results = results
+        self.entered = entered
+        self.release = release
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def parse_user_intent(self, message: str) -> dict:
+        with self._lock:
+            index = self.calls
+            self.calls += 1
+        if self.entered is not None:
+            self.entered.set()
+            self.release.wait(5)
+        return self.results[min(index, len(self.results) - 1)]
+
+def client_for(ai: ScriptedAIService, burst: int = 64):
+    app = build_app(ai, admission=AdmissionController(burst, burst, burst))
+    return app, TestClient(app)
+
+def process(client: TestClient, message: str, key: str):
+    return client.post("/api/v1/process", json={"message": message}, headers={"Idempotency-Key": key})
+
+def test_concurrent_duplicates_call_the_provider_and_place_the_order_once():
+    entered, release = threading.Event(), threading.Event()
+    ai = ScriptedAIService([PLACE_BURGER], entered, release)
+    app, client = client_for(ai)
+    submissions = 16
+
+    with ThreadPoolExecutor(max_workers=submissions) as pool:
+        first = pool.submit(process, client, "one burger please", "key-1")
+        # Duplicates arrive while the first attempt is still with the provider
+        assert entered.wait(5)
+        duplicates = [pool.submit(process, client, "one burger please", "key-1") for _ in range(submissions - 1)]
+        release.set()
+        responses = [first.result()] + [future.result() for future in duplicates]
+
+    assert all(response.status_code == 200 for response in responses)
+    assert {response.json()["order_id"] for response in responses} == {1}
+    assert ai.calls == 1
+    assert len(app.state.order_store.get_orders()) == 1
+
+def test_reused_key_with_a_different_request_is_rejected():
+    ai = ScriptedAIService([PLACE_BURGER])
+    _, client = client_for(ai)
+
+    assert process(client, "one burger please", "key-1").status_code == 200
+    response = process(client, "two fries please", "key-1")
+
+    assert response.status_code == 422
+    assert ai.calls == 1
+
+def test_retry_after_a_failed_attempt_runs_again():
+    ai = ScriptedAIService([{"success": False, "error": "provider timeout"}, PLACE_BURGER])
+    app, client = client_for(ai)
+
+    failed = process(client, "one burger please", "key-1").json()
+    retried = process(client, "one burger please", "key-1").json()
+    replayed = process(client, "one burger please", "key-1").json()
+
+    assert not failed["success"]
+    assert retried["success"] and retried["order_id"] == 1
+    assert replayed["order_id"] == 1
+    assert ai.calls == 2
+    assert len(app.state.order_store.get_orders()) == 1
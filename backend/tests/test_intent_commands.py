@@ -0,0 +1,42 @@
+import pytest
+from pydantic import ValidationError
+
+from app.models.db_models import OrderStore
+from app.schemas.schemas import CancelOrder, ModifyOrder, PlaceOrder, parse_intent_command
+from app.services.order_service import OrderService
+
+def test_item_list_validates_as_sent():
+    command = parse_intent_command({"action": "place_order", "data": {"items": [
+        {"item": "burgers", "quantity": 2}, {"item": "drinks", "quantity": "3"},
+    ]}})
+    assert command == PlaceOrder(items=[{"item": "burgers", "quantity": 2}, {"item": "drinks", "quantity": 3}])
+
+def test_flat_arguments_become_lists():
+    place = parse_intent_command({"action": "place_order", "data": {"burgers": 2, "fries": "1"}})
+    assert place.items == [{"item": "burgers", "quantity": 2}, {"item": "fries", "quantity": 1}]
+
+    modify = parse_intent_command({"action": "modify_order", "data": {"order_id": "7", "add_burgers": 2, "remove_fries": 999}})
+    assert modify == ModifyOrder(order_id=7, changes=[
+        {"item": "burgers", "op": "add", "quantity": 2}, {"item": "fries", "op": "remove", "quantity": 999},
+    ])
+
+def test_sloppy_lists_are_cleaned():
+    command = parse_intent_command({"action": "modify_order", "data": {"order_id": 3, "changes": [
+        {"item": "pizza", "quantity": 1}, {"item": "fries", "op": "double", "quantity": None},
+    ]}})
+    assert command.changes == [{"item": "fries", "op": "add", "quantity": 0}]
+
+def test_non_dict_data_counts_as_no_arguments():
+    assert parse_intent_command({"action": "cancel_order", "data": "order 7"}) == CancelOrder(order_id=None)
+    assert parse_intent_command({"action": "place_order", "data": ["burgers"]}).items == []
+
+def test_unknown_action_and_bad_order_id_fail_validation():
+    with pytest.raises(ValidationError):
+        parse_intent_command({"action": "refund_order", "data": {}})
+    with pytest.raises(ValidationError):
+        parse_intent_command({"action": "cancel_order", "data": {"order_id": "seven"}})
+
+def test_order_service_answers_non_dict_data_with_an_error_response():
+    service = OrderService(OrderStore(), ai_service=None)
+    response = service.execute_action({"success": True, "action": "place_order", "data": "two burgers"})
+    assert not response.success
@@ -0,0 +1,66 @@
+from array import array
+
+import pytest
+
+from app.models.db_models import OrderStore
+from app.models.menu import MENU
+from app.models.order_status import OrderStatus
+from app.services.kitchen_service import KitchenService
+from app.utils.exception_utils import InvalidStatusTransitionError, OrderNotFoundError
+
+def kitchen_with_store(listen: bool = True):
+    store = OrderStore()
+    kitchen = KitchenService(MENU, order_store=store)
+    if listen:
+        store.add_listener(kitchen.on_event)
+    return store, kitchen
+
+def quantities(**items: int) -> array:
+    return MENU.to_vector(items)
+
+def test_cooking_drives_the_order_lifecycle():
+    store, kitchen = kitchen_with_store()
+    order_id = store.add_order(quantities(burgers=1))
+    batch = kitchen.start_batch("grill")
+    assert store.get_order(order_id).status == OrderStatus.IN_PROGRESS
+    assert kitchen.complete_batch(batch.id) == [order_id]
+    assert store.get_order(order_id).status == OrderStatus.READY
+    kitchen.hand_off(order_id)
+    assert store.get_order(order_id).status == OrderStatus.COMPLETED
+    assert kitchen.get_board()["ready_orders"] == []
+
+def test_modification_that_leaves_the_order_ready_reaches_the_store():
+    store, kitchen = kitchen_with_store()
+    order_id = store.add_order(quantities(burgers=1, fries=1))
+    batch = kitchen.start_batch("grill")
+    kitchen.complete_batch(batch.id)
+    # Drops the only units still queued: the kitchen has everything that is left
+    store.update_order(order_id, quantities(burgers=1))
+
+    assert kitchen.get_order_status(order_id)["state"] == "ready"
+    assert store.get_order(order_id).status == OrderStatus.READY
+    kitchen.hand_off(order_id)
+    assert store.get_order(order_id).status == OrderStatus.COMPLETED
+    with pytest.raises(OrderNotFoundError):
+        kitchen.get_order_status(order_id)
+
+def test_hand_off_the_store_rejects_keeps_the_order_on_the_board():
+    # Not listening, so the store can move on without the kitchen hearing of it
+    store, kitchen = kitchen_with_store(listen=False)
+    order_id = store.add_order(quantities(burgers=1))
+    kitchen.enqueue(order_id, quantities(burgers=1))
+    batch = kitchen.start_batch("grill")
+    kitchen.complete_batch(batch.id)
+    store.cancel_order(order_id)
+
+    with pytest.raises(InvalidStatusTransitionError):
+        kitchen.hand_off(order_id)
+    assert kitchen.get_board()["ready_orders"] == [order_id]
+
+def test_ready_before_the_store_saw_cooking_start_passes_through_in_progress():
+    store, kitchen = kitchen_with_store()
+    order_id = store.add_order(quantities(burgers=1))
+
+    kitchen._advance([order_id], OrderStatus.READY)
+
+    assert store.get_order(order_id).status == OrderStatus.READY
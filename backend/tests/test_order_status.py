@@ -0,0 +1,37 @@
+import pytest
+
+from app.models.db_models import OrderStore
+from app.models.menu import MENU
+from app.models.order_status import OrderStatus, TRANSITIONS
+from app.utils.exception_utils import InvalidStatusTransitionError
+
+PLACED, IN_PROGRESS, READY, COMPLETED, CANCELED = OrderStatus
+
+ALLOWED = {
+    (PLACED, IN_PROGRESS), (PLACED, CANCELED),
+    (IN_PROGRESS, READY), (IN_PROGRESS, CANCELED),
+    (READY, COMPLETED), (READY, CANCELED),
+}
+# Path from PLACED to each status
+PATHS = {
+    PLACED: [], IN_PROGRESS: [IN_PROGRESS], READY: [IN_PROGRESS, READY],
+    COMPLETED: [IN_PROGRESS, READY, COMPLETED], CANCELED: [CANCELED],
+}
+PAIRS = [(source, target) for source in OrderStatus for target in OrderStatus if source != target]
+
+def test_transition_table():
+    assert {(source, target) for source, targets in TRANSITIONS.items() for target in targets} == ALLOWED
+
+@pytest.mark.parametrize("source,target", PAIRS, ids=lambda status: status.value)
+def test_store_enforces_transitions(source, target):
+    store = OrderStore()
+    order_id = store.add_order(MENU.to_vector({"burgers": 1}))
+    for status in PATHS[source]:
+        store.transition(order_id, status)
+
+    if (source, target) in ALLOWED:
+        assert store.transition(order_id, target).status == target
+    else:
+        with pytest.raises(InvalidStatusTransitionError):
+            store.transition(order_id, target)
+        assert store.get_order(order_id).status == source
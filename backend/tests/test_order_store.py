@@ -0,0 +1,37 @@
+import time
+
+from app.models.db_models import OrderStore
+from app.models.menu import MENU
+from app.models.order_archive import OrderArchive
+
+def store_with_archive(tmp_path):
+    return OrderStore(archive=OrderArchive(str(tmp_path / "orders.jsonl"), MENU), retention_seconds=0)
+
+def test_history_keeps_archived_orders_that_share_an_id_with_newer_ones(tmp_path):
+    store = store_with_archive(tmp_path)
+    first = store.add_order(MENU.to_vector({"burgers": 1}))
+    store.cancel_order(first)
+    assert store.sweep() == 1
+
+    # IDs restart after clear_all(), as they do in a new process on the same file
+    store.clear_all()
+    time.sleep(0.01)
+    second = store.add_order(MENU.to_vector({"fries": 2}))
+    assert second == first
+
+    history = store.get_order_history()
+
+    assert [MENU.to_dict(order_info.quantities) for order_info in history] == [
+        {"burgers": 0, "fries": 2, "drinks": 0},
+        {"burgers": 1, "fries": 0, "drinks": 0},
+    ]
+
+def test_history_lists_an_order_caught_mid_sweep_once(tmp_path):
+    store = store_with_archive(tmp_path)
+    order_id = store.add_order(MENU.to_vector({"drinks": 3}))
+    store.cancel_order(order_id)
+
+    # The sweep has written the order to the file but not yet dropped it from memory
+    store.archive.append(store.get_all_orders().values())
+
+    assert [order_info.id for order_info in store.get_order_history()] == [order_id]